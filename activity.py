@@ -0,0 +1,66 @@
+from typing import Callable, Dict, List, Optional
+from datetime import datetime
+import json
+import threading
+
+from config import config
+
+# Pages do not know the logged-in user yet, so activity is recorded under this name
+DEFAULT_USER = 'guest'
+
+
+class ActivityLog:
+    # Append-only log of learning activity (lookups, flashcards, reading, dictation)
+    def __init__(self, filepath='activity.jsonl'):
+        self.filepath = filepath
+        self.events: List[Dict] = self.load_events()
+        self.listeners: List[Callable] = []
+        self.lock = threading.Lock()
+
+    def load_events(self) -> List[Dict]:
+        events = []
+        try:
+            with open(self.filepath, 'r') as file:
+                for line in file:
+                    try:
+                        events.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+        except FileNotFoundError:
+            pass
+        return events
+
+    def on_record(self, callback: Callable):
+        # callback(event) runs after each new event
+        self.listeners.append(callback)
+
+    def record(self, user: str, kind: str, title: str, **details) -> Dict:
+        # kind: lookup, flashcard, reading, dictation, ...
+        return self.record_many([{'user': user, 'kind': kind, 'title': title, **details}])[0]
+
+    def record_many(self, entries: List[Dict]) -> List[Dict]:
+        # Several events (each with user, kind, title and details) in a single append to the log file
+        ts = datetime.now().isoformat(timespec='seconds')
+        events = [{'ts': ts, **entry} for entry in entries]
+        with self.lock:
+            for event in events:
+                event['id'] = len(self.events)
+                self.events.append(event)
+            with open(self.filepath, 'a') as file:
+                file.write(''.join(json.dumps(event) + '\n' for event in events))
+        for event in events:
+            for callback in self.listeners:
+                callback(event)
+        return events
+
+    def recent(self, user: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        results = []
+        for event in reversed(self.events):
+            if user is None or event['user'] == user:
+                results.append(event)
+                if len(results) >= limit:
+                    break
+        return results
+
+
+activity_log = ActivityLog(config.paths.activity)
@@ -0,0 +1,142 @@
+# Account administration from the command line.
+#
+#   python admin_cli.py import students.csv            # columns: username,fullname,email,birthdate,password
+#   python admin_cli.py import students.jsonl --workers 8
+#   python admin_cli.py export --output users.jsonl
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterator, List
+
+REQUIRED = ('username', 'fullname', 'email', 'birthdate')
+EXPORT_FIELDS = ('username', 'fullname', 'email', 'birthdate')
+
+
+def read_records(path: str, fmt: str = '') -> Iterator[Dict]:
+    # One record at a time, so a large file is never held in memory as a whole
+    fmt = fmt or ('csv' if path.lower().endswith('.csv') else 'jsonl')
+    with open(path, newline='', encoding='utf-8') as file:
+        if fmt == 'csv':
+            for row in csv.DictReader(file):
+                yield {key.strip(): (value or '').strip() for key, value in row.items() if key}
+        else:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def batches(records: Iterator, size: int) -> Iterator[List]:
+    while batch := list(islice(records, size)):
+        yield batch
+
+
+def validate(record: Dict, db, seen_usernames: set, seen_emails: set) -> str:
+    # Same rules as the register form, checked against the database indexes and the rest of the file
+    missing = [field for field in REQUIRED if not record.get(field)]
+    if missing:
+        return f"missing {', '.join(missing)}"
+    if not record.get('password') and not record.get('password_hash'):
+        return 'missing password'
+    if '@' not in record['email']:
+        return 'invalid email'
+    if record['username'] in db.users or record['username'] in seen_usernames:
+        return 'username already exists'
+    if record['email'] in db.emails or record['email'] in seen_emails:
+        return 'email already in use'
+    return ''
+
+
+def import_users(db, path: str, fmt: str = '', workers: int = 0, batch_size: int = 500, dry_run: bool = False) -> Dict:
+    from auth.models import User, hash_password
+
+    seen_usernames, seen_emails = set(), set()
+    accepted, rejected = [], 0
+    with ProcessPoolExecutor(max_workers=workers or None) as pool:
+        for batch in batches(read_records(path, fmt), batch_size):
+            valid = []
+            for record in batch:
+                error = validate(record, db, seen_usernames, seen_emails)
+                if error:
+                    rejected += 1
+                    print(f"skipped {record.get('username') or '?'}: {error}", file=sys.stderr)
+                    continue
+                seen_usernames.add(record['username'])
+                seen_emails.add(record['email'])
+                valid.append(record)
+
+            # scrypt is the expensive part: hash the whole batch across all cores
+            plain = [record for record in valid if not record.get('password_hash')]
+            chunk = max(len(plain) // ((workers or os.cpu_count() or 1) * 4), 1)
+            for record, password_hash in zip(plain, pool.map(hash_password,
+                                                             [r['password'] for r in plain], chunksize=chunk)):
+                record['password_hash'] = password_hash
+
+            for record in valid:
+                accepted.append(User(record['username'], record['fullname'], record['email'], record['birthdate'],
+                                     password_hash=record['password_hash']))
+            print(f'{len(accepted)} users prepared, {rejected} skipped', file=sys.stderr)
+
+    # A single write for the whole file instead of one save_users per account
+    imported = 0
+    if not dry_run and accepted:
+        # add_users checks again under the file lock: another process may have taken a name meanwhile
+        failed = db.add_users(accepted)
+        for user, error in failed:
+            print(f'skipped {user.username}: {error}', file=sys.stderr)
+        rejected += len(failed)
+        imported = len(accepted) - len(failed)
+    return {'imported': imported, 'skipped': rejected}
+
+
+def export_users(db, output, with_hashes: bool = False) -> int:
+    # JSON lines written one user at a time; hashes only on request
+    count = 0
+    for user in db.users.values():
+        record = {field: getattr(user, field) for field in EXPORT_FIELDS}
+        if with_hashes:
+            record['password_hash'] = user.password_hash
+        output.write(json.dumps(record, ensure_ascii=False) + '\n')
+        count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='MYMY account administration')
+    parser.add_argument('--users', help='user database file (default: paths.users from the config)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    importer = commands.add_parser('import', help='create accounts from a CSV or JSON-lines file')
+    importer.add_argument('path')
+    importer.add_argument('--format', choices=['csv', 'jsonl'], default='')
+    importer.add_argument('--workers', type=int, default=0, help='hashing processes (default: all cores)')
+    importer.add_argument('--batch', type=int, default=500)
+    importer.add_argument('--dry-run', action='store_true')
+
+    exporter = commands.add_parser('export', help='write accounts as JSON lines')
+    exporter.add_argument('--output', help='file to write instead of stdout')
+    exporter.add_argument('--with-hashes', action='store_true', help='include password hashes (for migrations)')
+
+    args = parser.parse_args()
+
+    from auth.store import UserDatabase
+    from config import config
+    db = UserDatabase(args.users or config.paths.users)
+
+    if args.command == 'import':
+        summary = import_users(db, args.path, args.format, args.workers, args.batch, args.dry_run)
+        print(json.dumps(summary))
+    else:
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as output:
+                count = export_users(db, output, args.with_hashes)
+        else:
+            count = export_users(db, sys.stdout, args.with_hashes)
+        print(f'{count} users exported', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
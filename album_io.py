@@ -0,0 +1,111 @@
+from nicegui import app
+from fastapi.responses import Response, StreamingResponse
+from typing import BinaryIO, Dict, Iterator, Optional
+from urllib.parse import quote
+import gzip
+import io
+import json
+import zlib
+
+from album_store import AlbumStore, album_store
+
+FORMAT = 'mymy-album'
+VERSION = 1
+BATCH = 500  # cards copied out of the store per lock acquisition
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+def dumps(record: Dict) -> bytes:
+    return (json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n').encode()
+
+
+def iter_export(store: AlbumStore, album_name: str) -> Iterator[bytes]:
+    # gzip JSON lines: a header line, then one card per line. Cards are read in small batches and
+    # compressed as they go, so neither the album nor the output is ever held in memory as a whole
+    compressor = zlib.compressobj(level=6, wbits=31)  # wbits=31 -> gzip container
+    with store.lock:
+        total = len(store[album_name])
+    yield compressor.compress(dumps({'format': FORMAT, 'version': VERSION, 'album': album_name, 'cards': total}))
+    position = 0
+    while True:
+        with store.lock:
+            batch = store[album_name][position:position + BATCH] if album_name in store else []
+        if not batch:
+            break
+        position += len(batch)
+        chunk = compressor.compress(b''.join(dumps(card) for card in batch))
+        if chunk:
+            yield chunk
+    yield compressor.flush()
+
+
+def iter_lines(source: BinaryIO) -> Iterator[str]:
+    # Accepts gzip or plain JSON lines, decompressing incrementally
+    head = source.read(2)
+    stream = io.BufferedReader(_Prefixed(head, source))
+    if head == GZIP_MAGIC:
+        stream = gzip.GzipFile(fileobj=stream)
+    for line in io.TextIOWrapper(stream, encoding='utf-8'):
+        if line.strip():
+            yield line
+
+
+class _Prefixed(io.RawIOBase):
+    # Puts the sniffed magic bytes back in front of the rest of the stream
+    def __init__(self, head: bytes, rest: BinaryIO):
+        self.head = head
+        self.rest = rest
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self.head:
+            size = min(len(buffer), len(self.head))
+            buffer[:size], self.head = self.head[:size], self.head[size:]
+            return size
+        data = self.rest.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def import_album(store: AlbumStore, source: BinaryIO, album_name: Optional[str] = None) -> Dict:
+    # Streams cards into the store; add_card checks the word -> card index, so words already
+    # in the album are skipped instead of duplicated
+    lines = iter_lines(source)
+    try:
+        header = json.loads(next(lines))
+    except (StopIteration, json.JSONDecodeError):
+        raise ValueError('Not an album file')
+    if not isinstance(header, dict) or header.get('format') != FORMAT or header.get('version', 0) > VERSION:
+        raise ValueError('Not an album file')
+    album_name = album_name or header.get('album') or 'Imported'
+    store.create_album(album_name)
+    summary = {'album': album_name, 'added': 0, 'duplicates': 0, 'invalid': 0}
+    for line in lines:
+        try:
+            card = json.loads(line)
+        except json.JSONDecodeError:
+            summary['invalid'] += 1
+            continue
+        if not isinstance(card, dict) or not card.get('word'):
+            summary['invalid'] += 1
+        elif store.add_card(album_name, card):
+            summary['added'] += 1
+        else:
+            summary['duplicates'] += 1
+    return summary
+
+
+def export_url(album_name: str) -> str:
+    return f'/albums/{quote(album_name, safe="")}/export'
+
+
+@app.get('/albums/{album_name}/export')
+def export_album(album_name: str):
+    # No Content-Length: the body is sent with chunked transfer encoding as it is compressed
+    if album_name not in album_store:
+        return Response(status_code=404)
+    filename = quote(f'{album_name}.mymy.jsonl.gz')
+    return StreamingResponse(iter_export(album_store, album_name), media_type='application/gzip',
+                             headers={'Content-Disposition': f"attachment; filename*=UTF-8''{filename}"})
@@ -0,0 +1,149 @@
+from typing import Callable, Dict, List, Optional, Set
+import json
+import os
+import threading
+
+from config import config
+from lifecycle import atomic_write, lifecycle
+from text_utils import lemmatize
+
+
+class AlbumStore:
+    # Flashcard albums shared by every page, with a word -> card index per album
+    def __init__(self):
+        self.albums: Dict[str, List[Dict]] = {}
+        self.word_index: Dict[str, Dict[str, int]] = {}  # album -> word -> position in album
+        self.known_counts: Dict[str, int] = {}  # lemma -> number of cards across albums
+        self.listeners: List[Callable] = []
+        self.card_listeners: List[Callable] = []
+        self.lock = threading.RLock()
+        self.version = 0  # bumped on every change, so unchanged albums are not rewritten
+        self.saved_version = 0
+
+    def __contains__(self, album_name):
+        return album_name in self.albums
+
+    def __len__(self):
+        return len(self.albums)
+
+    def __getitem__(self, album_name):
+        return self.albums[album_name]
+
+    def keys(self):
+        return self.albums.keys()
+
+    def on_change(self, callback: Callable):
+        # callback(album_name, added_lemmas, removed_lemmas)
+        self.listeners.append(callback)
+
+    def on_card_change(self, callback: Callable):
+        # callback(album_name, card, added) for every card added or removed
+        self.card_listeners.append(callback)
+
+    def notify(self, album_name: str, added: Set[str], removed: Set[str]):
+        for callback in self.listeners:
+            callback(album_name, added, removed)
+
+    def create_album(self, album_name: str) -> bool:
+        with self.lock:
+            if album_name in self.albums:
+                return False
+            self.albums[album_name] = []
+            self.word_index[album_name] = {}
+            self.version += 1
+        return True
+
+    def has_card(self, album_name: str, word: str) -> bool:
+        return word in self.word_index.get(album_name, {})
+
+    def add_card(self, album_name: str, card: Dict) -> bool:
+        with self.lock:
+            if album_name not in self.albums:
+                self.create_album(album_name)
+            if self.has_card(album_name, card['word']):
+                return False
+            self.word_index[album_name][card['word']] = len(self.albums[album_name])
+            self.albums[album_name].append(card)
+            self.version += 1
+            lemma = lemmatize(card['word'])
+            self.known_counts[lemma] = self.known_counts.get(lemma, 0) + 1
+            newly_known = {lemma} if self.known_counts[lemma] == 1 else set()
+        if newly_known:
+            self.notify(album_name, newly_known, set())
+        for callback in self.card_listeners:
+            callback(album_name, card, True)
+        return True
+
+    def get_card(self, album_name: str, word: str) -> Optional[Dict]:
+        with self.lock:
+            position = self.word_index.get(album_name, {}).get(word)
+            return None if position is None else self.albums[album_name][position]
+
+    def update_card(self, album_name: str, word: str, changes: Dict) -> Optional[Dict]:
+        # Review scheduling fields (due, interval, ease, reviewed_at); the word itself never changes
+        with self.lock:
+            card = self.get_card(album_name, word)
+            if card is not None:
+                card.update({key: value for key, value in changes.items() if key != 'word'})
+                self.version += 1
+            return card
+
+    def remove_card(self, album_name: str, word: str) -> bool:
+        with self.lock:
+            position = self.word_index.get(album_name, {}).pop(word, None)
+            if position is None:
+                return False
+            cards = self.albums[album_name]
+            card = cards.pop(position)
+            self.version += 1
+            for index in range(position, len(cards)):
+                self.word_index[album_name][cards[index]['word']] = index
+            lemma = lemmatize(word)
+            self.known_counts[lemma] -= 1
+            forgotten = set()
+            if self.known_counts[lemma] == 0:
+                del self.known_counts[lemma]
+                forgotten.add(lemma)
+        if forgotten:
+            self.notify(album_name, set(), forgotten)
+        for callback in self.card_listeners:
+            callback(album_name, card, False)
+        return True
+
+    def known_lemmas(self) -> Set[str]:
+        return set(self.known_counts)
+
+    def dumps(self) -> Optional[bytes]:
+        # None when nothing changed since the last save
+        with self.lock:
+            if self.version == self.saved_version:
+                return None
+            self.saved_version = self.version
+            return json.dumps(self.albums, ensure_ascii=False).encode()
+
+    def loads(self, data: bytes):
+        # Cards go through add_card so the word index, known lemmas and listeners are all updated
+        for album_name, cards in json.loads(data).items():
+            self.create_album(album_name)
+            for card in cards:
+                self.add_card(album_name, card)
+        with self.lock:
+            self.saved_version = self.version
+
+
+album_store = AlbumStore()
+
+
+def save_albums(store: AlbumStore = album_store, path: str = config.paths.albums):
+    data = store.dumps()
+    if data is not None:
+        atomic_write(path, data)
+
+
+def load_albums(store: AlbumStore = album_store, path: str = config.paths.albums):
+    if os.path.exists(path):
+        with open(path, 'rb') as file:
+            store.loads(file.read())
+
+
+lifecycle.register('albums', save_albums, load_albums)
@@ -0,0 +1,130 @@
+from nicegui import app
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+from starlette.middleware.gzip import GZipMiddleware
+from typing import Dict, Optional, Tuple
+import gzip
+import hashlib
+import mimetypes
+import os
+
+try:
+    import brotli  # optional: smaller than gzip for CSS/JS, used when installed
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE = ('.css', '.js', '.svg', '.html', '.json', '.txt')
+MIN_COMPRESS_BYTES = 512
+IMMUTABLE = 'public, max-age=31536000, immutable'  # only for URLs carrying the current content hash
+REVALIDATE = 'no-cache'
+PAGE_GZIP_MIN_BYTES = 1024
+
+
+class StaticAssets:
+    # Serves a directory with precompressed variants (name.br / name.gz written next to the source) and
+    # long-lived cache headers for versioned URLs, so repeat visits cost no request at all
+    def __init__(self, directory: str, prefix: str = '/static'):
+        self.directory = os.path.realpath(directory)
+        self.prefix = prefix
+        self.versions: Dict[str, Tuple[int, str]] = {}  # name -> (mtime_ns, content hash)
+        self.installed = False
+
+    def mount(self):
+        app.get(self.prefix + '/{name:path}', include_in_schema=False)(self.serve)
+
+    def install(self):
+        # Called once by each entry point before ui.run(): compress page payloads on the fly
+        if self.installed:
+            return
+        self.installed = True
+        app.add_middleware(PageCompression, minimum_size=PAGE_GZIP_MIN_BYTES, skip=(self.prefix + '/', '/albums/'))
+
+    def path_of(self, name: str) -> Optional[str]:
+        path = os.path.realpath(os.path.join(self.directory, name))
+        if not path.startswith(self.directory + os.sep) or not os.path.isfile(path):
+            return None
+        return path
+
+    def version(self, name: str) -> str:
+        # Recomputed only when the file changes, so edits during development get a new URL
+        path = self.path_of(name)
+        if path is None:
+            raise FileNotFoundError(name)
+        mtime = os.stat(path).st_mtime_ns
+        cached = self.versions.get(name)
+        if cached is None or cached[0] != mtime:
+            with open(path, 'rb') as file:
+                data = file.read()
+            cached = (mtime, hashlib.sha1(data).hexdigest()[:10])
+            self.versions[name] = cached
+            self.precompress(path, data, mtime)
+        return cached[1]
+
+    def url(self, name: str) -> str:
+        return f'{self.prefix}/{name}?v={self.version(name)}'
+
+    def precompress(self, path: str, data: bytes, mtime: int):
+        if not path.endswith(COMPRESSIBLE) or len(data) < MIN_COMPRESS_BYTES:
+            return
+        variants = [('.gz', lambda: gzip.compress(data, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append(('.br', lambda: brotli.compress(data, quality=11)))
+        for suffix, compress in variants:
+            target = path + suffix
+            try:
+                if os.path.exists(target) and os.stat(target).st_mtime_ns >= mtime:
+                    continue
+                temp = target + '.tmp'
+                with open(temp, 'wb') as file:
+                    file.write(compress())
+                os.replace(temp, target)
+            except OSError:
+                continue  # read-only checkout: serve the plain file
+
+    def precompress_all(self):
+        for root, _, files in os.walk(self.directory):
+            for filename in files:
+                if filename.endswith(COMPRESSIBLE):
+                    self.version(os.path.relpath(os.path.join(root, filename), self.directory))
+
+    def pick_encoding(self, path: str, accept: str) -> Tuple[str, Optional[str]]:
+        accepted = {part.split(';')[0].strip() for part in accept.split(',')}
+        mtime = os.stat(path).st_mtime_ns
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            candidate = path + suffix
+            if encoding in accepted and os.path.exists(candidate) and os.stat(candidate).st_mtime_ns >= mtime:
+                return candidate, encoding
+        return path, None
+
+    def serve(self, name: str, request: Request):
+        path = self.path_of(name)
+        if path is None or path.endswith(('.gz', '.br', '.tmp')):
+            return Response(status_code=404)
+        current = request.query_params.get('v') == self.version(name)
+        headers = {'Cache-Control': IMMUTABLE if current else REVALIDATE, 'Vary': 'Accept-Encoding'}
+        file_path, encoding = self.pick_encoding(path, request.headers.get('accept-encoding', ''))
+        if encoding:
+            headers['Content-Encoding'] = encoding
+        # Computed up front (FileResponse only adds its own ETag while sending), one per encoding
+        stat = os.stat(file_path)
+        headers['ETag'] = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}-{encoding or "identity"}"'
+        if_none_match = request.headers.get('if-none-match')
+        if if_none_match is not None and headers['ETag'] in (tag.strip() for tag in if_none_match.split(',')):
+            return Response(status_code=304, headers=headers)
+        media_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        return FileResponse(file_path, media_type=media_type, headers=headers, stat_result=stat)
+
+
+class PageCompression:
+    # GZip for pages, NiceGUI's own bundles and API responses. Static assets are already compressed
+    # and album exports are gzip files, so those paths pass through untouched
+    def __init__(self, app, minimum_size: int = PAGE_GZIP_MIN_BYTES, skip: Tuple[str, ...] = ()):
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size)
+        self.skip = skip
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and not scope['path'].startswith(self.skip):
+            await self.gzip(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
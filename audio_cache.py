@@ -0,0 +1,181 @@
+from nicegui import app
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+from typing import Dict, Optional
+from urllib.parse import urlparse
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import requests
+
+CHUNK_SIZE = 64 * 1024
+# Audio files are named after a hash of their source URL, so their content never changes
+CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+def file_etag(path: str) -> str:
+    stat = os.stat(path)
+    return f'"{stat.st_size:x}-{int(stat.st_mtime):x}"'
+
+
+def parse_range(header: Optional[str], size: int):
+    # Only a single "bytes=start-end" range is supported (what browsers send for audio)
+    if not header or not header.startswith('bytes='):
+        return None
+    spec = header[len('bytes='):].split(',')[0].strip()
+    start_text, _, end_text = spec.partition('-')
+    try:
+        if start_text:
+            start = int(start_text)
+            end = int(end_text) if end_text else size - 1
+        else:
+            # "bytes=-500" means the last 500 bytes
+            start = max(size - int(end_text), 0)
+            end = size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        return 'invalid'
+    return start, min(end, size - 1)
+
+
+def iter_file(path: str, start: int, end: int):
+    with open(path, 'rb') as file:
+        file.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = file.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def stream_file(path: str, request: Request, media_type: str = 'audio/mpeg',
+                cache_control: str = CACHE_CONTROL) -> Response:
+    # Stream a file chunk by chunk with Range (206) and ETag (304) support
+    size = os.path.getsize(path)
+    etag = file_etag(path)
+    headers = {'Accept-Ranges': 'bytes', 'Cache-Control': cache_control, 'ETag': etag}
+
+    if request.headers.get('if-none-match') == etag:
+        return Response(status_code=304, headers=headers)
+
+    byte_range = parse_range(request.headers.get('range'), size)
+    if byte_range == 'invalid':
+        headers['Content-Range'] = f'bytes */{size}'
+        return Response(status_code=416, headers=headers)
+    if byte_range is None:
+        headers['Content-Length'] = str(size)
+        return StreamingResponse(iter_file(path, 0, size - 1), media_type=media_type, headers=headers)
+
+    start, end = byte_range
+    headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+    headers['Content-Length'] = str(end - start + 1)
+    return StreamingResponse(iter_file(path, start, end), status_code=206,
+                             media_type=media_type, headers=headers)
+
+
+class AudioCache:
+    def __init__(self, cache_dir='audio_cache', allowed_hosts=('api.dictionaryapi.dev', 'ssl.gstatic.com')):
+        self.cache_dir = cache_dir
+        self.allowed_hosts = allowed_hosts
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        os.makedirs(cache_dir, exist_ok=True)
+        self.sources: Dict[str, str] = self.load_index()  # key -> upstream URL
+        self.lock = threading.Lock()
+        self.key_locks: Dict[str, threading.Lock] = {}
+
+    def load_index(self) -> Dict[str, str]:
+        try:
+            with open(self.index_path, 'r') as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def save_index(self):
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w') as file:
+            json.dump(self.sources, file)
+        os.replace(tmp_path, self.index_path)
+
+    def register(self, url: str) -> Optional[str]:
+        # Register an upstream audio URL and return the local proxy path
+        if url.startswith('//'):
+            url = 'https:' + url
+        parsed = urlparse(url)
+        if parsed.scheme not in ('http', 'https') or parsed.hostname not in self.allowed_hosts:
+            return None
+        ext = os.path.splitext(parsed.path)[1].lower() or '.mp3'
+        key = hashlib.sha1(url.encode()).hexdigest()[:20] + ext
+        with self.lock:
+            if self.sources.get(key) != url:
+                self.sources[key] = url
+                self.save_index()
+        return f'/audio/{key}'
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def fetch(self, key: str) -> Optional[str]:
+        # The first request downloads from the CDN and stores on disk, later ones read from disk
+        path = self.path_for(key)
+        if os.path.exists(path):
+            return path
+        url = self.sources.get(key)
+        if url is None:
+            return None
+
+        with self.lock:
+            key_lock = self.key_locks.setdefault(key, threading.Lock())
+        tmp_path = None
+        try:
+            with key_lock:
+                if os.path.exists(path):
+                    return path
+                with requests.get(url, stream=True, timeout=10) as response:
+                    if response.status_code != 200:
+                        return None
+                    # A private temp name: a download that outlives its key lock never shares a file
+                    handle, tmp_path = tempfile.mkstemp(prefix=key + '.', suffix='.part', dir=self.cache_dir)
+                    with os.fdopen(handle, 'wb') as file:
+                        for chunk in response.iter_content(CHUNK_SIZE):
+                            file.write(chunk)
+                os.replace(tmp_path, path)
+                tmp_path = None
+            return path
+        finally:
+            # Failed or not, leave no partial file and no lock behind for this key
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            with self.lock:
+                self.key_locks.pop(key, None)
+
+
+audio_cache = AudioCache()
+
+
+def audio_url_for(word_data: Dict) -> Optional[str]:
+    # Pick the first pronunciation with audio in an API entry
+    for phonetic in word_data.get('phonetics', []):
+        if phonetic.get('audio'):
+            local_url = audio_cache.register(phonetic['audio'])
+            if local_url:
+                return local_url
+    return None
+
+
+@app.get('/audio/{key}')
+def serve_audio(key: str, request: Request):
+    # Sync handler: FastAPI runs it in a threadpool, so the first download never blocks the event loop
+    if '/' in key or '\\' in key or key.startswith('.'):
+        return Response(status_code=404)
+    try:
+        path = audio_cache.fetch(key)
+    except requests.RequestException:
+        return Response(status_code=502)
+    if path is None:
+        return Response(status_code=404)
+    return stream_file(path, request)
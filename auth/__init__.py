@@ -0,0 +1,5 @@
+from auth.audit import AuthAuditLog, auth_audit
+from auth.models import User
+from auth.store import UserDatabase, user_db
+from auth.tokens import ResetTokens, reset_tokens
+from auth.pages import register_pages
@@ -0,0 +1,206 @@
+from nicegui import app
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from typing import Deque, Dict, List, Optional
+import glob
+import hashlib
+import json
+import os
+import queue
+import secrets
+import threading
+
+from config import config
+from metrics import registry as metrics
+
+AUDIT_PATH = config.paths.auth_audit
+MAX_BYTES = 5 * 1024 * 1024  # Xoay file khi vượt 5 MB
+BACKUPS = 5  # auth_events.jsonl.1 ... .5
+QUEUE_SIZE = 10000
+BATCH_SIZE = 500
+FLUSH_SECONDS = 0.5
+RECENT_PER_ACCOUNT = 50
+RECENT_ACCOUNTS = 10000  # Chỉ giữ sự kiện của các tài khoản dùng gần nhất, tài khoản cũ nhất bị bỏ trước
+# Không bao giờ ghi các trường này, kể cả khi người gọi lỡ truyền vào
+SECRET_KEYS = ('password', 'hash', 'token', 'secret')
+# Muối cho mã băm của định danh không khớp tài khoản nào, đổi mỗi lần khởi động
+UNKNOWN_SALT = secrets.token_bytes(16)
+
+metrics.describe('auth_events_total', 'Authentication events by event and outcome')
+metrics.describe('auth_events_dropped_total', 'Authentication events dropped because the audit queue was full')
+
+
+def sanitize(details: Dict) -> Dict:
+    clean = {}
+    for key, value in details.items():
+        if any(secret in key.lower() for secret in SECRET_KEYS):
+            continue
+        clean[key] = value if isinstance(value, (str, int, float, bool)) or value is None else str(value)
+    return clean
+
+
+def account_key(account: Optional[str]) -> str:
+    # Người dùng đăng nhập bằng username hoặc email, gõ hoa thường tùy ý
+    return (account or '').strip().lower()
+
+
+def unknown_account(identifier: Optional[str]) -> str:
+    # Username/email không tồn tại có thể là email thật gõ nhầm: chỉ ghi mã băm có muối, vẫn gom được
+    # các lần thử cùng một giá trị trong một lần chạy
+    digest = hashlib.sha256(UNKNOWN_SALT + account_key(identifier).encode()).hexdigest()[:16]
+    return f'unknown:{digest}'
+
+
+def remember_in(recent: 'OrderedDict[str, Deque[Dict]]', record: Dict):
+    # LRU theo tài khoản: tài khoản vừa có sự kiện lên cuối, vượt RECENT_ACCOUNTS thì bỏ tài khoản đầu
+    records = recent.get(record['account'])
+    if records is None:
+        records = recent[record['account']] = deque(maxlen=RECENT_PER_ACCOUNT)
+        if len(recent) > RECENT_ACCOUNTS:
+            recent.popitem(last=False)
+    else:
+        recent.move_to_end(record['account'])
+    records.append(record)
+
+
+# Nhật ký sự kiện xác thực: handler chỉ bỏ bản ghi vào hàng đợi, một luồng nền ghi theo lô
+class AuthAuditLog:
+    def __init__(self, filepath=AUDIT_PATH, max_bytes=MAX_BYTES, backups=BACKUPS):
+        self.filepath = filepath
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.queue: queue.Queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self.recent_events: 'OrderedDict[str, Deque[Dict]]' = OrderedDict()
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.thread = None
+        self.installed = False
+
+    def install(self):
+        # Gọi một lần ở mỗi entry point trước ui.run(): ghi nốt hàng đợi khi server dừng
+        if self.installed:
+            return
+        self.installed = True
+        app.on_shutdown(self.close)
+
+    # Ghi -----------------------------------------------------------------
+
+    def log(self, event: str, account: Optional[str], success: bool, **details):
+        # Không chặn: không mở file, không chờ khóa của luồng ghi
+        record = {
+            'ts': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+            'event': event,
+            'account': account_key(account),
+            'success': success,
+            **sanitize(details),
+        }
+        self.start()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            metrics.inc('auth_events_dropped_total')
+            return
+        metrics.inc('auth_events_total', event=event, outcome='success' if success else 'failure')
+        with self.lock:
+            self.remember(record)
+
+    def remember(self, record: Dict):
+        remember_in(self.recent_events, record)
+
+    def start(self):
+        if self.thread is None or not self.thread.is_alive():
+            with self.lock:
+                if self.thread is None or not self.thread.is_alive():
+                    self.thread = threading.Thread(target=self.run, name='auth-audit', daemon=True)
+                    self.thread.start()
+
+    def run(self):
+        while True:
+            record = self.queue.get()
+            if record is None:
+                return
+            batch = [record]
+            # Gom các bản ghi đang chờ để mỗi lô chỉ mở và ghi file một lần
+            while len(batch) < BATCH_SIZE:
+                try:
+                    record = self.queue.get(timeout=FLUSH_SECONDS if len(batch) == 1 else 0)
+                except queue.Empty:
+                    break
+                if record is None:
+                    self.write(batch)
+                    return
+                batch.append(record)
+            self.write(batch)
+
+    def write(self, batch: List[Dict]):
+        data = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in batch)
+        try:
+            if os.path.exists(self.filepath) and os.path.getsize(self.filepath) + len(data) > self.max_bytes:
+                self.rotate()
+            with open(self.filepath, 'a', encoding='utf-8') as file:
+                file.write(data)
+        except OSError as exc:
+            print(f"Error writing auth audit log: {exc}")
+
+    def rotate(self):
+        for index in range(self.backups - 1, 0, -1):
+            source = f'{self.filepath}.{index}'
+            if os.path.exists(source):
+                os.replace(source, f'{self.filepath}.{index + 1}')
+        os.replace(self.filepath, f'{self.filepath}.1')
+
+    def close(self):
+        # Chờ luồng nền ghi hết hàng đợi
+        if self.thread is not None and self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join(timeout=5)
+
+    # Đọc -----------------------------------------------------------------
+
+    def files(self) -> List[str]:
+        # Cũ nhất trước: .5, .4, ..., .1, rồi file hiện tại
+        backups = [path for path in glob.glob(f'{glob.escape(self.filepath)}.*') if path.rsplit('.', 1)[1].isdigit()]
+        backups.sort(key=lambda path: int(path.rsplit('.', 1)[1]), reverse=True)
+        return backups + ([self.filepath] if os.path.exists(self.filepath) else [])
+
+    def load(self):
+        # Lần tra cứu đầu tiên đọc lại các file cũ; sau đó chỉ dùng bộ nhớ
+        on_disk: 'OrderedDict[str, Deque[Dict]]' = OrderedDict()
+        for path in self.files():
+            try:
+                with open(path, 'r', encoding='utf-8') as file:
+                    for line in file:
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
+                        if isinstance(record, dict):
+                            remember_in(on_disk, {**record, 'account': record.get('account', '')})
+            except OSError:
+                continue
+        with self.lock:
+            # Bản ghi mới hơn (đã ghi hoặc còn trong hàng đợi) nằm trong bộ nhớ, ghép sau bản ghi trên đĩa
+            for account, records in self.recent_events.items():
+                seen = {(record['ts'], record['event']) for record in on_disk.get(account, ())}
+                for record in records:
+                    if (record['ts'], record['event']) not in seen:
+                        remember_in(on_disk, record)
+            self.recent_events = on_disk
+            self.loaded = True
+
+    def recent(self, account: str, limit: int = 20, event: Optional[str] = None) -> List[Dict]:
+        # Sự kiện gần nhất của một tài khoản, mới nhất trước
+        if not self.loaded:
+            self.load()
+        with self.lock:
+            key = account_key(account)
+            records = list(self.recent_events.get(key, ()))
+            if records:
+                self.recent_events.move_to_end(key)
+        records.reverse()
+        if event is not None:
+            records = [record for record in records if record['event'] == event]
+        return records[:limit]
+
+
+auth_audit = AuthAuditLog()
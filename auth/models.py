@@ -0,0 +1,27 @@
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from config import config
+
+
+# Tham số băm mật khẩu lấy từ cấu hình; hàm ở mức module để admin_cli gửi được sang tiến trình con
+def hash_password(password):
+    return generate_password_hash(password, method=config.auth.hash_method, salt_length=config.auth.salt_length)
+
+
+# Định nghĩa lớp User để đại diện cho người dùng trong hệ thống
+class User:
+    def __init__(self, username, fullname, email, birthdate, password=None, password_hash=None):
+        self.username = username  # Tên đăng nhập
+        self.fullname = fullname  # Họ tên đầy đủ
+        self.email = email        # Email người dùng
+        self.birthdate = birthdate  # Ngày sinh
+        if password:
+            self.password_hash = hash_password(password)  # Mã hóa mật khẩu mới
+        else:
+            self.password_hash = password_hash  # Sử dụng mật khẩu đã mã hóa
+
+    def check_password(self, password):
+        return check_password_hash(self.password_hash, password)  # Kiểm tra mật khẩu có khớp không
+
+    def to_dict(self):
+        return dict(self.__dict__)
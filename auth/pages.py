@@ -0,0 +1,301 @@
+from nicegui import ui
+from datetime import datetime
+
+from auth.audit import auth_audit, unknown_account
+from auth.models import User, hash_password
+from auth.store import user_db
+from auth.tokens import reset_tokens
+from auth.utils import create_centered_container, redirect, get_date_limits, plain_background
+from loop_watchdog import watchdog
+
+# Nền của các trang, mỗi entry point chọn một kiểu qua register_pages()
+background = plain_background
+
+def page_background():
+    background()
+
+# Trang đăng nhập (/)
+def login_page():
+    page_background()
+    # Tạo giao diện đăng nhập
+    with create_centered_container():
+        with ui.card().classes('w-full p-8 rounded-lg shadow-lg'):
+            # Tiêu đề
+            ui.label('Log in').classes('text-3xl font-bold text-center mb-6')
+            
+            with ui.column().classes('w-full gap-4'):
+                # Form đăng nhập
+                with ui.row().classes('w-full items-center gap-2'):
+                    username_input = ui.input('Your email...').props('rounded').props('outlined required').classes('w-full')    
+                with ui.row().classes('w-full items-center gap-2'):
+                    password_input = ui.input('Enter password...').props('rounded').props('outlined required type=password').classes('w-full')
+                # Link quên mật khẩu
+                ui.link('Forgot password?', '/forgot-password').classes('text-blue-500 text-center hover:text-blue-700 cursor-pointer no-underline')
+                
+                # Xử lý đăng nhập
+                @watchdog.tracked('handle_login')
+                async def handle_login():
+                    success, message = user_db.authenticate_user(username_input.value, password_input.value)
+                    # Chỉ đưa vào hàng đợi, luồng nền ghi file; lý do sai chỉ có trong nhật ký.
+                    # Luôn ghi username của tài khoản (kể cả khi đăng nhập bằng email), không bao giờ ghi giá trị đã gõ
+                    known = user_db.find_user_by_username(username_input.value) or user_db.find_user_by_email(username_input.value)
+                    auth_audit.log('login', known.username if known else unknown_account(username_input.value), success,
+                                   reason=None if success else ('wrong_password' if known else 'unknown_account'))
+                    ui.notify(message, color='positive' if success else 'negative')
+                    if success:
+                        redirect('/home')
+
+                # Nút đăng nhập
+                ui.button('LOG IN', on_click=handle_login).props('rounded').classes('w-full bg-indigo hover:bg-indigo-600 text-white font-semibold py-2 rounded-lg shadow-md')
+                
+                # Phần link đăng ký
+                with ui.row().classes('w-full justify-center items-center gap-2 mt-4'):
+                    ui.label('Do not have account yet?').classes('text-center')
+                    ui.link('Create account', '/register').classes('text-blue-500 hover:text-blue-700 cursor-pointer no-underline')
+
+# Trang đăng ký (/register)
+def register_page():
+    page_background()
+    # Lấy giới hạn ngày
+    min_date, max_date = get_date_limits()
+    
+    # Tạo giao diện đăng ký
+    with create_centered_container():
+
+        with ui.card().classes('w-full p-8 rounded-lg shadow-lg'):
+            # Tiêu đề
+            ui.label('Sign up').classes('text-3xl front-bold text-center mb-6')
+            
+            with ui.column().classes('w-full gap-4') as form_container:
+                # Form đăng ký
+                username_input = ui.input('Login name*').props('rounded').props('outlined required').classes('w-full')
+                fullname_input = ui.input('User name*').props('rounded').props('outlined required').classes('w-full')
+                email_input = ui.input('Email*').props('rounded').props('outlined required type=email').classes('w-full')
+                birthdate_input = ui.input('Date of birth*').props('rounded').props(f'outlined required type=date min="{min_date}" max="{max_date}"').classes('w-full')
+                password_input = ui.input('Password*').props('rounded').props('outlined required type=password').classes('w-full')
+                confirm_password_input = ui.input('Confirm password*').props('rounded').props('outlined required type=password').classes('w-full')
+                
+                # Thông báo
+                ui.label('* Please enter correctly and remember the information to retrieve your password when necessary').classes('text-red-500 text-sm mb-2')
+
+                # Nút đăng ký
+                register_button = ui.button('SIGN UP').props('rounded').classes('w-full bg-indigo hover:bg-indigo text-white font-semibold py-2 rounded-lg shadow-md')
+                
+                # Xử lý đăng ký
+                @watchdog.tracked('validate_and_register')
+                async def validate_and_register():
+                    # Kiểm tra ngày sinh
+                    if not birthdate_input.value:
+                        ui.notify('Please enter your date of birth!', color='negative')
+                        return
+                    
+                    # Kiểm tra định dạng ngày
+                    input_date = datetime.strptime(birthdate_input.value, '%Y-%m-%d')
+                    min_date_obj = datetime.strptime(min_date, '%Y-%m-%d')
+                    max_date_obj = datetime.strptime(max_date, '%Y-%m-%d')
+
+                    # Validate ngày sinh
+                    if input_date < min_date_obj or input_date > max_date_obj:
+                        birthdate_input.value = min_date
+                        ui.notify('Invalid date of birth', color='negative')
+                        return
+                    
+                    # Kiểm tra mật khẩu
+                    if password_input.value != confirm_password_input.value:
+                        ui.notify('Password does not match!', color='negative')
+                        return
+                    
+                    # Kiểm tra email
+                    if not '@' in email_input.value:
+                        ui.notify('Invalid email!', color='negative')
+                        return
+                    
+                    # Tạo user mới
+                    new_user = User(
+                        username=username_input.value,
+                        fullname=fullname_input.value,
+                        email=email_input.value,
+                        birthdate=birthdate_input.value,
+                        password=password_input.value
+                    )
+                    
+                    # Thêm user vào database
+                    success, message = user_db.add_user(new_user)
+                    # Không ghi email: tài khoản đã được xác định bằng username
+                    auth_audit.log('register', new_user.username, success, reason=None if success else message)
+
+                    ui.notify(message, color='positive' if success else 'negative')
+                    if success:
+                        register_button.visible = False
+                        ui.link('Back to log in', '/').classes('w-full text-center text-blue-500 hover:text-blue-700 cursor-pointer no-underline')
+
+                register_button.on_click(validate_and_register)
+
+# Trang quên mật khẩu (/forgot-password)
+def forgot_password_page():
+    page_background()
+    # Tạo giao diện quên mật khẩu
+    with create_centered_container():
+        with ui.card().classes('w-full p-8 rounded-lg shadow-lg'):
+            # Tiêu đề
+            ui.label('Find your account').classes('text-3xl font-bold text-center mb-6')
+            
+            with ui.column().classes('w-full gap-4'):
+                # Thông báo
+                ui.label('* Please enter your registered email').classes('text-red-500 text-sm mb-2')
+                # Input email
+                email_input = ui.input('Email').props('rounded').props('outlined required').classes('w-full')
+                
+                # Xử lý xác minh email
+                async def verify_email():
+                    if not '@' in email_input.value:
+                        ui.notify('Invalid email!', color='negative')
+                        return
+                    
+                    user = user_db.find_user_by_email(email_input.value)
+                    auth_audit.log('reset_lookup', user.username if user else unknown_account(email_input.value), bool(user))
+                    if user:
+                        ui.notify('Account found! Verify informaion', color='positive')
+                        ui.timer(2.0, lambda: redirect(f'/verify-account/{user.username}'))
+                    else:
+                        ui.notify('No account found', color='negative')
+
+                # Nút tiếp tục
+                ui.button('Continue', on_click=verify_email).props('rounded').classes('w-full bg-indigo text-white')
+                
+                # Link quay lại
+                with ui.row().classes('w-full justify-center items-center gap-2 mt-4'):
+                    ui.link('Back to log in', '/').classes('text-blue-500 hover:text-blue-700 cursor-pointer no-underline')
+
+# Trang xác minh tài khoản (/verify-account/{username})
+def verify_account_page(username: str):
+    page_background()
+    # Lấy giới hạn ngày
+    min_date, max_date = get_date_limits()
+    
+    # Tạo giao diện xác minh
+    with create_centered_container():
+        with ui.card().classes('w-full p-8 rounded-lg shadow-lg'):
+            # Tiêu đề
+            ui.label('Verify information').classes('text-3xl font-bold text-center mb-6')
+            
+            with ui.column().classes('w-full gap-4'):
+                # Thông báo
+                ui.label('* Please enter correct registration information').classes('text-red-500 text-sm mb-2')
+                # Form xác minh
+                fullname_input = ui.input('User name').props('rounded').props('outlined required').classes('w-full')
+                birthdate_input = ui.input('Date of birth*').props('rounded').props(f'outlined required type=date min="{min_date}" max="{max_date}"').classes('w-full')
+                
+                # Xử lý xác minh thông tin
+                async def verify_info():
+                    user = user_db.find_user_by_username(username)
+                    verified = bool(user and user.fullname == fullname_input.value and user.birthdate == birthdate_input.value)
+                    auth_audit.log('reset_verify', user.username if user else unknown_account(username), verified)
+                    if verified:
+                        # Cấp token dùng một lần thay vì đưa username lên URL
+                        token = reset_tokens.issue(username)
+                        ui.notify('Verified successfully! Reset password...', color='positive')
+                        ui.timer(2.0, lambda: redirect(f'/reset-password/{token}'), once=True)
+                    else:
+                        ui.notify('Incorrect information!', color='negative')
+
+                # Nút xác minh
+                ui.button('Verify', on_click=verify_info).props('rounded').classes('w-full bg-indigo text-white')
+                
+                # Link quay lại
+                with ui.row().classes('w-full justify-center items-center gap-2 mt-4'):
+                    ui.link('Back', '/forgot-password').classes('text-blue-500 hover:text-blue-700 cursor-pointer no-underline')
+
+# Định nghĩa trang đặt lại mật khẩu với tham số token
+def reset_password_page(token: str):
+    page_background()
+    # Tạo container có căn giữa để hiển thị form
+    with create_centered_container():
+        # Tạo card chứa form đặt lại mật khẩu
+        with ui.card().classes('w-full p-6'):
+            # Tiêu đề của form
+            ui.label('Reset password').classes('text-3xl font-bold text-center mb-6')
+
+            # Token sai, đã dùng hoặc hết hạn: không hiện form
+            if reset_tokens.peek(token) is None:
+                ui.label('This reset link is invalid or has expired.').classes('text-red-500 text-center')
+                ui.link('Find your account again', '/forgot-password')\
+                    .classes('w-full text-center text-blue-500 hover:text-blue-700 cursor-pointer no-underline')
+                return
+            
+            # Tạo cột chứa các trường nhập liệu
+            with ui.column().classes('w-full gap-4'):
+                # Input field cho mật khẩu mới
+                new_password = ui.input('New password*')\
+                    .props('outlined required type=password').props('rounded')\
+                    .classes('w-full')
+                
+                # Input field để xác nhận mật khẩu mới
+                confirm_password = ui.input('Verify new passwprd*')\
+                    .props('rounded').props('outlined required type=password')\
+                    .classes('w-full')
+                
+                # Nút để thực hiện đặt lại mật khẩu
+                reset_button = ui.button('Change password')\
+                    .props('rounded').classes('w-full bg-indigo text-white')
+                
+                # Hàm xử lý sự kiện khi nhấn nút đặt lại mật khẩu
+                async def reset_password():
+                    # Kiểm tra xem hai mật khẩu có khớp nhau không
+                    if new_password.value != confirm_password.value:
+                        ui.notify('Password does not match!', color='negative')
+                        return
+                    
+                    # Dùng token (chỉ một lần) để biết user, rồi tìm user trong database
+                    username = reset_tokens.consume(token)
+                    user = user_db.find_user_by_username(username) if username else None
+                    if user:
+                        # Cập nhật mật khẩu mới đã được mã hóa và lưu qua nhật ký của user store
+                        user.password_hash = hash_password(new_password.value)
+                        user_db.update_user(user)
+                        auth_audit.log('password_reset', username, True)
+                        # Hiển thị thông báo thành công
+                        ui.notify('Change password successfully!', color='positive')
+                        # Ẩn nút đặt lại mật khẩu
+                        reset_button.visible = False
+                        # Hiển thị link quay về trang đăng nhập
+                        ui.link('Back to log in', '/')\
+                            .classes('w-full text-center text-blue-500 hover:text-blue-700 cursor-pointer no-underline')
+                    else:
+                        # Token đã được dùng hoặc hết hạn trong lúc nhập
+                        auth_audit.log('password_reset', username, False, reason='token_invalid')
+                        ui.notify('This reset link is invalid or has expired.', color='negative')
+                
+                # Gán hàm xử lý sự kiện cho nút đặt lại mật khẩu
+                reset_button.on_click(reset_password)
+
+# Định nghĩa trang chủ sau khi đăng nhập
+def home_page():
+    #ui.query('body').style('margin: 0; padding: 0; background: linear-gradient(135deg, #f0f4ff, #e5e7ff);')
+    # Tạo cột chứa nội dung trang chủ
+    #with ui.column().classes('w-full items-center p-4'):
+        # Hiển thị thông điệp chào mừng
+    #    ui.label('Chào mừng đến trang chủ!')\
+    #        .classes('text-2xl font-bold mb-4')
+        # Tạo nút đăng xuất và chuyển hướng về trang đăng nhập
+    #    ui.button('Đăng xuất', on_click=lambda: redirect('/'))\
+    #        .classes('bg-red-500 text-white')
+    pass
+
+# Đường dẫn của từng trang xác thực
+PAGES = {
+    '/': login_page,
+    '/register': register_page,
+    '/forgot-password': forgot_password_page,
+    '/verify-account/{username}': verify_account_page,
+    '/reset-password/{token}': reset_password_page,
+    '/home': home_page,
+}
+
+def register_pages(background_builder=plain_background):
+    # Đăng ký tất cả các trang xác thực với NiceGUI; trả về bảng đường dẫn -> hàm dựng trang
+    global background
+    background = background_builder
+    for path, builder in PAGES.items():
+        ui.page(path)(builder)
+    return PAGES
@@ -0,0 +1,257 @@
+from contextlib import contextmanager
+import json
+import os
+import threading
+import time
+
+from config import config
+from lifecycle import lifecycle
+from metrics import timed
+from auth.models import User
+
+try:
+    import fcntl  # Khóa file giữa các tiến trình (không có trên Windows)
+except ImportError:
+    fcntl = None
+
+REFRESH_SECONDS = 1.0  # Kiểm tra file thay đổi tối đa một lần mỗi giây
+
+
+# Định nghĩa lớp UserDatabase để quản lý dữ liệu người dùng
+class UserDatabase:
+    def __init__(self, filepath=config.paths.users):
+        self.filepath = filepath  # Đường dẫn file JSON lưu dữ liệu
+        self.lock = threading.RLock()
+        self.lock_depth = 0
+        self.dirty = set()  # Username đã sửa trong tiến trình này nhưng chưa ghi ra file
+        self.signature = None  # (mtime, size) của file ở lần đọc/ghi gần nhất
+        self.checked_at = 0.0
+        # Nhật ký ghi thêm (users.json.journal): mỗi thay đổi nhỏ là một dòng JSON, không ghi lại cả file
+        self.journal_path = filepath + '.journal'
+        self.journal_offset = 0  # Vị trí đã đọc tới trong nhật ký
+        self.journal_entries = 0
+        self.replayers = {'user': self.replay_user}  # op -> hàm áp dụng một dòng nhật ký
+        self.snapshots = []  # Các hàm trả về những dòng cần giữ lại khi gộp nhật ký
+        self.users = self.load_users()  # Tải dữ liệu người dùng khi khởi tạo
+        self.emails = {user.email: username for username, user in self.users.items()}  # Chỉ mục email -> username
+        self.read_journal()
+
+    def file_signature(self):
+        try:
+            stat = os.stat(self.filepath)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def read_file(self):
+        # Đọc dữ liệu thô từ file JSON
+        try:
+            with open(self.filepath, 'r') as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}  # Trả về dict rỗng nếu file không tồn tại hoặc lỗi
+
+    def load_users(self):
+        self.signature = self.file_signature()
+        return {username: User(**user) for username, user in self.read_file().items()}
+
+    def refresh(self, force=False):
+        # Nạp lại các bản ghi mà tiến trình khác đã thay đổi, chỉ khi file thực sự khác đi
+        now = time.monotonic()
+        if not force and now - self.checked_at < REFRESH_SECONDS:
+            return
+        self.checked_at = now
+        signature = self.file_signature()
+        with self.lock:
+            if signature != self.signature:
+                # users.json đã được ghi lại (có thể kèm gộp nhật ký): so sánh từng bản ghi rồi đọc lại nhật ký từ đầu
+                data = self.read_file()
+                for username, record in data.items():
+                    self.apply_record(username, record)
+                for username in [name for name in self.users if name not in data and name not in self.dirty]:
+                    self.emails.pop(self.users.pop(username).email, None)
+                self.signature = signature
+                self.journal_offset = 0
+                self.journal_entries = 0
+            self.read_journal()
+
+    def apply_record(self, username, record):
+        if username in self.dirty:
+            return  # Bản ghi đang sửa ở đây sẽ được ghi đè khi lưu
+        user = self.users.get(username)
+        if user is None:
+            self.users[username] = User(**record)
+        elif user.to_dict() != record:
+            self.emails.pop(user.email, None)
+            user.__dict__.update(record)  # Cập nhật tại chỗ để các tham chiếu đang giữ vẫn đúng
+        self.emails[record['email']] = username
+
+    # Nhật ký ------------------------------------------------------------
+
+    def on_journal(self, op, replayer):
+        # Đăng ký hàm áp dụng các dòng nhật ký loại op, rồi áp dụng ngay các dòng đã có
+        self.replayers[op] = replayer
+        for entry in self.iter_journal(0)[0]:
+            if entry.get('op') == op:
+                replayer(entry)
+
+    def on_compact(self, snapshot):
+        # snapshot() trả về các dòng nhật ký vẫn còn hiệu lực sau khi gộp (ví dụ token chưa hết hạn)
+        self.snapshots.append(snapshot)
+
+    def iter_journal(self, offset):
+        entries = []
+        try:
+            with open(self.journal_path, 'rb') as file:
+                file.seek(offset)
+                for line in file:
+                    if not line.endswith(b'\n'):
+                        break  # Dòng đang ghi dở của tiến trình khác
+                    offset += len(line)
+                    try:
+                        entries.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+        except FileNotFoundError:
+            pass
+        return entries, offset
+
+    def read_journal(self):
+        # Chỉ đọc các dòng mới kể từ lần trước
+        entries, self.journal_offset = self.iter_journal(self.journal_offset)
+        for entry in entries:
+            replayer = self.replayers.get(entry.get('op'))
+            if replayer:
+                replayer(entry)
+        self.journal_entries += len(entries)
+
+    def replay_user(self, entry):
+        self.apply_record(entry['username'], entry['record'])
+
+    def append_journal(self, entry):
+        # Ghi thêm một dòng thay vì ghi lại toàn bộ users.json; gộp lại khi nhật ký quá dài
+        with self.file_lock():
+            self.refresh(force=True)
+            # refresh có thể vừa đè bản ghi trong bộ nhớ bằng bản cũ từ file, còn dòng này sẽ không bao giờ
+            # được đọc lại (journal_offset đã vượt qua nó): áp dụng lại trước khi ghi
+            replayer = self.replayers.get(entry.get('op'))
+            if replayer:
+                replayer(entry)
+            line = json.dumps(entry) + '\n'
+            with open(self.journal_path, 'a') as file:
+                file.write(line)
+            self.journal_offset += len(line.encode())
+            self.journal_entries += 1
+            # Số dòng nhật ký tối đa trước khi gộp lại vào users.json, đọc mỗi lần vì có thể đổi lúc đang chạy
+            if self.journal_entries >= config.auth.journal_limit:
+                self.save_users()
+
+    @contextmanager
+    def file_lock(self):
+        # Chỉ một tiến trình được ghi users.json tại một thời điểm
+        with self.lock:
+            # Đã giữ khóa (gọi lồng nhau, ví dụ add_user -> save_users): flock không cho khóa lại lần hai
+            if fcntl is None or self.lock_depth:
+                self.lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self.lock_depth -= 1
+                return
+            with open(self.filepath + '.lock', 'w') as handle:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                self.lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self.lock_depth -= 1
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def add_user(self, user):
+        with self.file_lock():
+            self.refresh(force=True)
+            # Kiểm tra username đã tồn tại
+            if user.username in self.users:
+                return False, "Username already exists!"
+
+            # Kiểm tra email đã được sử dụng (tra chỉ mục, không duyệt toàn bộ)
+            if user.email in self.emails:
+                return False, "Email is already in use!"
+
+            # Thêm user mới và ghi một dòng nhật ký
+            self.users[user.username] = user
+            self.emails[user.email] = user.username
+            self.append_journal({'op': 'user', 'username': user.username, 'record': user.to_dict()})
+        return True, "Sign uo successfully!"
+
+    def add_users(self, users):
+        # Thêm nhiều user một lúc và chỉ lưu file một lần; trả về danh sách (user, lỗi) bị từ chối
+        rejected = []
+        with self.file_lock():
+            self.refresh(force=True)
+            for user in users:
+                if user.username in self.users:
+                    rejected.append((user, "Username already exists!"))
+                elif user.email in self.emails:
+                    rejected.append((user, "Email is already in use!"))
+                else:
+                    self.users[user.username] = user
+                    self.emails[user.email] = user.username
+                    self.dirty.add(user.username)
+            if len(rejected) < len(users):
+                self.save_users()
+        return rejected
+
+    def update_user(self, user):
+        # Lưu thay đổi của một user đã có (ví dụ đổi mật khẩu) qua nhật ký; bản ghi được chụp trước khi
+        # append_journal đọc lại file, nên thay đổi của tiến trình khác không ghi đè được nó
+        self.append_journal({'op': 'user', 'username': user.username, 'record': user.to_dict()})
+
+    @timed('user_store_save_seconds')
+    def save_users(self):
+        # Gộp thay đổi của tiến trình khác, rồi ghi file tạm và đổi tên để không bao giờ để lại file ghi dở.
+        # Nhật ký được làm mới, chỉ giữ lại những dòng còn hiệu lực
+        with self.file_lock():
+            self.refresh(force=True)
+            temp_path = f'{self.filepath}.tmp'
+            with open(temp_path, 'w') as file:
+                json.dump({username: user.to_dict() for username, user in self.users.items()}, file)
+            kept = [entry for snapshot in self.snapshots for entry in snapshot()]
+            journal = ''.join(json.dumps(entry) + '\n' for entry in kept)
+            with open(self.journal_path + '.tmp', 'w') as file:
+                file.write(journal)
+            os.replace(temp_path, self.filepath)
+            os.replace(self.journal_path + '.tmp', self.journal_path)
+            self.signature = self.file_signature()
+            self.journal_offset = len(journal.encode())
+            self.journal_entries = len(kept)
+            self.dirty.clear()
+
+    def flush(self):
+        # Khi tắt server: gộp nhật ký vào users.json, lần khởi động sau chỉ cần đọc một file
+        if self.dirty or self.journal_entries:
+            self.save_users()
+
+    def find_user_by_username(self, username):
+        # Tìm user theo username
+        self.refresh()
+        return self.users.get(username)
+
+    def find_user_by_email(self, email):
+        # Tìm user theo email qua chỉ mục
+        self.refresh()
+        username = self.emails.get(email)
+        return self.users.get(username) if username else None
+
+    @timed('auth_authenticate_seconds')
+    def authenticate_user(self, username, password):
+        # Xác thực thông tin đăng nhập
+        user = self.find_user_by_username(username) or self.find_user_by_email(username)
+        if user and user.check_password(password):
+            return True, "Log in successfully!"
+        return False, "Invalid login information!"
+
+
+# Một đối tượng database duy nhất cho cả tiến trình
+user_db = UserDatabase()
+lifecycle.register('users', user_db.flush)
@@ -0,0 +1,89 @@
+from typing import Dict, Optional
+import hashlib
+import secrets
+import threading
+import time
+
+from auth.store import UserDatabase, user_db
+from config import config, settings
+
+RESET_TOKEN_TTL = config.auth.reset_token_ttl  # Mặc định link đặt lại mật khẩu có hiệu lực 30 phút
+SWEEP_SECONDS = 60
+
+
+def token_id(token: str) -> str:
+    # Chỉ lưu mã băm của token: nhật ký bị lộ cũng không dùng được để đổi mật khẩu
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+# Bảng token đặt lại mật khẩu: dùng một lần, có hạn, tra cứu O(1) theo mã băm
+class ResetTokens:
+    def __init__(self, store: UserDatabase, ttl=RESET_TOKEN_TTL):
+        self.store = store
+        self.ttl = ttl
+        self.tokens: Dict[str, Dict] = {}  # token_id -> {'username', 'expires'}
+        self.lock = threading.Lock()
+        self.swept_at = 0.0
+        # Token được lưu qua nhật ký của user store, nên tiến trình khác và lần khởi động sau đều thấy
+        store.on_journal('reset_token', self.replay)
+        store.on_compact(self.snapshot)
+
+    def replay(self, entry):
+        with self.lock:
+            if entry.get('used'):
+                self.tokens.pop(entry['id'], None)
+            elif entry['expires'] > time.time():
+                self.tokens[entry['id']] = {'username': entry['username'], 'expires': entry['expires']}
+
+    def snapshot(self):
+        # Khi gộp nhật ký chỉ giữ lại các token còn hạn
+        now = time.time()
+        with self.lock:
+            return [{'op': 'reset_token', 'id': key, **value}
+                    for key, value in self.tokens.items() if value['expires'] > now]
+
+    def sweep(self):
+        # Xóa token hết hạn, tối đa một lần mỗi SWEEP_SECONDS
+        now = time.time()
+        if now - self.swept_at < SWEEP_SECONDS:
+            return
+        self.swept_at = now
+        with self.lock:
+            for key in [key for key, value in self.tokens.items() if value['expires'] <= now]:
+                del self.tokens[key]
+
+    def issue(self, username: str) -> str:
+        self.sweep()
+        token = secrets.token_urlsafe(32)
+        entry = {'op': 'reset_token', 'id': token_id(token), 'username': username,
+                 'expires': time.time() + self.ttl}
+        # Vào bảng trước, để nếu việc ghi nhật ký kích hoạt gộp file thì token vẫn được giữ lại
+        self.replay(entry)
+        self.store.append_journal(entry)
+        return token
+
+    def peek(self, token: str) -> Optional[str]:
+        # Trả về username nếu token còn hiệu lực, không tiêu thụ token
+        self.store.refresh()
+        entry = self.tokens.get(token_id(token))
+        if entry is None or entry['expires'] <= time.time():
+            return None
+        return entry['username']
+
+    def consume(self, token: str) -> Optional[str]:
+        # Dùng token một lần: kiểm tra lại dưới khóa file để hai tiến trình không dùng cùng một token
+        key = token_id(token)
+        with self.store.file_lock():
+            self.store.refresh(force=True)
+            entry = self.tokens.get(key)
+            if entry is None or entry['expires'] <= time.time():
+                return None
+            self.store.append_journal({'op': 'reset_token', 'id': key, 'used': True})
+            with self.lock:
+                self.tokens.pop(key, None)
+        return entry['username']
+
+
+reset_tokens = ResetTokens(user_db)
+# Token đã cấp giữ hạn cũ, chỉ token mới dùng TTL mới
+settings.on_change('auth.reset_token_ttl', lambda ttl: setattr(reset_tokens, 'ttl', ttl))
@@ -0,0 +1,25 @@
+from nicegui import ui
+from datetime import datetime, timedelta
+
+from layout import use_shell_styles
+
+# Các hàm tiện ích dùng chung cho các trang xác thực
+
+def create_centered_container():
+    # Tạo container căn giữa màn hình
+    return ui.element('div').classes('mymy-centered')
+
+def redirect(url: str):
+    # Chuyển hướng trang
+    ui.run_javascript(f'window.location.href = "{url}"')
+
+def get_date_limits():
+    # Lấy giới hạn ngày cho input date
+    today = datetime.now()
+    max_date = today.strftime('%Y-%m-%d')  # Ngày hiện tại
+    min_date = (today - timedelta(days=365 * 100)).strftime('%Y-%m-%d')  # 100 năm trước
+    return min_date, max_date
+
+def plain_background():
+    # Nền mặc định của các trang xác thực, lấy từ stylesheet dùng chung (trình duyệt cache lại)
+    use_shell_styles()
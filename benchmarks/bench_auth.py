@@ -0,0 +1,52 @@
+# UserDatabase.add_user, load_users and authenticate_user at increasing user counts.
+import itertools
+import json
+
+from common import measure, result
+
+PASSWORD = 'benchmark-password'
+
+
+def write_users(path, count, password_hash):
+    # Every generated user shares one pre-computed hash: generating 100k scrypt hashes would take hours
+    users = {
+        f'user{i}': {'username': f'user{i}', 'fullname': f'User {i}', 'email': f'user{i}@school.test',
+                     'birthdate': '2005-01-01', 'password_hash': password_hash}
+        for i in range(count)
+    }
+    with open(path, 'w') as file:
+        json.dump(users, file)
+
+
+def run(sizes, repeat):
+    from werkzeug.security import generate_password_hash
+    from auth import User, UserDatabase
+
+    password_hash = generate_password_hash(PASSWORD)
+    results = [result('hash_password', {}, measure(lambda: generate_password_hash(PASSWORD), repeat=min(repeat, 10)))]
+
+    for size in sizes:
+        path = f'users_{size}.json'
+        write_users(path, size, password_hash)
+        runs = max(3, repeat * 1000 // size)
+        params = {'users': size}
+
+        results.append(result('load_users', params, measure(lambda: UserDatabase(path), repeat=runs)))
+
+        db = UserDatabase(path)
+        counter = itertools.count()
+
+        def add_user():
+            i = next(counter)
+            db.add_user(User(f'new{i}', f'New {i}', f'new{i}@school.test', '2005-01-01', password_hash=password_hash))
+
+        results.append(result('add_user', params, measure(add_user, repeat=runs)))
+
+        last = f'user{size - 1}'
+        results.append(result('authenticate_user', {**params, 'by': 'username'},
+                              measure(lambda: db.authenticate_user(last, PASSWORD), repeat=min(repeat, 10))))
+        results.append(result('authenticate_user', {**params, 'by': 'email'},
+                              measure(lambda: db.authenticate_user(f'{last}@school.test', PASSWORD), repeat=min(repeat, 10))))
+        results.append(result('authenticate_user', {**params, 'by': 'unknown'},
+                              measure(lambda: db.authenticate_user('nobody@school.test', PASSWORD), repeat=runs)))
+    return results
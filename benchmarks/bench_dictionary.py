@@ -0,0 +1,35 @@
+# Dictionary lookups against the local stub API, with the lookup cache cold and warm.
+import itertools
+import string
+
+from common import measure, result
+from stub_api import StubDictionaryServer
+
+
+def words(count):
+    # Alphabetic only, the stub answers "not found" for anything else
+    letters = string.ascii_lowercase
+    return [''.join(p) for p in itertools.islice(itertools.product(letters, repeat=4), count)]
+
+
+def run(repeat, latency=0.0):
+    import dictionary
+
+    results = []
+    with StubDictionaryServer(latency=latency) as stub:
+        params = {'upstream_latency_ms': latency * 1000}
+        pool = iter(words(100000))
+
+        def cold():
+            dictionary.lookup_cache.entries.clear()
+            dictionary.lookup_word(next(pool), stub.api_url)
+
+        results.append(result('get_word_info', {**params, 'cache': 'cold'}, measure(cold, repeat=repeat)))
+
+        dictionary.lookup_word('warm', stub.api_url)
+        results.append(result('get_word_info', {**params, 'cache': 'warm'},
+                              measure(lambda: dictionary.lookup_word('warm', stub.api_url), repeat=repeat * 10)))
+
+        results.append(result('get_word_info', {**params, 'cache': 'not_found'},
+                              measure(lambda: dictionary.fetch_word_info('no-such-word', stub.api_url), repeat=repeat)))
+    return results
@@ -0,0 +1,42 @@
+# Adding flashcards to albums that already hold many cards.
+import itertools
+from types import SimpleNamespace
+
+from common import measure, result
+from stub_api import fake_entry
+
+
+def run(sizes, repeat):
+    from nicegui import Client
+    from nicegui.page import page
+    from album_store import AlbumStore
+    from dictionary import DictionaryApp
+
+    results = []
+    for size in sizes:
+        store = AlbumStore()
+        store.create_album('big')
+        for i in range(size):
+            store.add_card('big', {'word': f'card{i}', 'definitions': [], 'phonetic': ''})
+
+        counter = itertools.count()
+        # add_to_flashcard only needs the album store and the selected album from the page
+        fake_app = SimpleNamespace(albums=store, album_select=SimpleNamespace(value='big'))
+        client = Client(page('/bench'))
+
+        def add():
+            with client:
+                DictionaryApp.add_to_flashcard(fake_app, fake_entry(f'extra{next(counter)}')[0])
+
+        results.append(result('add_to_flashcard', {'album_cards': size}, measure(add, repeat=repeat)))
+        duplicate = fake_entry(f'card{size // 2}')[0]
+
+        def add_duplicate():
+            with client:
+                DictionaryApp.add_to_flashcard(fake_app, duplicate)
+
+        results.append(result('add_to_flashcard', {'album_cards': size, 'duplicate': True},
+                              measure(add_duplicate, repeat=repeat)))
+        client.remove_all_elements()
+        Client.instances.pop(client.id, None)
+    return results
@@ -0,0 +1,18 @@
+# NiceGUI page build time and element count for the auth pages and the dashboard routes.
+from common import build_in_client, load_dashboard, result
+
+
+def run(repeat):
+    from auth import register_pages
+
+    auth_pages = register_pages()
+    pages = {'/login': auth_pages['/'], '/register': auth_pages['/register']}
+    dashboard = load_dashboard()
+    for url, builder in dashboard.page_builders.items():
+        pages[f'dashboard{url}'] = builder
+
+    results = []
+    for name, builder in pages.items():
+        stats, elements = build_in_client(builder, repeat)
+        results.append(result('page_build', {'page': name}, stats, elements=elements))
+    return results
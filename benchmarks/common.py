@@ -0,0 +1,97 @@
+# Shared helpers for the benchmark suite: timing, stats, page builds and the JSON result format.
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def prepare_environment():
+    # Run from a scratch directory so users.json, caches and logs of the real tree are never touched
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    workdir = tempfile.mkdtemp(prefix='mymy-bench-')
+    os.chdir(workdir)
+    return workdir
+
+
+def measure(func, repeat=20, warmup=1):
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+def load_dashboard():
+    # webgui-1.py is not a valid module name, so load it from its path
+    spec = importlib.util.spec_from_file_location('webgui', os.path.join(ROOT, 'webgui-1.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.app
+
+
+def build_in_client(build, rounds):
+    # Build inside a throwaway client, the same way a page request does, without a browser
+    from nicegui import Client
+    from nicegui.page import page
+
+    samples, elements = [], 0
+    for _ in range(rounds):
+        client = Client(page('/bench'))
+        started = time.perf_counter()
+        with client:
+            build()
+        samples.append(time.perf_counter() - started)
+        elements = len(client.elements)
+        client.remove_all_elements()
+        Client.instances.pop(client.id, None)
+    return summarize(samples), elements
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        'runs': len(ordered),
+        'min_ms': round(ordered[0] * 1000, 4),
+        'median_ms': round(statistics.median(ordered) * 1000, 4),
+        'p95_ms': round(ordered[min(int(0.95 * len(ordered)), len(ordered) - 1)] * 1000, 4),
+        'mean_ms': round(statistics.fmean(ordered) * 1000, 4),
+    }
+
+
+def result(name, params, stats, **extra):
+    return {'name': name, 'params': params, 'stats': stats, **extra}
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', '-C', ROOT, 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True, check=False).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def write_json(data, path=None):
+    output = json.dumps(data, indent=2)
+    if path:
+        with open(path, 'w') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
@@ -0,0 +1,218 @@
+# Load generator: many simulated students go through register -> login -> dictionary search -> add to flashcard
+# against the running app of loadtest_app.py (auth pages + dictionary page, with its startup hooks), on ONE
+# asyncio event loop. Every student is a NiceGUI test User: pages are fetched over ASGI and built by the real
+# page functions, inputs are typed and buttons clicked, so validate_and_register, handle_login, search_word
+# and add_to_flashcard run through NiceGUI's event dispatch exactly as for a browser. Blocking work inside
+# those handlers (scrypt, the dictionary HTTP call, saving users) stalls every other student and shows up
+# as event-loop lag. Dictionary lookups go to the local stub API.
+#
+#   python benchmarks/loadtest.py --ramp 1,2,4,8,16,32 --duration 10 --output load.json
+import argparse
+import asyncio
+import itertools
+import os
+import runpy
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+from nicegui import background_tasks, core, ui
+from nicegui.testing import User
+
+from common import environment, prepare_environment, summarize, write_json
+from stub_api import StubDictionaryServer
+
+APP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'loadtest_app.py')
+STEPS = ['register', 'login', 'search', 'add_flashcard']
+PASSWORD = 'load-test-password'
+LAG_INTERVAL = 0.01
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = {step: [] for step in STEPS + ['page', 'flow']}
+        self.errors = {}
+        self.lag = []
+
+    def add(self, step, seconds):
+        self.samples[step].append(seconds)
+
+    def error(self, step, exc):
+        name = f'{step}:{type(exc).__name__}'
+        self.errors[name] = self.errors.get(name, 0) + 1
+
+
+async def lag_ticker(recorder, stop):
+    # Sleeps a fixed interval and records how late it wakes up; any blocking call on the loop adds to it
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(LAG_INTERVAL)
+        recorder.lag.append(max(time.perf_counter() - started - LAG_INTERVAL, 0.0))
+
+
+class Student:
+    # One simulated browser tab, moving from page to page
+    def __init__(self, name, ctx):
+        self.name = name
+        self.ctx = ctx
+        self.user = User(ctx['http'])
+        self.album = f'deck_{name}'
+        self.step = ''
+
+    def record(self, started):
+        self.ctx['recorder'].add(self.step, time.perf_counter() - started)
+
+    async def open(self, path):
+        # Leaving a page disconnects its client like a browser navigation, so the server can reap it
+        if self.user.client is not None:
+            for socket_id in list(self.user.client._socket_to_document_id):
+                self.user.client.handle_disconnect(socket_id)
+        self.step = 'page'
+        started = time.perf_counter()
+        await self.user.open(path)
+        self.record(started)
+
+    def fill(self, values):
+        for label, value in values.items():
+            self.user.find(kind=ui.input, content=label).type(value)
+
+    async def click(self, step, label):
+        self.step = step
+        started = time.perf_counter()
+        before = set(background_tasks.running_tasks)
+        self.user.find(kind=ui.button, content=label).click()
+        # Async handlers run as background tasks: wait for exactly the ones this click started
+        await asyncio.gather(*(task for task in background_tasks.running_tasks if task not in before))
+        self.record(started)
+
+    async def flow(self, round_number):
+        username = f'student{self.name}_{round_number}'
+        started = time.perf_counter()
+        try:
+            await self.open('/register')
+            self.fill({'Login name*': username, 'User name*': username.title(), 'Email*': f'{username}@school.test',
+                       'Date of birth*': '2005-01-01', 'Password*': PASSWORD, 'Confirm password*': PASSWORD})
+            await self.click('register', 'SIGN UP')
+            self.user.find('Back to log in')  # only shown after a successful sign up
+
+            await self.open('/')
+            self.fill({'Your email...': username, 'Enter password...': PASSWORD})
+            await self.click('login', 'LOG IN')
+
+            await self.open('/dictionary')
+            word = next(self.ctx['words'])
+            self.fill({'Search word': word})
+            await self.click('search', 'Search')
+            self.user.find(kind=ui.select).click()
+            self.user.find(self.album).click()
+            await self.click('add_flashcard', 'Add to Flashcard Album')
+            if self.ctx['albums'].get_card(self.album, word) is None:
+                raise RuntimeError(f'{word} was not added')
+        except Exception as exc:
+            self.ctx['recorder'].error(self.step, exc)
+            return
+        self.ctx['recorder'].add('flow', time.perf_counter() - started)
+
+    async def run(self, deadline):
+        self.ctx['albums'].create_album(self.album)
+        for round_number in itertools.count():
+            if time.perf_counter() >= deadline:
+                return
+            await self.flow(round_number)
+            # Think time: yield so the other students interleave like separate browsers
+            await asyncio.sleep(0)
+
+
+async def run_level(concurrency, duration, ctx):
+    recorder = Recorder()
+    ctx['recorder'] = recorder
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(lag_ticker(recorder, stop))
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(Student(f'{concurrency}_{i}', ctx).run(deadline) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+
+    flows = len(recorder.samples['flow'])
+    cores = os.cpu_count() or 1
+    return {
+        'concurrency': concurrency,
+        'seconds': round(elapsed, 3),
+        'flows': flows,
+        'flows_per_second': round(flows / elapsed, 2),
+        'flows_per_second_per_core': round(flows / elapsed / cores, 2),
+        'latency': {step: summarize(samples) for step, samples in recorder.samples.items() if samples},
+        'loop_lag': summarize(recorder.lag) if recorder.lag else {},
+        'errors': recorder.errors,
+    }
+
+
+def word_stream():
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    for length in itertools.count(3):
+        for combo in itertools.product(letters, repeat=length):
+            yield ''.join(combo)
+
+
+async def main_async(args):
+    levels = [int(level) for level in args.ramp.split(',')]
+    results = []
+    with StubDictionaryServer(latency=args.latency) as stub:
+        # Same setup as NiceGUI's user_simulation, minus its global reset which only works under pytest:
+        # ui.run() in the app file registers everything but does not start a server
+        os.environ['MYMY_DICTIONARY_API_URL'] = stub.api_url
+        os.environ['NICEGUI_USER_SIMULATION'] = 'true'
+        runpy.run_path(APP_FILE, run_name='__main__')
+        from album_store import album_store
+
+        handler_errors = []
+        core.app.on_exception(handler_errors.append)  # exceptions inside handlers never reach the student
+        async with core.app.router.lifespan_context(core.app):
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(core.app), base_url='http://test') as http:
+                ctx = {'http': http, 'albums': album_store, 'words': word_stream()}
+                for concurrency in levels:
+                    handler_errors.clear()
+                    level = await run_level(concurrency, args.duration, ctx)
+                    for exc in handler_errors:
+                        ctx['recorder'].error('handler', exc)
+                    level['errors'] = ctx['recorder'].errors
+                    results.append(level)
+                    print(f"{concurrency:>4} students: {level['flows_per_second']:>8} flows/s  "
+                          f"p95 flow {level['latency'].get('flow', {}).get('p95_ms', 0):>9} ms  "
+                          f"p95 lag {level['loop_lag'].get('p95_ms', 0):>9} ms", file=sys.stderr)
+    return results
+
+
+def saturation(levels):
+    # First level after which adding students no longer buys at least 10% more throughput
+    for previous, current in zip(levels, levels[1:]):
+        if current['flows_per_second'] < previous['flows_per_second'] * 1.10:
+            return previous['concurrency']
+    return levels[-1]['concurrency'] if levels else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent student load test')
+    parser.add_argument('--ramp', default='1,2,4,8,16', help='comma separated concurrency levels')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per level')
+    parser.add_argument('--latency', type=float, default=0.05, help='stub dictionary API latency in seconds')
+    parser.add_argument('--output', help='write JSON here instead of stdout')
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output) if args.output else None
+    prepare_environment()
+    levels = asyncio.run(main_async(args))
+    write_json({
+        'environment': environment(),
+        'config': {'ramp': args.ramp, 'duration': args.duration, 'latency': args.latency},
+        'levels': levels,
+        'saturation_concurrency': saturation(levels),
+    }, output)
+
+
+if __name__ == '__main__':
+    main()
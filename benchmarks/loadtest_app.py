@@ -0,0 +1,41 @@
+# The app driven by loadtest.py: the auth pages of login.py plus the dictionary page, one DictionaryApp
+# per client, all in one process like production. loadtest.py runs this file through NiceGUI's user
+# simulation; it can also be started on its own to poke at the same pages in a browser.
+#
+#   python benchmarks/loadtest_app.py
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from nicegui import ui
+
+from auth import auth_audit, register_pages
+from config import config, settings
+from dictionary import DictionaryApp
+from layout import static_assets
+from lifecycle import lifecycle
+from loop_watchdog import watchdog
+from metrics import registry as metrics
+from sessions import session_manager
+
+pages = register_pages()
+
+
+@ui.page('/dictionary')
+def dictionary_page():
+    DictionaryApp()
+
+
+if __name__ in {"__main__", "__mp_main__"}:
+    lifecycle.install()
+    session_manager.install()
+    auth_audit.install()
+    settings.install()
+    static_assets.install()
+    watchdog.install()
+    metrics.install()
+    ui.run(port=config.server.auth_port, title='MYMY load test', reload=False, show=False,
+           timeout_graceful_shutdown=config.server.drain_seconds)
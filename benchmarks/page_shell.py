@@ -0,0 +1,88 @@
+# Elements created and time spent building the dashboard shell (sidebar + header) per page load,
+# comparing the old inline-styled builders with the cached shell from layout.py.
+#
+#   python benchmarks/page_shell.py --rounds 200 --output shell.json
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from nicegui import ui
+
+from common import build_in_client, load_dashboard, prepare_environment, write_json
+
+
+def legacy_sidebar(menu_items):
+    sidebar_style = '''
+        background: linear-gradient(180deg,
+            rgba(255,255,255,0.9) 0%,
+            rgba(249,250,251,0.9) 100%);
+        backdrop-filter: blur(20px);
+        -webkit-backdrop-filter: blur(20px);
+        border-right: 1px solid rgba(0,0,0,0.1);
+    '''
+    with ui.column().classes('w-64 h-screen').style(sidebar_style):
+        with ui.row().classes('p-6 items-center justify-between w-full'):
+            with ui.row().classes('items-center gap-2'):
+                ui.icon('auto_stories').classes('text-3xl text-indigo-600')
+                ui.label('MYMY').classes('text-2xl font-bold text-indigo-600')
+        ui.separator().classes('mb-4')
+        for item in menu_items:
+            with ui.row().classes('mx-4 p-3 rounded-xl transition-all duration-200 cursor-pointer hover:bg-indigo-50'):
+                ui.icon(item['icon']).classes('text-xl text-indigo-600')
+                with ui.column().classes('ml-3 flex-1'):
+                    ui.label(item['name']).classes('font-semibold text-gray-700')
+                    ui.label(item['description']).classes('text-xs text-gray-500')
+        with ui.row().classes('mt-auto p-4 w-full items-center justify-between'):
+            ui.button(icon='settings', color='indigo').props('flat')
+
+
+def legacy_header(nav_items):
+    header_style = '''
+        background: rgba(255,255,255,0.8);
+        backdrop-filter: blur(20px);
+        -webkit-backdrop-filter: blur(20px);
+    '''
+    with ui.row().style('width: 144%; height: 80px; padding: 20px;').classes('items-center justify-between').style(header_style):
+        with ui.row().classes('space-x-6'):
+            for item in nav_items:
+                with ui.row().classes('items-center gap-2'):
+                    ui.icon(item['icon']).classes('text-indigo-600')
+                    ui.link(item['name'], item['url']).classes(
+                        'text-gray-700 hover:text-indigo-600 transition-colors duration-200')
+        with ui.row().classes('items-center gap-4'):
+            with ui.row().classes('relative'):
+                ui.input(placeholder='Search...').props('rounded outlined dense').classes(
+                    'w-64 bg-gray-100 border-none').style('border-radius: 20px;')
+                ui.icon('search').classes('absolute right-3 top-1/2 transform -translate-y-1/2 text-gray-400')
+            ui.button(icon='notifications', color='indigo').props('flat round')
+            ui.avatar('User').style('background: linear-gradient(135deg, #6366f1, #a855f7);')
+
+
+def measure(build, rounds):
+    stats, elements = build_in_client(build, rounds)
+    return {'elements': elements, 'ms_per_page': stats['mean_ms']}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the dashboard page shell')
+    parser.add_argument('--rounds', type=int, default=100)
+    parser.add_argument('--output', help='write the JSON result to this file instead of stdout')
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output) if args.output else None
+    prepare_environment()
+    dashboard = load_dashboard()
+    results = {
+        'benchmark': 'page_shell',
+        'rounds': args.rounds,
+        'before': measure(lambda: (legacy_sidebar(dashboard.menu_items), legacy_header(dashboard.nav_items)),
+                          args.rounds),
+        'after': measure(lambda: (dashboard.create_sidebar(), dashboard.create_header()), args.rounds),
+    }
+    write_json(results, output)
+
+
+if __name__ == '__main__':
+    main()
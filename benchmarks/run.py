@@ -0,0 +1,77 @@
+# Runs the offline benchmark suite and writes machine-readable JSON.
+#
+#   python benchmarks/run.py --output bench.json
+#   python benchmarks/run.py --output new.json --compare bench.json
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import environment, prepare_environment, write_json
+
+SUITES = ['auth', 'dictionary', 'flashcards', 'pages']
+
+
+def key(entry):
+    return entry['name'] + json.dumps(entry['params'], sort_keys=True)
+
+
+def compare(current, baseline_path, threshold):
+    # Median-based comparison; returns the number of regressions above the threshold
+    with open(baseline_path) as file:
+        baseline = {key(entry): entry for entry in json.load(file)['results']}
+    regressions = 0
+    for entry in current['results']:
+        old = baseline.get(key(entry))
+        if not old or not old['stats']['median_ms']:
+            continue
+        ratio = entry['stats']['median_ms'] / old['stats']['median_ms']
+        flag = 'REGRESSION' if ratio > 1 + threshold else ''
+        regressions += bool(flag)
+        print(f"{entry['name']:<20} {json.dumps(entry['params']):<50} "
+              f"{old['stats']['median_ms']:>10.3f} -> {entry['stats']['median_ms']:>10.3f} ms  x{ratio:.2f} {flag}",
+              file=sys.stderr)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline benchmark suite')
+    parser.add_argument('--only', default=','.join(SUITES), help='comma separated: ' + ', '.join(SUITES))
+    parser.add_argument('--sizes', default='1000,10000,100000', help='user counts for the auth benchmarks')
+    parser.add_argument('--album-sizes', default='1000,10000,50000')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.0, help='stub API latency in seconds')
+    parser.add_argument('--output', help='write JSON here instead of stdout')
+    parser.add_argument('--compare', help='baseline JSON from an earlier run')
+    parser.add_argument('--threshold', type=float, default=0.10, help='allowed slowdown before flagging')
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output) if args.output else None
+    baseline = os.path.abspath(args.compare) if args.compare else None
+    prepare_environment()
+
+    suites = args.only.split(',')
+    results = []
+    if 'auth' in suites:
+        import bench_auth
+        results += bench_auth.run([int(s) for s in args.sizes.split(',')], args.repeat)
+    if 'dictionary' in suites:
+        import bench_dictionary
+        results += bench_dictionary.run(args.repeat, args.latency)
+    if 'flashcards' in suites:
+        import bench_flashcards
+        results += bench_flashcards.run([int(s) for s in args.album_sizes.split(',')], args.repeat)
+    if 'pages' in suites:
+        import bench_pages
+        results += bench_pages.run(args.repeat)
+
+    data = {'environment': environment(), 'results': results}
+    write_json(data, output)
+    if baseline and compare(data, baseline, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+# Local stand-in for api.dictionaryapi.dev, so dictionary benchmarks and load tests run offline.
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+import json
+import threading
+import time
+
+NOT_FOUND = {'title': 'No Definitions Found', 'message': 'Sorry pal, we couldn\'t find definitions for the word you were looking for.'}
+
+
+def fake_entry(word):
+    return [{
+        'word': word,
+        'phonetic': f'/{word}/',
+        'phonetics': [{'text': f'/{word}/', 'audio': ''}],
+        'meanings': [
+            {'partOfSpeech': 'noun', 'definitions': [
+                {'definition': f'A made-up meaning of {word} number {i}.', 'example': f'This is {word}.'}
+                for i in range(4)]},
+            {'partOfSpeech': 'verb', 'definitions': [
+                {'definition': f'To do {word} for the benchmark.'}]},
+        ],
+    }]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        word = unquote(self.path.rstrip('/').rsplit('/', 1)[-1])
+        found = word.isalpha()
+        body = json.dumps(fake_entry(word) if found else NOT_FOUND).encode()
+        self.send_response(200 if found else 404)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubDictionaryServer:
+    def __init__(self, latency=0.0, port=0):
+        handler = type('Handler', (StubHandler,), {'latency': latency})
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def api_url(self):
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}/api/v2/entries/en/{{word}}'
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
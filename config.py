@@ -0,0 +1,270 @@
+from nicegui import app
+from dataclasses import dataclass, field, fields
+from typing import Callable, Dict, List
+import json
+import logging
+import os
+import threading
+import time
+
+CONFIG_PATH = os.environ.get('MYMY_CONFIG', 'mymy_config.json')
+ENV_PREFIX = 'MYMY_'
+POLL_SECONDS = 2.0
+
+logger = logging.getLogger('mymy.config')
+
+
+class ConfigError(ValueError):
+    pass
+
+
+def tunable(default, **limits):
+    # Fields marked hot are re-read from the file while the server runs; everything else needs a restart
+    return field(default=default, metadata={'hot': True, **limits})
+
+
+def setting(default, **limits):
+    return field(default=default, metadata=limits)
+
+
+@dataclass
+class ServerConfig:
+    dashboard_port: int = setting(808, min=1, max=65535)
+    auth_port: int = setting(8080, min=1, max=65535)
+    dictionary_port: int = setting(8080, min=1, max=65535)
+    intro_port: int = setting(8080, min=1, max=65535)
+    title: str = 'MYMY Learning Platform'
+    auth_url: str = ''  # base URL of the auth app for links from other apps; empty: localhost on auth_port
+    dashboard_url: str = ''  # base URL of the dashboard app, same idea; empty: localhost on dashboard_port
+    drain_seconds: float = setting(10.0, min=0, max=300)  # uvicorn waits this long for open requests at shutdown
+
+
+@dataclass
+class PathsConfig:
+    users: str = 'users.json'
+    user_settings: str = 'user_settings.json'
+    activity: str = 'activity.jsonl'
+    auth_audit: str = 'auth_events.jsonl'
+    albums: str = 'albums.json'
+    lookup_cache: str = 'lookup_cache.jsonl.gz'
+
+
+@dataclass
+class DictionaryConfig:
+    api_url: str = 'https://api.dictionaryapi.dev/api/v2/entries/en/{word}'
+    timeout: float = tunable(10.0, min=0.5, max=120)
+    cache_size: int = tunable(5000, min=100, max=1000000)
+
+
+@dataclass
+class AuthConfig:
+    hash_method: str = 'scrypt'  # werkzeug method string, e.g. "scrypt" or "pbkdf2:sha256:600000"
+    salt_length: int = setting(16, min=8, max=64)
+    reset_token_ttl: int = tunable(30 * 60, min=60, max=24 * 3600)
+    journal_limit: int = tunable(1000, min=10, max=1000000)
+
+
+@dataclass
+class PrefetchConfig:
+    frequent_words: int = setting(1000, min=0)
+    popular_queries: int = setting(300, min=0)
+    concurrency: int = tunable(4, min=1, max=64)
+    reading_concurrency: int = tunable(2, min=1, max=16)  # workers warming the pages being read
+    rate_per_second: float = tunable(5.0, min=0.1, max=100)
+    burst: int = tunable(5, min=1, max=100)
+
+
+@dataclass
+class SessionsConfig:
+    idle_downgrade_seconds: int = tunable(15 * 60, min=30)
+    idle_reap_seconds: int = tunable(60 * 60, min=60)
+
+
+@dataclass
+class MenusConfig:
+    nav: List[Dict] = field(default_factory=lambda: [
+        {"name": "Home", "url": "/", "icon": "home"},
+        {"name": "Explore", "url": "/explore", "icon": "explore"},
+        {"name": "Help", "url": "/help", "icon": "help"},
+    ])
+    dashboard: List[Dict] = field(default_factory=lambda: [
+        {"name": "Dictionary", "icon": "school", "url": "/dictionary", "description": "Look up words and definitions"},
+        {"name": "Flashcard", "icon": "style", "url": "/flashcard", "description": "Practice with flashcards"},
+        {"name": "Reading", "icon": "menu_book", "url": "/reading", "description": "Read and comprehend texts"},
+        {"name": "Dictation", "icon": "record_voice_over", "url": "/dictation", "description": "Practice listening and writing"},
+        {"name": "Process", "icon": "insights", "url": "/process", "description": "Track your learning progress"},
+    ])
+
+
+@dataclass
+class Config:
+    server: ServerConfig = field(default_factory=ServerConfig)
+    paths: PathsConfig = field(default_factory=PathsConfig)
+    dictionary: DictionaryConfig = field(default_factory=DictionaryConfig)
+    auth: AuthConfig = field(default_factory=AuthConfig)
+    prefetch: PrefetchConfig = field(default_factory=PrefetchConfig)
+    sessions: SessionsConfig = field(default_factory=SessionsConfig)
+    menus: MenusConfig = field(default_factory=MenusConfig)
+
+
+def coerce(value, kind, name: str):
+    # Values from the environment are strings; values from the file must already have the right type
+    if kind is bool:
+        if isinstance(value, str):
+            if value.lower() in {'1', 'true', 'yes', 'on'}:
+                return True
+            if value.lower() in {'0', 'false', 'no', 'off'}:
+                return False
+        elif isinstance(value, bool):
+            return value
+    elif kind in (int, float):
+        if isinstance(value, str):
+            try:
+                return kind(value)
+            except ValueError:
+                pass
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) and (kind is float or value == int(value)):
+            return kind(value)
+    elif kind is str:
+        if isinstance(value, str):
+            return value
+    elif isinstance(value, list) and all(isinstance(item, dict) for item in value):
+        return value
+    raise ConfigError(f'{name}: expected {getattr(kind, "__name__", kind)}, got {value!r}')
+
+
+def build(data: Dict, environ: Dict[str, str]) -> Config:
+    # File values over the defaults, MYMY_<SECTION>_<FIELD> environment variables over both
+    config, errors = Config(), []
+    unknown = set(data) - {section.name for section in fields(Config)}
+    errors.extend(f'unknown section "{name}"' for name in sorted(unknown))
+    for section_field in fields(Config):
+        section = getattr(config, section_field.name)
+        values = data.get(section_field.name, {})
+        if not isinstance(values, dict):
+            errors.append(f'{section_field.name}: expected an object')
+            continue
+        names = {item.name for item in fields(section)}
+        errors.extend(f'unknown setting "{section_field.name}.{name}"' for name in sorted(set(values) - names))
+        for item in fields(section):
+            name = f'{section_field.name}.{item.name}'
+            env_name = f'{ENV_PREFIX}{section_field.name}_{item.name}'.upper()
+            try:
+                if env_name in environ:
+                    setattr(section, item.name, coerce(environ[env_name], item.type, env_name))
+                elif item.name in values:
+                    setattr(section, item.name, coerce(values[item.name], item.type, name))
+            except ConfigError as exc:
+                errors.append(str(exc))
+                continue
+            value = getattr(section, item.name)
+            if 'min' in item.metadata and value < item.metadata['min']:
+                errors.append(f'{name}: {value} is below {item.metadata["min"]}')
+            if 'max' in item.metadata and value > item.metadata['max']:
+                errors.append(f'{name}: {value} is above {item.metadata["max"]}')
+    if config.sessions.idle_reap_seconds <= config.sessions.idle_downgrade_seconds:
+        errors.append('sessions.idle_reap_seconds must be longer than sessions.idle_downgrade_seconds')
+    for menu in ('nav', 'dashboard'):
+        for position, item in enumerate(getattr(config.menus, menu)):
+            missing = [key for key in ('name', 'url', 'icon') if not isinstance(item.get(key), str)]
+            if missing:
+                errors.append(f'menus.{menu}[{position}]: missing {", ".join(missing)}')
+    if '{word}' not in config.dictionary.api_url:
+        errors.append('dictionary.api_url must contain "{word}"')
+    if errors:
+        raise ConfigError('Invalid configuration:\n  ' + '\n  '.join(errors))
+    return config
+
+
+def read_file(path: str) -> Dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+    except FileNotFoundError:
+        return {}
+    except json.JSONDecodeError as exc:
+        raise ConfigError(f'{path}: {exc}')
+    if not isinstance(data, dict):
+        raise ConfigError(f'{path}: expected an object at the top level')
+    return data
+
+
+class ConfigManager:
+    # One validated Config for the process. The section objects are updated in place on reload,
+    # so modules may keep references to config.dictionary etc.
+    def __init__(self, path: str = CONFIG_PATH, poll=POLL_SECONDS):
+        self.path = path
+        self.poll = poll
+        self.current = build(read_file(path), dict(os.environ))
+        self.mtime = self.file_mtime()
+        self.subscribers: Dict[str, List[Callable]] = {}
+        self.lock = threading.Lock()
+        self.thread = None
+        self.installed = False
+
+    def install(self):
+        # Called once by each entry point before ui.run()
+        if self.installed:
+            return
+        self.installed = True
+        app.on_startup(self.start)
+
+    def on_change(self, name: str, callback: Callable):
+        # callback(new_value) for a hot setting such as 'dictionary.cache_size'
+        section, item = name.split('.')
+        if not next(f for f in fields(getattr(self.current, section)) if f.name == item).metadata.get('hot'):
+            raise ConfigError(f'{name} is not hot-reloadable')
+        self.subscribers.setdefault(name, []).append(callback)
+
+    def file_mtime(self) -> float:
+        try:
+            return os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            return 0.0
+
+    def start(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self.run, name='config-reload', daemon=True)
+            self.thread.start()
+
+    def run(self):
+        while True:
+            time.sleep(self.poll)
+            mtime = self.file_mtime()
+            if mtime != self.mtime:
+                self.mtime = mtime
+                self.reload()
+
+    def reload(self) -> Dict:
+        # Invalid edits are logged and ignored, the running values stay as they were
+        try:
+            fresh = build(read_file(self.path), dict(os.environ))
+        except ConfigError as exc:
+            logger.error('Config reload rejected: %s', exc)
+            return {}
+        changed, callbacks = {}, []
+        with self.lock:
+            for section_field in fields(Config):
+                live, new = getattr(self.current, section_field.name), getattr(fresh, section_field.name)
+                for item in fields(live):
+                    value, name = getattr(new, item.name), f'{section_field.name}.{item.name}'
+                    if value == getattr(live, item.name):
+                        continue
+                    if not item.metadata.get('hot'):
+                        logger.warning('Config %s changed, restart to apply', name)
+                        continue
+                    setattr(live, item.name, value)
+                    changed[name] = value
+                    callbacks.extend((callback, value) for callback in self.subscribers.get(name, ()))
+        for callback, value in callbacks:
+            try:
+                callback(value)
+            except Exception:
+                logger.exception('Config subscriber failed')
+        if changed:
+            logger.info('Config reloaded: %s', changed)
+        return changed
+
+
+settings = ConfigManager()
+config = settings.current
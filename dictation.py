@@ -0,0 +1,301 @@
+from nicegui import app, ui
+from fastapi import Request
+from fastapi.responses import Response
+from typing import Dict, List, Optional
+from datetime import datetime
+import json
+import os
+import queue
+import re
+import shutil
+import threading
+import uuid
+
+from activity import DEFAULT_USER, activity_log
+from audio_cache import audio_cache, audio_url_for, stream_file
+from dictionary import lookup_word
+
+TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+
+def tokenize_answer(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+def align_words(expected: List[str], answer: List[str]) -> List[Dict]:
+    # Word-level Levenshtein alignment; returns one operation per aligned position
+    rows, cols = len(expected) + 1, len(answer) + 1
+    dist = [[0] * cols for _ in range(rows)]
+    for i in range(rows):
+        dist[i][0] = i
+    for j in range(cols):
+        dist[0][j] = j
+    for i in range(1, rows):
+        for j in range(1, cols):
+            cost = 0 if expected[i - 1] == answer[j - 1] else 1
+            dist[i][j] = min(dist[i - 1][j] + 1, dist[i][j - 1] + 1, dist[i - 1][j - 1] + cost)
+
+    ops = []
+    i, j = len(expected), len(answer)
+    while i > 0 or j > 0:
+        # Prefer matches, then gaps, then substitutions so the diff reads naturally
+        if i > 0 and j > 0 and expected[i - 1] == answer[j - 1] and dist[i][j] == dist[i - 1][j - 1]:
+            ops.append({'op': 'equal', 'expected': expected[i - 1], 'answer': answer[j - 1]})
+            i, j = i - 1, j - 1
+        elif i > 0 and dist[i][j] == dist[i - 1][j] + 1:
+            ops.append({'op': 'missing', 'expected': expected[i - 1], 'answer': ''})
+            i -= 1
+        elif j > 0 and dist[i][j] == dist[i][j - 1] + 1:
+            ops.append({'op': 'extra', 'expected': '', 'answer': answer[j - 1]})
+            j -= 1
+        else:
+            ops.append({'op': 'replace', 'expected': expected[i - 1], 'answer': answer[j - 1]})
+            i, j = i - 1, j - 1
+    ops.reverse()
+    return ops
+
+
+def grade_answer(transcript: str, answer: str) -> Dict:
+    expected = tokenize_answer(transcript)
+    ops = align_words(expected, tokenize_answer(answer))
+    correct = sum(1 for op in ops if op['op'] == 'equal')
+    errors = len(ops) - correct
+    score = correct / len(expected) if expected else 1.0
+    return {'ops': ops, 'correct': correct, 'errors': errors, 'score': round(score, 3)}
+
+
+class DictationLibrary:
+    def __init__(self, base_dir='dictation'):
+        self.base_dir = base_dir
+        os.makedirs(base_dir, exist_ok=True)
+        self.exercises: Dict[str, Dict] = self.load_exercises()
+        self.lock = threading.Lock()
+        self.jobs = queue.Queue()
+        self.worker = threading.Thread(target=self.run_jobs, name='dictation-prepare', daemon=True)
+        self.worker.start()
+
+    def manifest_path(self, exercise_id: str) -> str:
+        return os.path.join(self.base_dir, exercise_id, 'transcript.json')
+
+    def load_exercises(self) -> Dict[str, Dict]:
+        exercises = {}
+        for exercise_id in os.listdir(self.base_dir):
+            try:
+                with open(self.manifest_path(exercise_id), 'r') as file:
+                    exercises[exercise_id] = json.load(file)
+            except (FileNotFoundError, NotADirectoryError, json.JSONDecodeError):
+                continue
+        return exercises
+
+    def save_manifest(self, exercise: Dict):
+        path = self.manifest_path(exercise['id'])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as file:
+            json.dump(exercise, file)
+        os.replace(tmp_path, path)
+
+    def ready_exercises(self) -> List[Dict]:
+        return [e for e in self.exercises.values() if e['status'] == 'ready']
+
+    def get(self, exercise_id: str) -> Optional[Dict]:
+        return self.exercises.get(exercise_id)
+
+    def segment_path(self, exercise_id: str, index: int) -> Optional[str]:
+        exercise = self.exercises.get(exercise_id)
+        if not exercise or exercise['status'] != 'ready' or not 0 <= index < len(exercise['segments']):
+            return None
+        return os.path.join(self.base_dir, exercise_id, exercise['segments'][index]['file'])
+
+    def submit(self, title: str, segments: List[Dict]) -> str:
+        # segments: [{'text': ..., 'audio': URL or local file}] or [{'word': ...}]
+        exercise = {
+            'id': uuid.uuid4().hex[:12],
+            'title': title,
+            'status': 'queued',
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'segments': [],
+        }
+        with self.lock:
+            self.exercises[exercise['id']] = exercise
+        self.save_manifest(exercise)
+        self.jobs.put((exercise['id'], segments))
+        return exercise['id']
+
+    def submit_words(self, title: str, words: List[str]) -> str:
+        return self.submit(title, [{'word': w} for w in words if w.strip()])
+
+    def run_jobs(self):
+        # Single background worker: exercises are prepared in batch, never while a student waits
+        while True:
+            exercise_id, segments = self.jobs.get()
+            try:
+                self.prepare(exercise_id, segments)
+            except Exception as e:
+                exercise = self.exercises[exercise_id]
+                exercise['status'] = 'failed'
+                exercise['error'] = str(e)
+                self.save_manifest(exercise)
+            finally:
+                self.jobs.task_done()
+
+    def resolve_audio(self, segment: Dict):
+        # Returns (transcript text, local source file) for one segment
+        if 'word' in segment:
+            data = lookup_word(segment['word'].strip())
+            if not isinstance(data, list) or not data:
+                return None, None
+            local_url = audio_url_for(data[0])
+            if not local_url:
+                return None, None
+            return data[0]['word'], audio_cache.fetch(local_url.rsplit('/', 1)[1])
+        audio = segment['audio']
+        if os.path.exists(audio):
+            return segment['text'], audio
+        local_url = audio_cache.register(audio)
+        if not local_url:
+            return None, None
+        return segment['text'], audio_cache.fetch(local_url.rsplit('/', 1)[1])
+
+    def prepare(self, exercise_id: str, segments: List[Dict]):
+        exercise = self.exercises[exercise_id]
+        exercise['status'] = 'preparing'
+        self.save_manifest(exercise)
+        exercise_dir = os.path.join(self.base_dir, exercise_id)
+
+        prepared = []
+        for segment in segments:
+            text, source = self.resolve_audio(segment)
+            if not source:
+                continue
+            ext = os.path.splitext(source)[1] or '.mp3'
+            file_name = f'seg_{len(prepared):03d}{ext}'
+            shutil.copyfile(source, os.path.join(exercise_dir, file_name))
+            prepared.append({'index': len(prepared), 'text': text, 'file': file_name})
+
+        exercise['segments'] = prepared
+        exercise['status'] = 'ready' if prepared else 'failed'
+        if not prepared:
+            exercise['error'] = 'No audio could be prepared for this exercise'
+        self.save_manifest(exercise)
+
+
+dictation_library = DictationLibrary()
+
+
+@app.get('/dictation-audio/{exercise_id}/{index}')
+def serve_segment(exercise_id: str, index: int, request: Request):
+    path = dictation_library.segment_path(exercise_id, index)
+    if path is None or not os.path.exists(path):
+        return Response(status_code=404)
+    return stream_file(path, request)
+
+
+class DictationPage:
+    def __init__(self, library: DictationLibrary = dictation_library):
+        self.library = library
+        self.exercise = None
+        self.index = 0
+        self.results = []
+
+    def build(self):
+        with ui.column().classes('p-8 w-full max-w-3xl gap-4'):
+            ui.label('Dictation').classes('text-3xl font-bold text-gray-800')
+
+            with ui.card().classes('w-full p-4'):
+                ui.label('Choose an exercise').classes('text-lg font-semibold mb-2')
+                with ui.row().classes('w-full gap-2 items-center'):
+                    self.exercise_select = ui.select(options=self.exercise_options(),
+                                                     label='Exercise').classes('flex-grow')
+                    ui.button('Start', on_click=self.start).props('rounded').classes('bg-indigo text-white')
+
+            self.session_container = ui.column().classes('w-full gap-4')
+
+            with ui.card().classes('w-full p-4'):
+                ui.label('Create an exercise from words').classes('text-lg font-semibold mb-2')
+                with ui.row().classes('w-full gap-2 items-center'):
+                    self.title_input = ui.input(label='Title').classes('w-48')
+                    self.words_input = ui.input(label='Words, separated by commas').classes('flex-grow')
+                    ui.button('Prepare', on_click=self.create_exercise).props('rounded') \
+                        .classes('bg-indigo text-white')
+
+    def exercise_options(self) -> Dict[str, str]:
+        return {e['id']: e['title'] for e in self.library.ready_exercises()}
+
+    def create_exercise(self):
+        words = [w.strip() for w in (self.words_input.value or '').split(',') if w.strip()]
+        title = (self.title_input.value or '').strip()
+        if not title or not words:
+            ui.notify('Please enter a title and at least one word', type='warning')
+            return
+        self.library.submit_words(title, words)
+        self.words_input.value = ''
+        self.title_input.value = ''
+        ui.notify('Exercise queued, it will appear in the list once prepared', type='info')
+
+    def start(self):
+        self.exercise_select.options = self.exercise_options()
+        self.exercise_select.update()
+        exercise = self.library.get(self.exercise_select.value or '')
+        if not exercise or exercise['status'] != 'ready':
+            ui.notify('Please select a prepared exercise', type='warning')
+            return
+        self.exercise = exercise
+        self.index = 0
+        self.results = []
+        self.show_segment()
+
+    def show_segment(self):
+        self.session_container.clear()
+        segments = self.exercise['segments']
+        with self.session_container:
+            if self.index >= len(segments):
+                self.show_summary()
+                return
+            with ui.card().classes('w-full p-4'):
+                ui.label(f"{self.exercise['title']} - {self.index + 1}/{len(segments)}") \
+                    .classes('text-lg font-semibold')
+                # The browser streams the segment with Range requests
+                ui.audio(f"/dictation-audio/{self.exercise['id']}/{self.index}").classes('w-full')
+                self.answer_input = ui.input(label='Type what you hear').classes('w-full')
+                self.answer_input.on('keypress.enter', self.check)
+                self.feedback = ui.row().classes('gap-1 mt-2')
+                with ui.row().classes('gap-2'):
+                    ui.button('Check', on_click=self.check).props('rounded').classes('bg-indigo text-white')
+                    ui.button('Next', on_click=self.next_segment).props('rounded flat')
+
+    def check(self):
+        segment = self.exercise['segments'][self.index]
+        result = grade_answer(segment['text'], self.answer_input.value or '')
+        if len(self.results) > self.index:
+            self.results[self.index] = result
+        else:
+            self.results.append(result)
+
+        self.feedback.clear()
+        with self.feedback:
+            for op in result['ops']:
+                if op['op'] == 'equal':
+                    ui.label(op['expected']).classes('text-green-600')
+                elif op['op'] == 'missing':
+                    ui.label(op['expected']).classes('text-orange-500 underline')
+                else:
+                    ui.label(op['answer']).classes('text-red-500 line-through')
+                    if op['op'] == 'replace':
+                        ui.label(op['expected']).classes('text-green-600')
+
+    def next_segment(self):
+        if len(self.results) <= self.index:
+            self.results.append(grade_answer(self.exercise['segments'][self.index]['text'], ''))
+        self.index += 1
+        self.show_segment()
+
+    def show_summary(self):
+        total = len(self.results)
+        score = sum(r['score'] for r in self.results) / total if total else 0
+        activity_log.record(DEFAULT_USER, 'dictation', f"Dictation '{self.exercise['title']}' {score:.0%}",
+                            exercise_id=self.exercise['id'], score=round(score, 3), segments=total)
+        with ui.card().classes('w-full p-4'):
+            ui.label('Exercise completed').classes('text-xl font-bold')
+            ui.label(f'Average score: {score:.0%}').classes('text-gray-700')
+            ui.button('Restart', on_click=self.start).props('rounded').classes('bg-indigo text-white')
@@ -1,16 +1,140 @@
 import requests
+import gzip
+import json
+import os
+import threading
+from collections import OrderedDict
 from nicegui import ui
+from audio_cache import audio_url_for
+from album_store import album_store
+from activity import DEFAULT_USER, activity_log
+from metrics import registry as metrics, timed
+from sessions import session_manager
+from loop_watchdog import watchdog
+from normalize import normalizer, word_list
+from config import config, settings
+from layout import static_assets, use_shell_styles
+from lifecycle import atomic_write, lifecycle
+
+API_URL = config.dictionary.api_url
+
+class LookupCache:
+    # Small thread-safe LRU cache for API responses, shared by every page
+    def __init__(self, max_size=5000):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.listeners = []
+
+    def resize(self, max_size):
+        # Hot-reloaded from the config; shrinking drops the least recently used entries
+        with self.lock:
+            self.max_size = max_size
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def on_set(self, callback):
+        # callback(key, value) runs for every new entry (used by the search index)
+        self.listeners.append(callback)
+
+    def get(self, key):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key]
+            return None
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        for callback in self.listeners:
+            callback(key, value)
+
+    def __contains__(self, key):
+        with self.lock:
+            return key in self.entries
+
+    def items(self):
+        # Snapshot, least recently used first
+        with self.lock:
+            return list(self.entries.items())
+
+lookup_cache = LookupCache(config.dictionary.cache_size)
+settings.on_change('dictionary.cache_size', lookup_cache.resize)
+
+def save_lookup_cache(cache=lookup_cache, path=config.paths.lookup_cache):
+    # Oldest entry first, so restoring with set() rebuilds the same LRU order
+    lines = ''.join(json.dumps([key, value], ensure_ascii=False) + '\n' for key, value in cache.items())
+    atomic_write(path, gzip.compress(lines.encode(), compresslevel=6))
+
+def load_lookup_cache(cache=lookup_cache, path=config.paths.lookup_cache):
+    # A restart starts with a warm cache; set() also feeds the search index and the word list
+    if not os.path.exists(path):
+        return
+    with gzip.open(path, 'rt', encoding='utf-8') as file:
+        for line in file:
+            try:
+                key, value = json.loads(line)
+            except ValueError:
+                continue
+            cache.set(key, value)
+
+lifecycle.register('lookup_cache', save_lookup_cache, load_lookup_cache)
+
+@timed('dictionary_upstream_seconds')
+def fetch_word_info(word, api_url=API_URL):
+    # Shared lookup path, also used outside the dictionary page (dictation, reading)
+    result = requests.get(api_url.format(word=word), timeout=config.dictionary.timeout)
+    return result.json()
+
+def is_found(data):
+    return isinstance(data, list) and len(data) > 0
+
+def cached_lookup(key, api_url=API_URL, limiter=None):
+    # limiter: optional rate limiter with acquire(), taken once per upstream request (cache hits are free)
+    data = lookup_cache.get(key)
+    if data is None:
+        metrics.inc('dictionary_lookups_total', result='miss')
+        if limiter is not None:
+            limiter.acquire()
+        data = fetch_word_info(key, api_url)
+        lookup_cache.set(key, data)
+    else:
+        metrics.inc('dictionary_lookups_total', result='hit')
+    return data
+
+def lookup_word(word, api_url=API_URL, limiter=None):
+    # Cached version of fetch_word_info; "not found" answers are cached too.
+    # The query is normalized first, so "Running", "running " and "RUNNING" share one cache entry,
+    # and inflected forms or typos fall back to the lemma or the closest known word
+    data = None
+    for candidate in normalizer.candidates(word):
+        data = cached_lookup(candidate['key'], api_url, limiter)
+        if is_found(data):
+            metrics.inc('dictionary_normalized_total', reason=candidate['reason'])
+            return data
+    return data
+
+def learn_word(key, data):
+    # Words the API knows become spelling suggestions
+    if is_found(data):
+        word_list.add(key)
+
+lookup_cache.on_set(learn_word)
 
 class DictionaryApp:
     def __init__(self):
-        self.api_url = "https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
-        self.albums = {}  # Store flashcard albums
+        self.api_url = API_URL
+        self.albums = album_store  # Flashcard albums, shared with the reading and vocabulary modules
         self.setup_ui()
 
     def get_word_info(self, word):
-        result = requests.get(self.api_url.format(word=word))
-        return result.json()
+        return lookup_word(word, self.api_url)
 
+    @watchdog.tracked('DictionaryApp.search_word')
     def search_word(self):
         word = self.input_word.value.strip()
         
@@ -29,14 +153,25 @@ class DictionaryApp:
                 
                 if isinstance(data, list) and len(data) > 0:
                     word_data = data[0]
+                    activity_log.record(DEFAULT_USER, 'lookup', f"Looked up '{word}'", word=word)
                     phonetic = word_data.get('phonetic', 'No phonetic available')
                     meanings = word_data.get('meanings', [])
 
+                    # The lookup may have used the lemma or a spelling fix of what was typed
+                    if word_data.get('word', '').casefold() != word.casefold():
+                        ui.label(f"Showing results for '{word_data['word']}'").classes('text-gray-500 italic')
+                        word = word_data['word']
+
                     # Word and Phonetic
                     with ui.card().classes('w-full'):
                         with ui.row().classes('items-center gap-4'):
                             ui.label(word).classes('text-2xl font-bold')
                             ui.label(phonetic).classes('text-gray-500')
+                            # Pronunciation is served through the local caching proxy
+                            if audio_url := audio_url_for(word_data):
+                                ui.button(icon='volume_up',
+                                          on_click=lambda url=audio_url: self.play_audio(url)) \
+                                    .props('flat round').classes('text-indigo-600')
 
                     # Meanings
                     with ui.card().classes('w-full mt-4'):
@@ -92,6 +227,9 @@ class DictionaryApp:
             except Exception as e:
                 ui.label(f"Error: {str(e)}").classes('text-red-500')
 
+    def play_audio(self, url):
+        ui.run_javascript(f'new Audio("{url}").play()')
+
     def add_to_flashcard(self, word_data):
         if not hasattr(self, 'album_select') or not self.album_select.value:
             ui.notify("Please select an flashcard album before adding a word", type='warning')
@@ -108,20 +246,18 @@ class DictionaryApp:
                     'part_of_speech': meaning.get('partOfSpeech', '')
                 })
         
-        if album_name not in self.albums:
-            self.albums[album_name] = []
-            
-        # Check if word already exists in the album
-        if any(card['word'] == word for card in self.albums[album_name]):
-            ui.notify(f"'{word}' already exists in flashcard album '{album_name}'", type='warning')
-            return
-            
-        self.albums[album_name].append({
+        # The store checks for duplicates through its word index
+        added = self.albums.add_card(album_name, {
             "word": word,
             "definitions": definitions,
             "phonetic": word_data.get('phonetic', '')
         })
+        if not added:
+            ui.notify(f"'{word}' already exists in flashcard album '{album_name}'", type='warning')
+            return
         
+        activity_log.record(DEFAULT_USER, 'flashcard', f"Added '{word}' to '{album_name}'",
+                            album=album_name, word=word)
         ui.notify(f"Added '{word}' to fashcard album '{album_name}'", type='success')
 
     def create_album(self, album_name):
@@ -134,7 +270,7 @@ class DictionaryApp:
             ui.notify("Flashcard album already exists", type='warning')
             return
             
-        self.albums[album_name] = []
+        self.albums.create_album(album_name)
         self.update_album_selects()
         self.new_album_input.value = ''  # Clear the input
         ui.notify(f"Created new flashcard album: {album_name}", type='success')
@@ -145,8 +281,8 @@ class DictionaryApp:
             self.album_select.update()
     
     def setup_ui(self):
-        # Style the body
-        ui.query('body').style('background: linear-gradient(135deg, #f0f4ff, #e5e7ff)')
+        # Background comes from the shared, cached stylesheet
+        use_shell_styles()
 
         with ui.row().classes('width: 144%; height: 80px; padding: 20px;'):
             with ui.card().classes('w-full max-w-3xl'):
@@ -167,7 +303,14 @@ class DictionaryApp:
 
 def main():
     app = DictionaryApp()
-    ui.run(title='Dictionary', favicon='🎓')
+    lifecycle.install()
+    session_manager.install()
+    settings.install()
+    static_assets.install()
+    watchdog.install()
+    metrics.install()
+    ui.run(port=config.server.dictionary_port, title='Dictionary', favicon='🎓',
+           timeout_graceful_shutdown=config.server.drain_seconds)
 
 if __name__ in {"__main__", "__mp_main__"}:
     main()
\ No newline at end of file
@@ -0,0 +1,80 @@
+from nicegui import run, ui
+from typing import Optional
+import gzip
+import json
+import os
+import tempfile
+import zlib
+
+from album_io import export_url, import_album
+from album_store import AlbumStore, album_store
+from layout import static_url
+from review import ReviewService, review_service
+
+
+class FlashcardPage:
+    def __init__(self, albums: AlbumStore = album_store, reviews: ReviewService = review_service):
+        self.albums = albums
+        self.reviews = reviews
+
+    def build(self):
+        ui.add_body_html(f'<script src="{static_url("review.js")}"></script>')
+        with ui.column().classes('p-8 w-full gap-6'):
+            ui.label('Flashcards').classes('text-3xl font-bold text-gray-800')
+            self.review_area = ui.element('div').classes('w-full')
+            self.album_list = ui.column().classes('w-full gap-2')
+            self.show_albums()
+
+            with ui.expansion('Import an album', icon='upload').classes('w-full'):
+                ui.label('Album files exported from MYMY (.mymy.jsonl.gz). Words already in the album are skipped.') \
+                    .classes('text-sm text-gray-500')
+                self.import_name = ui.input(label='Import into album (optional)').classes('w-80')
+                ui.upload(on_upload=self.handle_upload, auto_upload=True).props('accept=".gz,.jsonl"')
+
+    def show_albums(self):
+        self.album_list.clear()
+        with self.album_list:
+            if not len(self.albums):
+                ui.label('No flashcard albums yet, add words from the dictionary.').classes('text-gray-500')
+            for name in list(self.albums.keys()):
+                with ui.card().classes('w-full p-4'):
+                    with ui.row().classes('w-full items-center justify-between'):
+                        with ui.column().classes('gap-0'):
+                            ui.label(name).classes('text-lg font-semibold')
+                            ui.label(f'{len(self.albums[name])} cards').classes('text-sm text-gray-500')
+                        with ui.row().classes('items-center gap-4'):
+                            ui.button('Review', icon='school', on_click=lambda name=name: self.start_review(name)) \
+                                .props('flat color=indigo')
+                            # Plain link: the browser downloads the streamed file without going through the websocket
+                            ui.link('Export', export_url(name)).props('download').classes('text-indigo-600')
+
+    def start_review(self, album_name: str):
+        # The due batch crosses the websocket once; grading happens in the browser (static/review.js)
+        cards = self.reviews.due_cards(album_name)
+        if not cards:
+            ui.notify(f"Nothing due in '{album_name}' today", type='info')
+            return
+        ui.run_javascript(f'window.mymyReview.start({json.dumps(album_name)}, {json.dumps(cards)}, '
+                          f'"c{self.review_area.id}")')
+
+    async def handle_upload(self, e):
+        # e.file is NiceGUI's FileUpload: copied chunk by chunk to a temp file, so the import still streams
+        album_name = self.import_name.value.strip() or None
+        handle, path = tempfile.mkstemp(prefix='mymy-album-', suffix='.upload')
+        os.close(handle)
+        try:
+            await e.file.save(path)
+            # Imports run off the event loop: a large album takes a while to add card by card
+            summary = await run.io_bound(self.import_file, path, album_name)
+        except (ValueError, UnicodeDecodeError, OSError, EOFError, zlib.error, gzip.BadGzipFile):
+            ui.notify('This file is not a MYMY album', type='negative')
+            return
+        finally:
+            os.remove(path)
+        ui.notify(f"Imported {summary['added']} cards into '{summary['album']}'"
+                  f" ({summary['duplicates']} already there)", type='positive')
+        self.show_albums()
+
+    def import_file(self, path: str, album_name: Optional[str]):
+        with open(path, 'rb') as source:
+            return import_album(self.albums, source, album_name)
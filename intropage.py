@@ -1,58 +1,52 @@
-from nicegui import ui
+from nicegui import app, ui
+from fastapi import Request
+from fastapi.responses import HTMLResponse, Response
 from typing import List, Dict
+from html import escape
+import hashlib
+import sys
 
-def create_intro_page():
-    nav_items: List[Dict] = [
-        {"name": "Home", "url": "/", "icon": "home"},
-        {"name": "Explore", "url": "/explore", "icon": "explore"},
-        {"name": "Help", "url": "/help", "icon": "help"}
-    ]
+from config import config, settings
+from lifecycle import lifecycle
+from layout import NAV_ITEMS, logo_html, nav_html, static_assets, static_url, stylesheet_url, use_shell_styles
+from metrics import registry as metrics
+from sessions import session_manager
+
+HERO_TITLE = "We Do Not Just Teach, We Inspire"
+HERO_TEXT = 'We always make our student satisfy by providing as many convenient as possible'
 
-    features = [
-        {
-            "title": "Effective Learning",
-            "description": "The SKT legacy has been reignited and T1'll be your 2023 World Champions",
-            "icon": "school"
-        },
-        {
-            "title": "Create Activities",
-            "description": "They say Busan was Church of Chovy, but what's God to 5 non believers",
-            "icon": "groups"
-        },
-        {
-            "title": "Fun Flashcards",
-            "description": "It is not LPL versus LCK, it's T1 versus the LPL and I like those odds",
-            "icon": "library_books"
-        }
-    ]
+FEATURES: List[Dict] = [
+    {
+        "title": "Effective Learning",
+        "description": "The SKT legacy has been reignited and T1'll be your 2023 World Champions",
+        "icon": "school"
+    },
+    {
+        "title": "Create Activities",
+        "description": "They say Busan was Church of Chovy, but what's God to 5 non believers",
+        "icon": "groups"
+    },
+    {
+        "title": "Fun Flashcards",
+        "description": "It is not LPL versus LCK, it's T1 versus the LPL and I like those odds",
+        "icon": "library_books"
+    }
+]
+
+def create_intro_page():
+    nav_items: List[Dict] = NAV_ITEMS
+    features = FEATURES
 
     # Set page background and styles
-    ui.query('body').style(
-        '''
-        background: linear-gradient(135deg, #f0f4ff, #e5e7ff);
-        margin: 0;
-        padding: 0;
-        min-height: 100vh;
-        font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif;
-        '''
-    )
+    use_shell_styles()
+    ui.query('body').classes('mymy-intro')
 
     # Header
-    with ui.header().classes('w-full').style('background: rgba(255, 255, 255, 0.9); backdrop-filter: blur(10px);'):
+    with ui.header().classes('w-full mymy-header-bar'):
         with ui.row().classes('w-full max-w-7xl mx-auto justify-between items-center p-4'):
-            # Logo section
-            with ui.row().classes('items-center gap-2'):
-                ui.icon('auto_stories').classes('text-3xl text-indigo-600')
-                ui.label('MYMY').classes('text-2xl font-bold text-indigo-600')
-            
-            # Navigation
-            with ui.row().classes('space-x-6'):
-                for item in nav_items:
-                    with ui.row().classes('items-center gap-2 cursor-pointer hover:text-indigo-600 transition-colors duration-200 '):
-                        ui.icon(item['icon']).classes('text-indigo-600')
-                        ui.link(item['name'], item['url']).classes(
-                            'text-gray-700 hover:text-indigo-600 transition-colors duration-200'
-                        )
+            # Logo and navigation come from the shared, cached shell markup
+            ui.html(logo_html())
+            ui.html(nav_html(nav_items))
             
             # Call to action button
             #ui.button('Get Started', on_click=lambda: ui.notify('Welcome to MYMY!')).classes(
@@ -62,10 +56,8 @@ def create_intro_page():
     # Hero Section
     with ui.column().classes('max-w-7xl mx-auto px-4 pt-24 pb-16'):
         with ui.column().classes('items-center text-center gap-6'):
-            ui.label("We Do Not Just Teach, We Inspire").classes('text-5xl font-bold text-gray-900')
-            ui.label(
-                'We always make our student satisfy by providing as many convenient as possible'
-            ).classes('text-xl text-gray-600 max-w-2xl')
+            ui.label(HERO_TITLE).classes('text-5xl font-bold text-gray-900')
+            ui.label(HERO_TEXT).classes('text-xl text-gray-600 max-w-2xl')
             
             with ui.row().classes('gap-4'):
                 ui.button('Log in', on_click=lambda: ui.notify('Starting your learning journey!')).props('rounded').classes(
@@ -94,7 +86,70 @@ def create_intro_page():
             #    for item in nav_items:
             #        ui.link(item['name'], item['url']).classes('text-gray-600 hover:text-indigo-600')
 
+def render_landing_html(login_url: str = '/', register_url: str = '/register', nav_base: str = '') -> str:
+    # Defaults are the auth pages' own routes (login.py serves the login form at "/")
+    # Same content as create_intro_page, as a plain HTML document without NiceGUI or a websocket.
+    # nav_base prefixes the logo and nav links, for when another app serves those pages
+    nav_items = [{**item, 'url': nav_base + item['url']} for item in NAV_ITEMS]
+    cards = ''.join(
+        f'<div class="landing-card"><div class="landing-card-icon"><span class="material-icons">{escape(f["icon"])}</span></div>'
+        f'<h3>{escape(f["title"])}</h3><p>{escape(f["description"])}</p></div>'
+        for f in FEATURES
+    )
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>MYMY Learning Platform</title>
+<link rel="icon" href="data:image/svg+xml,<svg xmlns=%22http://www.w3.org/2000/svg%22 viewBox=%220 0 100 100%22><text y=%22.9em%22 font-size=%2290%22>🎓</text></svg>">
+<link rel="stylesheet" href="https://fonts.googleapis.com/icon?family=Material+Icons">
+<link rel="stylesheet" href="{stylesheet_url()}">
+<link rel="stylesheet" href="{static_url('landing.css')}">
+</head>
+<body class="mymy-body landing">
+<header class="landing-header"><div class="landing-container landing-row">{logo_html(nav_base + '/')}{nav_html(nav_items)}</div></header>
+<main>
+<section class="landing-hero landing-container">
+<h1>{escape(HERO_TITLE)}</h1>
+<p>{escape(HERO_TEXT)}</p>
+<div class="landing-actions"><a class="landing-button" href="{escape(login_url)}">Log in</a><a class="landing-button" href="{escape(register_url)}">Sign up</a></div>
+</section>
+<section class="landing-features landing-container">{cards}</section>
+</main>
+<footer class="landing-footer"><div class="landing-container">© 2024 MYMY Learning Platform</div></footer>
+</body>
+</html>
+"""
+
+def register_static_landing(path: str = '/', login_url: str = '/', register_url: str = '/register',
+                            nav_base: str = ''):
+    # Render once at startup; every visit is then a cached HTTP response with no client session
+    html = render_landing_html(login_url, register_url, nav_base)
+    etag = '"' + hashlib.sha1(html.encode()).hexdigest()[:16] + '"'
+    headers = {'ETag': etag, 'Cache-Control': 'public, max-age=300'}
+
+    @app.get(path, include_in_schema=False)
+    def landing(request: Request):
+        if request.headers.get('if-none-match') == etag:
+            return Response(status_code=304, headers=headers)
+        return HTMLResponse(html, headers=headers)
+
 if __name__ in {"__main__", "__mp_main__"}:
-    create_intro_page()
-    ui.run(title='MYMY Learning Platform', favicon='🎓')
+    if '--static' in sys.argv:
+        # Registered before ui.run(), so it is matched before NiceGUI's fallback for unknown paths.
+        # The buttons point at the auth app, which serves the login form at "/" and the sign-up form at "/register";
+        # the logo and nav links at the dashboard, which has a page for every nav item
+        auth_url = config.server.auth_url or f'http://localhost:{config.server.auth_port}'
+        dashboard_url = config.server.dashboard_url or f'http://localhost:{config.server.dashboard_port}'
+        register_static_landing(login_url=auth_url + '/', register_url=auth_url + '/register', nav_base=dashboard_url)
+    else:
+        create_intro_page()
+    lifecycle.install()
+    session_manager.install()
+    settings.install()
+    static_assets.install()
+    metrics.install()
+    ui.run(port=config.server.intro_port, title=config.server.title, favicon='🎓',
+           timeout_graceful_shutdown=config.server.drain_seconds)
 
@@ -0,0 +1,78 @@
+from nicegui import ui
+from functools import lru_cache
+from html import escape
+from typing import Dict, List, Tuple
+import os
+
+from assets import StaticAssets
+from config import config
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+STYLESHEET = 'mymy.css'
+
+static_assets = StaticAssets(STATIC_DIR)
+static_assets.mount()
+static_assets.precompress_all()
+
+# Top navigation shared by the landing page, the auth pages and the dashboard
+NAV_ITEMS: List[Dict] = config.menus.nav
+
+
+def static_url(name: str) -> str:
+    # The content hash in the query string lets browsers cache the file for a year
+    return static_assets.url(name)
+
+
+def stylesheet_url() -> str:
+    return static_url(STYLESHEET)
+
+
+def use_shell_styles():
+    # Per page: one <link> tag and a body class instead of inline style strings
+    ui.add_head_html(f'<link rel="stylesheet" href="{stylesheet_url()}">')
+    ui.query('body').classes('mymy-body')
+
+
+def freeze(items: List[Dict]) -> Tuple:
+    # Menu definitions are lists of dicts; turn them into a hashable cache key
+    return tuple(tuple(sorted(item.items())) for item in items)
+
+
+@lru_cache(maxsize=32)
+def _logo_html(href: str) -> str:
+    return (f'<a class="mymy-logo" href="{escape(href)}">'
+            f'<span class="material-icons">auto_stories</span>MYMY</a>')
+
+
+def logo_html(href: str = '/') -> str:
+    return _logo_html(href)
+
+
+@lru_cache(maxsize=32)
+def _nav_html(items: Tuple) -> str:
+    links = []
+    for item in map(dict, items):
+        links.append(f'<a href="{escape(item["url"])}"><span class="material-icons">{escape(item["icon"])}</span>'
+                     f'{escape(item["name"])}</a>')
+    return f'<nav class="mymy-nav">{"".join(links)}</nav>'
+
+
+def nav_html(nav_items: List[Dict]) -> str:
+    return _nav_html(freeze(nav_items))
+
+
+@lru_cache(maxsize=32)
+def _menu_html(items: Tuple) -> str:
+    entries = []
+    for item in map(dict, items):
+        entries.append(
+            f'<a class="mymy-menu-item" href="{escape(item["url"])}">'
+            f'<span class="material-icons">{escape(item["icon"])}</span>'
+            f'<span class="mymy-menu-text"><span class="mymy-menu-name">{escape(item["name"])}</span>'
+            f'<span class="mymy-menu-description">{escape(item["description"])}</span></span></a>'
+        )
+    return ''.join(entries)
+
+
+def menu_html(menu_items: List[Dict]) -> str:
+    return _menu_html(freeze(menu_items))
@@ -0,0 +1,97 @@
+from nicegui import app
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+import asyncio
+import logging
+import os
+import tempfile
+import time
+
+from metrics import registry as metrics
+
+logger = logging.getLogger('mymy.lifecycle')
+
+metrics.describe('lifecycle_flush_seconds', 'Time spent flushing a store at shutdown')
+metrics.describe('lifecycle_restore_seconds', 'Time spent restoring a store at startup')
+
+
+def atomic_write(path: str, data: bytes):
+    # Temp file in the same directory, then rename: a crash mid-write never leaves a torn file
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temp = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(handle, 'wb') as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp, path)
+    except BaseException:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+
+
+class Lifecycle:
+    # In-memory stores register a flush (write to disk) and an optional restore (read back) hook.
+    # Startup restores everything before the first page is served; shutdown flushes all stores in parallel.
+    # Open requests are drained before that by uvicorn: entry points pass
+    # timeout_graceful_shutdown=config.server.drain_seconds to ui.run()
+    def __init__(self, workers: int = 4):
+        self.workers = workers
+        self.stores: Dict[str, Dict[str, Optional[Callable]]] = {}
+        self.report: Dict[str, Dict] = {}
+        self.installed = False
+
+    def install(self):
+        # Called once by each entry point before ui.run(), and before other startup hooks that read the stores
+        if self.installed:
+            return
+        self.installed = True
+        app.on_startup(self.startup)
+        app.on_shutdown(self.shutdown)
+
+    def register(self, name: str, flush: Callable, restore: Optional[Callable] = None):
+        # Registering the same name again replaces the hooks (e.g. a module run as __main__)
+        self.stores[name] = {'flush': flush, 'restore': restore}
+
+    def run_all(self, hook: str) -> Dict[str, Dict]:
+        names = [name for name, hooks in self.stores.items() if hooks[hook] is not None]
+        results = {}
+
+        def run(name):
+            started = time.perf_counter()
+            try:
+                self.stores[name][hook]()
+                outcome = {'ok': True}
+            except Exception as exc:
+                # One broken store must not keep the others from being saved
+                logger.exception('%s of %s failed', hook, name)
+                outcome = {'ok': False, 'error': f'{type(exc).__name__}: {exc}'}
+            seconds = time.perf_counter() - started
+            metrics.observe(f'lifecycle_{hook}_seconds', seconds, store=name)
+            outcome['seconds'] = round(seconds, 3)
+            return name, outcome
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f'lifecycle-{hook}') as pool:
+            for name, outcome in pool.map(run, names):
+                results[name] = outcome
+        return results
+
+    def restore(self) -> Dict[str, Dict]:
+        self.report['restore'] = self.run_all('restore')
+        return self.report['restore']
+
+    def flush(self) -> Dict[str, Dict]:
+        self.report['flush'] = self.run_all('flush')
+        return self.report['flush']
+
+    async def startup(self):
+        results = await asyncio.get_running_loop().run_in_executor(None, self.restore)
+        logger.info('Restored %d stores: %s', len(results), results)
+
+    async def shutdown(self):
+        results = await asyncio.get_running_loop().run_in_executor(None, self.flush)
+        logger.info('Flushed %d stores: %s', len(results), results)
+
+
+lifecycle = Lifecycle()
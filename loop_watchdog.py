@@ -0,0 +1,164 @@
+from nicegui import app, ui
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+import asyncio
+import functools
+import logging
+import sys
+import threading
+import time
+
+from metrics import registry as metrics
+from sessions import LOCAL_HOSTS
+
+LAG_THRESHOLD = 0.1  # seconds the loop may be late before the stall is reported
+HEARTBEAT_SECONDS = 0.05
+MAX_REPORTS = 100
+MAX_DEPTH = 30
+
+logger = logging.getLogger('mymy.watchdog')
+
+
+def format_stack(frame, max_depth=MAX_DEPTH) -> List[str]:
+    stack = []
+    while frame is not None and len(stack) < max_depth:
+        stack.append(f'{frame.f_code.co_filename.rsplit("/", 1)[-1]}:{frame.f_lineno} {frame.f_code.co_name}')
+        frame = frame.f_back
+    return list(reversed(stack))
+
+
+def current_route() -> str:
+    try:
+        return ui.context.client.page.path
+    except Exception:
+        return ''
+
+
+class LoopWatchdog:
+    # An asyncio heartbeat marks the loop as alive; a separate thread notices when the heartbeat
+    # is late and grabs the loop thread's stack while it is still stuck in the blocking call
+    def __init__(self, threshold=LAG_THRESHOLD, heartbeat=HEARTBEAT_SECONDS):
+        self.threshold = threshold
+        self.heartbeat = heartbeat
+        self.beat = time.monotonic()
+        self.loop = None
+        self.loop_thread: Optional[int] = None
+        self.current: Dict[str, str] = {}  # sync handler running on the loop right now, set by tracked()
+        # Async handlers are tagged per task: concurrent handlers interleave at every await, so a shared
+        # attribute would carry whichever one started last. A ContextVar would not do either, the monitor
+        # thread cannot read the context of the task that is blocking the loop
+        self.task_tags: Dict[asyncio.Task, Dict[str, str]] = {}
+        self.reports = deque(maxlen=MAX_REPORTS)
+        self.stalled = False
+        self.task = None
+        self.thread = None
+        self.installed = False
+
+    def install(self, debug: bool = False):
+        # Called once by each entry point before ui.run()
+        if self.installed:
+            return
+        self.installed = True
+        app.on_startup(lambda: self.start(debug))
+        app.get('/metrics/blocking', include_in_schema=False)(self.reports_endpoint)
+        metrics.describe('event_loop_lag_seconds', 'How late the event loop heartbeat fired')
+        metrics.describe('event_loop_blocked_total', 'Loop stalls above the watchdog threshold, by route and handler')
+
+    def start(self, debug: bool = False):
+        if self.task is not None:
+            return
+        loop = asyncio.get_running_loop()
+        if debug:
+            # asyncio itself then logs every callback slower than the threshold
+            loop.set_debug(True)
+            loop.slow_callback_duration = self.threshold
+        self.loop = loop
+        self.loop_thread = threading.get_ident()
+        self.beat = time.monotonic()
+        self.task = loop.create_task(self.run())
+        self.thread = threading.Thread(target=self.monitor, name='loop-watchdog', daemon=True)
+        self.thread.start()
+
+    async def run(self):
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.heartbeat)
+            self.beat = time.monotonic()
+            metrics.observe('event_loop_lag_seconds', max(self.beat - started - self.heartbeat, 0.0))
+
+    def monitor(self):
+        while True:
+            time.sleep(self.heartbeat)
+            late = time.monotonic() - self.beat - self.heartbeat
+            if late > self.threshold and not self.stalled:
+                # One report per stall, taken while the loop is still blocked
+                self.stalled = True
+                self.report(late)
+            elif late <= self.threshold:
+                self.stalled = False
+
+    def report(self, late: float):
+        frame = sys._current_frames().get(self.loop_thread)
+        if frame is None:
+            return
+        context = self.running_context()
+        entry = {
+            'ts': datetime.now().isoformat(timespec='seconds'),
+            'lag_ms': round(late * 1000, 1),
+            'route': context.get('route', ''),
+            'handler': context.get('handler', ''),
+            'stack': format_stack(frame),
+        }
+        self.reports.append(entry)
+        metrics.inc('event_loop_blocked_total', route=entry['route'], handler=entry['handler'])
+        logger.warning('Event loop blocked for %.0f ms in %s (route %s):\n  %s', entry['lag_ms'],
+                       entry['handler'] or '?', entry['route'] or '?', '\n  '.join(entry['stack'][-12:]))
+
+    def running_context(self) -> Dict[str, str]:
+        # A sync handler is the innermost code running, otherwise the tag of the task the loop is in
+        if self.current:
+            return dict(self.current)
+        task = asyncio.current_task(self.loop) if self.loop is not None else None
+        return dict(self.task_tags.get(task) or {})
+
+    def tracked(self, handler: str = ''):
+        # Decorator for UI handlers: tags stall reports with the handler and the page route
+        def decorator(func):
+            name = handler or func.__qualname__
+
+            if asyncio.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    task = asyncio.current_task()
+                    previous = self.task_tags.get(task)
+                    self.task_tags[task] = {'handler': name, 'route': current_route()}
+                    try:
+                        return await func(*args, **kwargs)
+                    finally:
+                        if previous is None:
+                            self.task_tags.pop(task, None)
+                        else:
+                            self.task_tags[task] = previous
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                previous = self.current
+                self.current = {'handler': name, 'route': current_route()}
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.current = previous
+            return wrapper
+        return decorator
+
+    def reports_endpoint(self, request: Request):
+        if request.client is None or request.client.host not in LOCAL_HOSTS:
+            return JSONResponse({'detail': 'Not Found'}, status_code=404)
+        return {'threshold_ms': self.threshold * 1000, 'reports': list(reversed(self.reports))}
+
+
+watchdog = LoopWatchdog()
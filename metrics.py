@@ -0,0 +1,228 @@
+from nicegui import app
+from fastapi import Request
+from fastapi.responses import PlainTextResponse
+from bisect import bisect_left
+from collections import Counter, deque
+from typing import Dict, Tuple
+import asyncio
+import functools
+import sys
+import threading
+import time
+
+from sessions import LOCAL_HOSTS
+
+# Seconds; covers a cached lookup (<1 ms) up to a slow scrypt check or upstream call
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+RESERVOIR_SIZE = 2048  # recent observations kept per series for the quantiles
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def label_key(labels: Dict) -> Tuple:
+    return tuple(sorted(labels.items()))
+
+
+def format_labels(key: Tuple, extra: Dict = None) -> str:
+    pairs = list(key) + sorted((extra or {}).items())
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{str(v).replace(chr(34), chr(39))}"' for k, v in pairs) + '}'
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.recent = deque(maxlen=RESERVOIR_SIZE)
+
+    def observe(self, value: float):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+        self.recent.append(value)
+
+    def quantiles(self) -> Dict[float, float]:
+        values = sorted(self.recent)
+        if not values:
+            return {}
+        return {q: values[min(int(q * len(values)), len(values) - 1)] for q in QUANTILES}
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.histograms: Dict[str, Dict[Tuple, Histogram]] = {}
+        self.counters: Dict[str, Dict[Tuple, float]] = {}
+        self.help: Dict[str, str] = {}
+        self.lock = threading.Lock()
+        self.installed = False
+
+    def describe(self, name: str, text: str):
+        self.help[name] = text
+
+    def observe(self, name: str, value: float, **labels):
+        with self.lock:
+            series = self.histograms.setdefault(name, {})
+            key = label_key(labels)
+            if key not in series:
+                series[key] = Histogram()
+            series[key].observe(value)
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        with self.lock:
+            series = self.counters.setdefault(name, {})
+            key = label_key(labels)
+            series[key] = series.get(key, 0) + amount
+
+    def snapshot(self, name: str, **labels) -> Dict:
+        with self.lock:
+            histogram = self.histograms.get(name, {}).get(label_key(labels))
+            if histogram is None:
+                return {}
+            return {'count': histogram.count, 'sum': histogram.total,
+                    **{f'p{int(q * 100)}': v for q, v in histogram.quantiles().items()}}
+
+    def render(self) -> str:
+        # Prometheus text exposition format; quantiles are exported as a separate summary
+        lines = []
+        with self.lock:
+            for name, series in sorted(self.counters.items()):
+                lines.append(f'# HELP {name} {self.help.get(name, name)}')
+                lines.append(f'# TYPE {name} counter')
+                for key, value in series.items():
+                    lines.append(f'{name}{format_labels(key)} {value}')
+            for name, series in sorted(self.histograms.items()):
+                lines.append(f'# HELP {name} {self.help.get(name, name)}')
+                lines.append(f'# TYPE {name} histogram')
+                for key, histogram in series.items():
+                    cumulative = 0
+                    for bound, count in zip(BUCKETS + (float('inf'),), histogram.counts):
+                        cumulative += count
+                        le = '+Inf' if bound == float('inf') else repr(bound)
+                        lines.append(f'{name}_bucket{format_labels(key, {"le": le})} {cumulative}')
+                    lines.append(f'{name}_sum{format_labels(key)} {histogram.total}')
+                    lines.append(f'{name}_count{format_labels(key)} {histogram.count}')
+                lines.append(f'# TYPE {name}_recent summary')
+                for key, histogram in series.items():
+                    for q, value in histogram.quantiles().items():
+                        lines.append(f'{name}_recent{format_labels(key, {"quantile": q})} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def install(self):
+        # Called once by each entry point before ui.run()
+        if self.installed:
+            return
+        self.installed = True
+        app.get('/metrics', include_in_schema=False)(metrics_endpoint)
+        app.get('/metrics/profiler', include_in_schema=False)(profiler_endpoint)
+
+
+registry = MetricsRegistry()
+registry.describe('auth_authenticate_seconds', 'Time spent in UserDatabase.authenticate_user (password hash check)')
+registry.describe('user_store_save_seconds', 'Time spent writing users.json in UserDatabase.save_users')
+registry.describe('dictionary_upstream_seconds', 'Time spent waiting for the dictionary API')
+registry.describe('dictionary_lookups_total', 'Dictionary lookups by cache result')
+registry.describe('dictionary_normalized_total', 'Successful lookups by normalization step (exact, case, lemma, spelling)')
+registry.describe('page_build_seconds', 'Time spent building a NiceGUI page')
+
+
+class timed:
+    # Both a decorator and a context manager:
+    #   @timed('auth_authenticate_seconds')     or     with timed('page_build_seconds', route=url): ...
+    def __init__(self, name: str, **labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        registry.observe(self.name, time.perf_counter() - self.started, **self.labels)
+        return False
+
+    def __call__(self, func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    registry.observe(self.name, time.perf_counter() - started, **self.labels)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                registry.observe(self.name, time.perf_counter() - started, **self.labels)
+        return wrapper
+
+
+class SamplingProfiler:
+    # Samples every thread's stack at a fixed interval; off by default, toggled at runtime
+    def __init__(self, interval=0.01, max_depth=40):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks = Counter()
+        self.samples = 0
+        self.thread = None
+        self.running = False
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name='sampling-profiler', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+
+    def reset(self):
+        self.stacks.clear()
+        self.samples = 0
+
+    def run(self):
+        own_id = threading.get_ident()
+        while self.running:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < self.max_depth:
+                    stack.append(f'{frame.f_code.co_name} ({frame.f_code.co_filename.rsplit("/", 1)[-1]}:{frame.f_lineno})')
+                    frame = frame.f_back
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+            time.sleep(self.interval)
+
+    def collapsed(self, limit=200) -> str:
+        # "Collapsed stack" format, ready for flamegraph tools
+        return '\n'.join(f'{stack} {count}' for stack, count in self.stacks.most_common(limit)) + '\n'
+
+
+profiler = SamplingProfiler()
+
+
+def metrics_endpoint(request: Request):
+    if request.client is None or request.client.host not in LOCAL_HOSTS:
+        return PlainTextResponse('Not Found', status_code=404)
+    return PlainTextResponse(registry.render(), media_type='text/plain; version=0.0.4')
+
+
+def profiler_endpoint(request: Request, enable: int = -1, reset: int = 0):
+    # /metrics/profiler?enable=1 starts sampling, ?enable=0 stops it, no argument returns the stacks
+    if request.client is None or request.client.host not in LOCAL_HOSTS:
+        return PlainTextResponse('Not Found', status_code=404)
+    if reset:
+        profiler.reset()
+    if enable == 1:
+        profiler.start()
+    elif enable == 0:
+        profiler.stop()
+    header = f'# running={profiler.running} samples={profiler.samples}\n'
+    return PlainTextResponse(header + profiler.collapsed())
@@ -0,0 +1,129 @@
+from typing import Dict, List, Optional, Set
+import threading
+import unicodedata
+
+from text_utils import WORD_RE, lemmatize, load_frequency_list
+
+WORDLIST_PATH = 'word_frequency.txt'  # same frequency list the vocabulary index uses
+APOSTROPHES = str.maketrans({'’': "'", '‘': "'", 'ʼ': "'", '`': "'"})
+
+
+def normalize_query(text: str) -> str:
+    # NFKC folds full-width letters and ligatures, casefold handles more than lower() (e.g. "ß")
+    text = unicodedata.normalize('NFKC', text or '').translate(APOSTROPHES)
+    return ' '.join(text.casefold().split())
+
+
+def deletes(word: str) -> Set[str]:
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+def edit_distance(a: str, b: str, limit: int = 2) -> int:
+    # Levenshtein with adjacent transpositions; gives up early once every cell exceeds limit
+    previous, current = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        before, previous, current = previous, current, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], before[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+    return current[-1]
+
+
+class WordList:
+    # Known words for spelling correction: the local frequency list plus words the API has confirmed.
+    # Candidates come from a delete index (every word minus one letter), so a correction costs a few
+    # dict lookups instead of generating every possible edit of the query
+    def __init__(self, path: str = WORDLIST_PATH):
+        self.ranks: Dict[str, int] = load_frequency_list(path)
+        self.from_file = bool(self.ranks)
+        self.index: Dict[str, List[str]] = {}  # lists keep the index small for a 50k-word file
+        self.lock = threading.Lock()
+        for word in self.ranks:
+            self.index_word(word)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.ranks
+
+    def __len__(self):
+        return len(self.ranks)
+
+    def index_word(self, word: str):
+        for variant in deletes(word) | {word}:
+            self.index.setdefault(variant, []).append(word)
+
+    def add(self, word: str):
+        word = normalize_query(word)
+        if not word or word in self.ranks or not WORD_RE.fullmatch(word):
+            return
+        with self.lock:
+            self.ranks[word] = len(self.ranks) + 1  # learned words rank after the list
+            self.index_word(word)
+
+    def correct(self, word: str) -> Optional[str]:
+        # Closest known word: smallest edit distance, then most frequent
+        if word in self.ranks or len(word) < 3:
+            return None
+        limit = 1 if len(word) <= 4 else 2
+        variants = {word} | deletes(word)
+        if limit > 1:
+            variants |= {second for first in deletes(word) for second in deletes(first)}
+        candidates = set()
+        for variant in variants:
+            candidates.update(self.index.get(variant, ()))
+        best = None
+        for candidate in candidates:
+            distance = edit_distance(word, candidate, limit)
+            if distance <= limit:
+                key = (distance, self.ranks[candidate])
+                if best is None or key < best[0]:
+                    best = (key, candidate)
+        return best[1] if best else None
+
+
+class Normalizer:
+    def __init__(self, words: WordList):
+        self.words = words
+
+    def candidates(self, text: str) -> List[Dict]:
+        # Ordered cache keys to try upstream, each tagged with why it differs from the input
+        query = normalize_query(text)
+        if not query or not WORD_RE.fullmatch(query):
+            return [{'key': query, 'reason': 'phrase'}] if query else []
+        reason = 'exact' if query == text else 'case'
+        lemma = lemmatize(query)
+        known = query in self.words
+        # A known word is looked up as typed ("better" stays "better"); an unknown inflected form
+        # goes to its lemma first when that is known ("runnings" -> "running" -> "run")
+        keys = [{'key': query, 'reason': reason}]
+        if lemma != query:
+            entry = {'key': lemma, 'reason': 'lemma'}
+            if not known and lemma in self.words:
+                keys.insert(0, entry)
+            else:
+                keys.append(entry)
+        if not known and lemma not in self.words:
+            correction = self.words.correct(query)
+            if correction:
+                fixed = [{'key': correction, 'reason': 'spelling'}]
+                if lemmatize(correction) != correction:
+                    fixed.insert(0, {'key': lemmatize(correction), 'reason': 'spelling'})
+                # With a real word list an unknown word is most likely a typo: try the fix first
+                keys = fixed + keys if self.words.from_file else keys + fixed
+        seen, unique = set(), []
+        for entry in keys:
+            if entry['key'] not in seen:
+                seen.add(entry['key'])
+                unique.append(entry)
+        return unique
+
+    def canonical(self, text: str) -> str:
+        entries = self.candidates(text)
+        return entries[0]['key'] if entries else ''
+
+
+word_list = WordList()
+normalizer = Normalizer(word_list)
@@ -0,0 +1,156 @@
+from nicegui import app
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Callable, Deque, Dict, List, Set
+import asyncio
+import itertools
+import threading
+
+from activity import ActivityLog, activity_log
+from album_store import AlbumStore, album_store
+
+TICK_SECONDS = 2.0  # how often pending updates are pushed to connected clients
+GENERATE_EVERY = 30  # run the generators once every N ticks
+MAX_PER_USER = 50
+
+
+class NotificationCenter:
+    def __init__(self, is_enabled: Callable[[], bool] = lambda: True):
+        self.is_enabled = is_enabled
+        self.queues: Dict[str, Deque[Dict]] = {}
+        self.unread: Dict[str, int] = {}  # kept incrementally so the badge is O(1)
+        self.subscribers: Dict[str, Set[Callable]] = {}
+        self.pending: Set[str] = set()
+        self.generators: List[Callable] = []
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+        self.task = None
+
+    # Queue ----------------------------------------------------------------
+
+    def push(self, user: str, text: str, key: str = '', kind: str = 'info'):
+        # A notification with the same key replaces the previous unread one instead of piling up, and is
+        # skipped when its text has not changed, read or not, so generators can re-push every pass
+        if not self.is_enabled():
+            return
+        with self.lock:
+            queue = self.queues.setdefault(user, deque())
+            if key:
+                latest = next((old for old in reversed(queue) if old['key'] == key), None)
+                if latest is not None and latest['text'] == text:
+                    return
+                for old in list(queue):
+                    if old['key'] == key and not old['read']:
+                        queue.remove(old)
+                        self.unread[user] -= 1
+            if len(queue) >= MAX_PER_USER:
+                dropped = queue.popleft()
+                if not dropped['read']:
+                    self.unread[user] -= 1
+            queue.append({'id': next(self.ids), 'key': key, 'kind': kind, 'text': text,
+                          'ts': datetime.now().isoformat(timespec='seconds'), 'read': False})
+            self.unread[user] = self.unread.get(user, 0) + 1
+            self.pending.add(user)
+
+    def mark_all_read(self, user: str):
+        with self.lock:
+            for notification in self.queues.get(user, []):
+                notification['read'] = True
+            self.unread[user] = 0
+            self.pending.add(user)
+
+    def unread_count(self, user: str) -> int:
+        return self.unread.get(user, 0)
+
+    def items(self, user: str) -> List[Dict]:
+        with self.lock:
+            return list(reversed(self.queues.get(user, [])))
+
+    # Connected clients ----------------------------------------------------
+
+    def subscribe(self, user: str, callback: Callable):
+        # callback(unread_count, items) is called at most once per tick
+        self.subscribers.setdefault(user, set()).add(callback)
+
+    def unsubscribe(self, user: str, callback: Callable):
+        self.subscribers.get(user, set()).discard(callback)
+
+    def flush(self):
+        with self.lock:
+            users, self.pending = self.pending, set()
+        for user in users:
+            callbacks = list(self.subscribers.get(user, ()))
+            if not callbacks:
+                continue
+            count, items = self.unread_count(user), self.items(user)
+            for callback in callbacks:
+                try:
+                    callback(count, items)
+                except Exception:
+                    self.unsubscribe(user, callback)
+
+    # Scheduler ------------------------------------------------------------
+
+    def add_generator(self, generator: Callable):
+        # generator(center) pushes notifications for whichever users it knows about
+        self.generators.append(generator)
+
+    def generate(self):
+        if not self.is_enabled():
+            return
+        for generator in self.generators:
+            generator(self)
+
+    async def run(self):
+        # One timer-driven pass for the whole process instead of one ui.timer per client
+        for tick in itertools.count():
+            if tick % GENERATE_EVERY == 0:
+                await asyncio.get_running_loop().run_in_executor(None, self.generate)
+            self.flush()
+            await asyncio.sleep(TICK_SECONDS)
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.get_running_loop().create_task(self.run())
+
+
+def flashcards_due(albums: AlbumStore = album_store, activity: ActivityLog = activity_log):
+    # Cards without a due date are new and count as due
+    def generator(center: NotificationCenter):
+        today = datetime.now().date().isoformat()
+        with albums.lock:
+            due = sum(1 for name in albums.keys() for card in albums[name] if card.get('due', today) <= today)
+        users = {event['user'] for event in activity.events[-500:]}
+        for user in users:
+            if due:
+                center.push(user, f'{due} flashcards due for review', key='flashcards_due', kind='review')
+    return generator
+
+
+def streak_at_risk(activity: ActivityLog = activity_log, after_hour: int = 18):
+    # Active yesterday but not yet today, late in the day
+    def generator(center: NotificationCenter):
+        now = datetime.now()
+        if now.hour < after_hour:
+            return
+        today = now.date().isoformat()
+        yesterday = (now.date() - timedelta(days=1)).isoformat()
+        active_today, active_yesterday = set(), set()
+        for event in reversed(activity.events):
+            day = event['ts'][:10]
+            if day == today:
+                active_today.add(event['user'])
+            elif day == yesterday:
+                active_yesterday.add(event['user'])
+            else:
+                break
+        for user in active_yesterday - active_today:
+            center.push(user, 'Your study streak is at risk, practice today to keep it!',
+                        key='streak_at_risk', kind='streak')
+    return generator
+
+
+notification_center = NotificationCenter()
+notification_center.add_generator(flashcards_due())
+notification_center.add_generator(streak_at_risk())
+app.on_startup(notification_center.start)
@@ -0,0 +1,207 @@
+from nicegui import app
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from collections import Counter
+from typing import Dict, List
+import threading
+import time
+
+from activity import ActivityLog, activity_log
+from config import config, settings
+from album_store import AlbumStore, album_store
+from dictionary import API_URL, lookup_cache, lookup_word
+from normalize import WordList, normalizer, word_list
+from sessions import LOCAL_HOSTS
+from text_utils import load_frequency_list
+
+FREQUENT_WORDS = config.prefetch.frequent_words  # top of the frequency list to warm
+POPULAR_QUERIES = config.prefetch.popular_queries
+RECENT_EVENTS = 5000  # how far back the activity log is scanned for popular lookups
+CONCURRENCY = config.prefetch.concurrency
+RATE_PER_SECOND = config.prefetch.rate_per_second  # stays well under the public API's rate limit
+BURST = config.prefetch.burst
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class Prefetcher:
+    # Warms the lookup cache in a background thread at startup, so the first class of the day is not slow
+    def __init__(self, words: WordList = word_list, albums: AlbumStore = album_store,
+                 activity: ActivityLog = activity_log, extra_path: str = 'prefetch_words.txt',
+                 frequent=FREQUENT_WORDS, popular=POPULAR_QUERIES, concurrency=CONCURRENCY,
+                 rate=RATE_PER_SECOND, burst=BURST, api_url=API_URL):
+        self.words = words
+        self.albums = albums
+        self.activity = activity
+        self.extra_path = extra_path
+        self.frequent = frequent
+        self.popular = popular
+        self.concurrency = concurrency
+        self.bucket = TokenBucket(rate, burst)
+        self.api_url = api_url
+        self.sources: Dict[str, List[str]] = {}
+        self.pending = None  # iterator over the keys of the running job
+        self.workers: Dict[int, threading.Thread] = {}  # slot -> worker thread
+        self.progress = {'state': 'idle', 'total': 0, 'done': 0, 'fetched': 0, 'cached': 0, 'failed': 0,
+                         'started_at': None, 'finished_at': None}
+        self.lock = threading.Lock()
+        self.thread = None
+        self.installed = False
+
+    def install(self):
+        # Called once by each entry point before ui.run()
+        if self.installed:
+            return
+        self.installed = True
+        app.on_startup(self.start)
+        app.get('/prefetch', include_in_schema=False)(self.progress_endpoint)
+
+    # Sources --------------------------------------------------------------
+
+    def frequent_words(self) -> List[str]:
+        ranked = sorted((rank, word) for word, rank in self.words.ranks.items()) if self.words.from_file else []
+        return [word for _, word in ranked[:self.frequent]]
+
+    def album_words(self) -> List[str]:
+        with self.albums.lock:
+            return [card['word'] for name in self.albums.keys() for card in self.albums[name]]
+
+    def popular_queries(self) -> List[str]:
+        counts = Counter(event['word'] for event in self.activity.events[-RECENT_EVENTS:]
+                         if event.get('kind') == 'lookup' and event.get('word'))
+        return [word for word, _ in counts.most_common(self.popular)]
+
+    def extra_words(self) -> List[str]:
+        # Optional hand-made list, e.g. this week's vocabulary, in the frequency list format
+        return list(load_frequency_list(self.extra_path))
+
+    def collect(self) -> List[str]:
+        # Most valuable first; each word once, by canonical key; never more than the cache can hold
+        self.sources = {'popular': self.popular_queries(), 'albums': self.album_words(),
+                        'extra': self.extra_words(), 'frequent': self.frequent_words()}
+        keys, seen = [], set()
+        for words in self.sources.values():
+            for word in words:
+                key = normalizer.canonical(word)
+                if key and key not in seen:
+                    seen.add(key)
+                    keys.append(key)
+        return keys[:int(lookup_cache.max_size * 0.8)]
+
+    # Job ------------------------------------------------------------------
+
+    def start(self):
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.thread = threading.Thread(target=self.run, name='dictionary-prefetch', daemon=True)
+        self.thread.start()
+
+    def run(self):
+        keys = self.collect()
+        self.progress.update({'state': 'running', 'total': len(keys), 'done': 0, 'fetched': 0, 'cached': 0,
+                              'failed': 0, 'started_at': time.time(), 'finished_at': None})
+        with self.lock:
+            self.pending = iter(keys)
+        self.spawn()
+        while True:
+            with self.lock:
+                workers = list(self.workers.values())
+            if not workers:
+                break
+            for worker in workers:
+                worker.join()
+        with self.lock:
+            self.pending = None
+        self.progress.update({'state': 'done', 'finished_at': time.time()})
+
+    def set_concurrency(self, concurrency: int):
+        # Hot-reloaded: extra workers join a running job at once, surplus ones stop after their current word
+        self.concurrency = concurrency
+        self.spawn()
+
+    def spawn(self):
+        with self.lock:
+            if self.pending is None:
+                return
+            for slot in range(self.concurrency):
+                if slot not in self.workers:
+                    self.workers[slot] = threading.Thread(target=self.work, args=(slot,),
+                                                          name=f'prefetch-{slot}', daemon=True)
+                    self.workers[slot].start()
+
+    def work(self, slot: int):
+        while True:
+            with self.lock:
+                key = next(self.pending, None) if slot < self.concurrency else None
+                if key is None:
+                    del self.workers[slot]
+                    return
+            self.warm(key)
+
+    def count(self, *names):
+        with self.lock:
+            for name in names:
+                self.progress[name] += 1
+
+    def warm(self, key: str):
+        if key in lookup_cache:
+            self.count('cached', 'done')
+            return
+        try:
+            # One token per upstream request: a miss on the key falls back to the lemma and spelling candidates
+            lookup_word(key, self.api_url, limiter=self.bucket)
+            self.count('fetched', 'done')
+        except Exception:
+            self.count('failed', 'done')
+
+    def coverage(self) -> Dict[str, float]:
+        # Share of each source's words that a lookup would now answer from the cache
+        result = {}
+        for name, words in self.sources.items():
+            keys = [normalizer.canonical(word) for word in words]
+            result[name] = round(sum(key in lookup_cache for key in keys) / len(keys), 3) if keys else 1.0
+        return result
+
+    def report(self) -> Dict:
+        progress = dict(self.progress)
+        if progress['started_at']:
+            elapsed = (progress['finished_at'] or time.time()) - progress['started_at']
+            progress['elapsed_seconds'] = round(elapsed, 1)
+            if progress['state'] == 'running' and progress['done']:
+                progress['eta_seconds'] = round(elapsed / progress['done'] * (progress['total'] - progress['done']), 1)
+        progress['coverage'] = self.coverage()
+        progress['sources'] = {name: len(words) for name, words in self.sources.items()}
+        return progress
+
+    def progress_endpoint(self, request: Request, start: int = 0):
+        # Operators only; /prefetch?start=1 runs the job again (e.g. after updating prefetch_words.txt)
+        if request.client is None or request.client.host not in LOCAL_HOSTS:
+            return JSONResponse({'detail': 'Not Found'}, status_code=404)
+        if start:
+            self.start()
+        return self.report()
+
+
+prefetcher = Prefetcher()
+settings.on_change('prefetch.rate_per_second', lambda rate: setattr(prefetcher.bucket, 'rate', rate))
+settings.on_change('prefetch.burst', lambda burst: setattr(prefetcher.bucket, 'capacity', burst))
+settings.on_change('prefetch.concurrency', prefetcher.set_concurrency)
@@ -0,0 +1,260 @@
+from nicegui import ui
+from array import array
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import threading
+
+from activity import ActivityLog, DEFAULT_USER, activity_log
+
+KINDS = ('lookup', 'flashcard', 'reading', 'dictation', 'review')
+SESSION_GAP = 10 * 60  # events closer than this belong to the same study session
+EVENT_SECONDS = 30  # time credited for an event that starts a session
+MAX_POINTS = 60  # chart points sent to the browser, whatever the range
+GRAINS = {'day': 90, 'week': 52, 'month': 24}  # periods shown per grain
+
+
+def period_of(day: date, grain: str) -> int:
+    # Integer period numbers, so each series is a plain offset into an array
+    if grain == 'day':
+        return day.toordinal()
+    if grain == 'week':
+        return (day.toordinal() - 1) // 7  # ordinal 1 (0001-01-01) is a Monday
+    return day.year * 12 + day.month - 1
+
+
+def period_label(period: int, grain: str) -> str:
+    if grain == 'day':
+        return date.fromordinal(period).strftime('%d %b')
+    if grain == 'week':
+        return date.fromordinal(period * 7 + 1).strftime('%d %b')
+    return date(period // 12, period % 12 + 1, 1).strftime('%b %Y')
+
+
+class Series:
+    # One counter per period in a typed array; periods before the first event are not stored
+    def __init__(self, typecode='I'):
+        self.start: Optional[int] = None
+        self.values = array(typecode)
+
+    def add(self, period: int, amount=1):
+        if self.start is None:
+            self.start = period
+        elif period < self.start:
+            self.values[0:0] = array(self.values.typecode, [0] * (self.start - period))
+            self.start = period
+        index = period - self.start
+        if index >= len(self.values):
+            self.values.extend([0] * (index - len(self.values) + 1))
+        self.values[index] += amount
+
+    def get(self, period: int):
+        if self.start is None or not 0 <= period - self.start < len(self.values):
+            return 0
+        return self.values[period - self.start]
+
+    def window(self, first: int, last: int) -> List:
+        return [self.get(period) for period in range(first, last + 1)]
+
+    def total_until(self, period: int):
+        if self.start is None or period < self.start:
+            return 0
+        return sum(self.values[:period - self.start + 1])
+
+
+class UserProgress:
+    def __init__(self):
+        # grain -> kind -> Series; 'seconds' holds time on task
+        self.rollups: Dict[str, Dict[str, Series]] = {
+            grain: {kind: Series() for kind in KINDS + ('seconds',)} for grain in GRAINS}
+        self.album_cards: Dict[str, Series] = {}  # cards added per day
+        self.album_reviews: Dict[str, Series] = {}
+        self.album_correct: Dict[str, Series] = {}
+        self.last_seen: Optional[datetime] = None
+        self.total_seconds = 0
+
+
+class ProgressTracker:
+    # Rollups are updated per event as it is recorded, so the page only reads a fixed number of periods
+    def __init__(self, activity: ActivityLog = activity_log):
+        self.users: Dict[str, UserProgress] = {}
+        self.lock = threading.Lock()
+        for event in activity.events:
+            self.record(event)
+        activity.on_record(self.record)
+
+    def record(self, event: Dict):
+        kind = event.get('kind')
+        if kind not in KINDS:
+            return
+        try:
+            ts = datetime.fromisoformat(event['ts'])
+        except (KeyError, ValueError):
+            return
+        with self.lock:
+            progress = self.users.setdefault(event.get('user', DEFAULT_USER), UserProgress())
+            seconds = EVENT_SECONDS
+            if progress.last_seen and timedelta(0) <= ts - progress.last_seen <= timedelta(seconds=SESSION_GAP):
+                seconds = int((ts - progress.last_seen).total_seconds())
+            progress.last_seen = max(ts, progress.last_seen or ts)
+            progress.total_seconds += seconds
+
+            day = ts.date()
+            for grain, series in progress.rollups.items():
+                period = period_of(day, grain)
+                series[kind].add(period)
+                series['seconds'].add(period, seconds)
+
+            album = event.get('album')
+            if album and kind == 'flashcard':
+                progress.album_cards.setdefault(album, Series()).add(day.toordinal())
+            elif album and kind == 'review':
+                progress.album_reviews.setdefault(album, Series()).add(day.toordinal())
+                if event.get('correct'):
+                    progress.album_correct.setdefault(album, Series()).add(day.toordinal())
+
+    # Reads ----------------------------------------------------------------
+
+    def periods(self, grain: str, today: Optional[date] = None) -> Tuple[int, int]:
+        last = period_of(today or date.today(), grain)
+        return last - GRAINS[grain] + 1, last
+
+    def activity(self, user: str, grain: str = 'day') -> Dict:
+        first, last = self.periods(grain)
+        with self.lock:
+            progress = self.users.get(user) or UserProgress()
+            series = {kind: progress.rollups[grain][kind].window(first, last) for kind in KINDS + ('seconds',)}
+        return {'labels': [period_label(p, grain) for p in range(first, last + 1)], 'series': series}
+
+    def mastery(self, user: str) -> Dict:
+        # Per album: cards collected so far and, once cards are reviewed, the share answered correctly
+        first, last = self.periods('day')
+        labels = [period_label(p, 'day') for p in range(first, last + 1)]
+        curves = {}
+        with self.lock:
+            progress = self.users.get(user) or UserProgress()
+            for album, cards in progress.album_cards.items():
+                total = cards.total_until(first - 1)
+                cumulative = []
+                for count in cards.window(first, last):
+                    total += count
+                    cumulative.append(total)
+                reviews = progress.album_reviews.get(album)
+                correct = progress.album_correct.get(album)
+                accuracy = None
+                if reviews is not None:
+                    seen = reviews.total_until(last)
+                    accuracy = (correct.total_until(last) if correct else 0) / seen if seen else None
+                curves[album] = {'cards': cumulative, 'accuracy': accuracy}
+        return {'labels': labels, 'albums': curves}
+
+    def summary(self, user: str, today: Optional[date] = None) -> Dict:
+        today = today or date.today()
+        day = today.toordinal()
+        with self.lock:
+            progress = self.users.get(user) or UserProgress()
+            daily = progress.rollups['day']
+            active = lambda period: any(daily[kind].get(period) for kind in KINDS)
+            streak = 0
+            period = day if active(day) else day - 1  # today still counts until it is over
+            while streak < 3650 and active(period):
+                streak += 1
+                period -= 1
+            return {
+                'today_events': sum(daily[kind].get(day) for kind in KINDS),
+                'week_minutes': sum(daily['seconds'].window(day - 6, day)) // 60,
+                'total_minutes': progress.total_seconds // 60,
+                'streak': streak,
+            }
+
+
+def downsample(labels: List[str], values: List, max_points: int = MAX_POINTS, mode: str = 'sum') -> Tuple[List, List]:
+    # Bucket consecutive points so the browser never gets more than max_points per series;
+    # counts are summed (totals stay right), cumulative curves keep the last value of each bucket
+    if len(values) <= max_points:
+        return labels, values
+    size = -(-len(values) // max_points)
+    out_labels, out_values = [], []
+    for start in range(0, len(values), size):
+        bucket = values[start:start + size]
+        out_labels.append(labels[start])
+        out_values.append(sum(bucket) if mode == 'sum' else bucket[-1])
+    return out_labels, out_values
+
+
+progress_tracker = ProgressTracker()
+
+
+class ProgressPage:
+    def __init__(self, tracker: ProgressTracker = progress_tracker, user: str = DEFAULT_USER):
+        self.tracker = tracker
+        self.user = user
+        self.grain = 'day'
+
+    def build(self):
+        with ui.column().classes('p-8 w-full gap-6'):
+            ui.label('Progress').classes('text-3xl font-bold text-gray-800')
+            self.summary_row = ui.row().classes('w-full gap-4')
+            self.show_summary()
+
+            with ui.card().classes('w-full p-4'):
+                with ui.row().classes('w-full items-center justify-between'):
+                    ui.label('Activity').classes('text-lg font-semibold')
+                    ui.toggle({'day': 'Daily', 'week': 'Weekly', 'month': 'Monthly'}, value=self.grain,
+                              on_change=lambda e: self.set_grain(e.value))
+                self.activity_chart = ui.echart(self.activity_options()).classes('w-full h-72')
+
+            with ui.row().classes('w-full gap-6'):
+                with ui.card().classes('flex-1 p-4'):
+                    ui.label('Time on task (minutes)').classes('text-lg font-semibold')
+                    self.time_chart = ui.echart(self.time_options()).classes('w-full h-64')
+                with ui.card().classes('flex-1 p-4'):
+                    ui.label('Flashcard albums').classes('text-lg font-semibold')
+                    ui.echart(self.mastery_options()).classes('w-full h-64')
+
+    def show_summary(self):
+        summary = self.tracker.summary(self.user)
+        self.summary_row.clear()
+        with self.summary_row:
+            for label, value in (('Today', f"{summary['today_events']} activities"),
+                                 ('Last 7 days', f"{summary['week_minutes']} min"),
+                                 ('Total study time', f"{summary['total_minutes']} min"),
+                                 ('Streak', f"{summary['streak']} days")):
+                with ui.card().classes('p-4 min-w-40'):
+                    ui.label(label).classes('text-sm text-gray-500')
+                    ui.label(value).classes('text-2xl font-bold text-indigo-600')
+
+    def set_grain(self, grain: str):
+        self.grain = grain
+        self.activity_chart.options.update(self.activity_options())
+        self.activity_chart.update()
+        self.time_chart.options.update(self.time_options())
+        self.time_chart.update()
+
+    def activity_options(self) -> Dict:
+        data = self.tracker.activity(self.user, self.grain)
+        series = []
+        for kind in KINDS:
+            labels, values = downsample(data['labels'], data['series'][kind])
+            if any(values):
+                series.append({'name': kind.title(), 'type': 'bar', 'stack': 'activity', 'data': values})
+        labels = downsample(data['labels'], data['series']['lookup'])[0]
+        return {'tooltip': {'trigger': 'axis'}, 'legend': {}, 'grid': {'left': 40, 'right': 20, 'bottom': 30},
+                'xAxis': {'type': 'category', 'data': labels}, 'yAxis': {'type': 'value'}, 'series': series}
+
+    def time_options(self) -> Dict:
+        data = self.tracker.activity(self.user, self.grain)
+        labels, values = downsample(data['labels'], data['series']['seconds'])
+        return {'tooltip': {'trigger': 'axis'}, 'grid': {'left': 40, 'right': 20, 'bottom': 30},
+                'xAxis': {'type': 'category', 'data': labels}, 'yAxis': {'type': 'value'},
+                'series': [{'type': 'line', 'smooth': True, 'areaStyle': {}, 'data': [v // 60 for v in values]}]}
+
+    def mastery_options(self) -> Dict:
+        data = self.tracker.mastery(self.user)
+        series, labels = [], data['labels']
+        for album, curve in data['albums'].items():
+            labels, values = downsample(data['labels'], curve['cards'], mode='last')
+            name = album if curve['accuracy'] is None else f"{album} ({curve['accuracy']:.0%} correct)"
+            series.append({'name': name, 'type': 'line', 'data': values})
+        return {'tooltip': {'trigger': 'axis'}, 'legend': {}, 'grid': {'left': 40, 'right': 20, 'bottom': 30},
+                'xAxis': {'type': 'category', 'data': labels}, 'yAxis': {'type': 'value', 'name': 'cards'},
+                'series': series}
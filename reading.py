@@ -0,0 +1,259 @@
+from nicegui import run, ui
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from datetime import datetime
+from html import escape
+import json
+import os
+import threading
+import uuid
+
+from activity import DEFAULT_USER, activity_log
+from config import config, settings
+from dictionary import lookup_cache, lookup_word
+from prefetch import prefetcher
+from text_utils import lemmatize, split_tokens
+
+WORDS_PER_PAGE = 300
+PREFETCH_PER_PAGE = 40  # lemmas warmed per page view, in reading order; readers click only a few
+
+
+class ReadingLibrary:
+    def __init__(self, base_dir='reading', words_per_page=WORDS_PER_PAGE):
+        self.base_dir = base_dir
+        self.words_per_page = words_per_page
+        self.index_path = os.path.join(base_dir, 'index.json')
+        os.makedirs(base_dir, exist_ok=True)
+        self.texts: Dict[str, Dict] = self.load_index()  # id -> {title, pages, words, created}
+        self.lock = threading.Lock()
+        self.prefetcher = ThreadPoolExecutor(max_workers=config.prefetch.reading_concurrency,
+                                             thread_name_prefix='reading-prefetch')
+        self.prefetch_jobs: Dict[str, List[Future]] = {}  # reader (client id) -> lookups queued for its page
+        self.listeners: List[Callable] = []
+
+    def on_import(self, callback: Callable):
+        # callback(text_id) runs after a text has been stored
+        self.listeners.append(callback)
+
+    def load_index(self) -> Dict[str, Dict]:
+        try:
+            with open(self.index_path, 'r') as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def save_index(self):
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w') as file:
+            json.dump(self.texts, file)
+        os.replace(tmp_path, self.index_path)
+
+    def page_path(self, text_id: str, page: int) -> str:
+        return os.path.join(self.base_dir, text_id, f'page_{page:05d}.json')
+
+    def paginate(self, text: str) -> List[List[List[str]]]:
+        # Each page is a list of [token, lemma] pairs; lemma is '' for spaces and punctuation.
+        # Pages break at the first paragraph end after the word budget is reached.
+        pages, page, words = [], [], 0
+        for token, is_word in split_tokens(text):
+            if is_word:
+                page.append([token, lemmatize(token)])
+                words += 1
+            else:
+                page.append([token, ''])
+                if words >= self.words_per_page and ('\n' in token or words >= self.words_per_page * 1.5):
+                    pages.append(page)
+                    page, words = [], 0
+        if page:
+            pages.append(page)
+        return pages
+
+    def import_text(self, title: str, text: str) -> str:
+        # Tokenize once at import and store one file per page
+        text_id = uuid.uuid4().hex[:12]
+        pages = self.paginate(text)
+        os.makedirs(os.path.join(self.base_dir, text_id), exist_ok=True)
+        for number, page in enumerate(pages):
+            with open(self.page_path(text_id, number), 'w') as file:
+                json.dump(page, file)
+        with self.lock:
+            self.texts[text_id] = {
+                'title': title,
+                'pages': len(pages),
+                'words': sum(1 for page in pages for _, lemma in page if lemma),
+                'created': datetime.now().isoformat(timespec='seconds'),
+            }
+            self.save_index()
+        for callback in self.listeners:
+            callback(text_id)
+        return text_id
+
+    def iter_pages(self, text_id: str):
+        for page in range(self.texts[text_id]['pages']):
+            yield self.get_page(text_id, page)
+
+    def get_page(self, text_id: str, page: int) -> Optional[List[List[str]]]:
+        # Reads only the requested page, so opening a text costs the same for any length
+        meta = self.texts.get(text_id)
+        if not meta or not 0 <= page < meta['pages']:
+            return None
+        with open(self.page_path(text_id, page), 'r') as file:
+            return json.load(file)
+
+    def prefetch(self, tokens: List[List[str]], reader: str = ''):
+        # Warm the lookup cache with the first lemmas of a page in the background. Whatever is still queued
+        # for the reader's previous page is dropped, and upstream requests share the prefetcher's rate limit
+        self.cancel_prefetch(reader)
+        lemmas = [lemma for lemma in dict.fromkeys(lemma for _, lemma in tokens if lemma)
+                  if lemma not in lookup_cache][:PREFETCH_PER_PAGE]
+        self.prefetch_jobs[reader] = [self.prefetcher.submit(lookup_word, lemma, limiter=prefetcher.bucket)
+                                      for lemma in lemmas]
+
+    def resize_prefetch(self, workers: int):
+        # Hot-reloaded: new lookups go to a pool of the new size; the old pool still runs what it was given,
+        # so those jobs can be cancelled as before
+        old, self.prefetcher = self.prefetcher, ThreadPoolExecutor(max_workers=workers,
+                                                                   thread_name_prefix='reading-prefetch')
+        old.shutdown(wait=False)
+
+    def cancel_prefetch(self, reader: str = ''):
+        # Only queued lookups are cancelled; one already running finishes and still fills the cache
+        for job in self.prefetch_jobs.pop(reader, ()):
+            job.cancel()
+
+
+reading_library = ReadingLibrary()
+settings.on_change('prefetch.reading_concurrency', reading_library.resize_prefetch)
+
+
+def render_page_html(tokens: List[List[str]]) -> str:
+    parts = ['<p class="mb-3">']
+    for token, lemma in tokens:
+        if lemma:
+            parts.append(f'<span class="reading-word cursor-pointer hover:bg-indigo-100 rounded" '
+                         f'data-lemma="{escape(lemma)}" data-word="{escape(token.lower())}">{escape(token)}</span>')
+        elif token.count('\n') > 1:
+            parts.append('</p><p class="mb-3">')
+        else:
+            parts.append(escape(token))
+    parts.append('</p>')
+    return ''.join(parts)
+
+
+class ReadingPage:
+    def __init__(self, library: ReadingLibrary = reading_library, vocab=None):
+        self.library = library
+        self.vocab = vocab  # optional VocabIndex for difficulty and unknown words
+        self.text_id = None
+        self.page = 0
+        self.reader = ''
+
+    def build(self):
+        # Prefetching for this tab stops when the reader leaves the page
+        client = ui.context.client
+        self.reader = client.id
+        client.on_disconnect(lambda: self.library.cancel_prefetch(self.reader))
+        with ui.row().classes('p-8 w-full gap-6 items-start'):
+            with ui.column().classes('flex-1 gap-4'):
+                ui.label('Reading').classes('text-3xl font-bold text-gray-800')
+                with ui.row().classes('w-full gap-2 items-center'):
+                    self.text_select = ui.select(options=self.text_options(), label='Text',
+                                                 on_change=lambda e: self.open_text(e.value)).classes('flex-grow')
+                self.stats_container = ui.column().classes('w-full gap-1')
+                self.page_container = ui.column().classes('w-full')
+                with ui.row().classes('items-center gap-4'):
+                    ui.button(icon='chevron_left', on_click=lambda: self.show_page(self.page - 1)).props('flat round')
+                    self.page_label = ui.label('')
+                    ui.button(icon='chevron_right', on_click=lambda: self.show_page(self.page + 1)).props('flat round')
+
+                with ui.expansion('Import a text', icon='upload').classes('w-full'):
+                    self.title_input = ui.input(label='Title').classes('w-full')
+                    self.body_input = ui.textarea(label='Paste text here').classes('w-full')
+                    ui.button('Import', on_click=self.import_text).props('rounded').classes('bg-indigo text-white')
+
+            with ui.card().classes('w-80 p-4'):
+                ui.label('Definition').classes('text-lg font-semibold')
+                self.definition_container = ui.column().classes('w-full gap-1')
+                with self.definition_container:
+                    ui.label('Click a word to look it up').classes('text-gray-500')
+
+        # One listener for the whole page instead of one handler per word
+        ui.on('reading_word', self.define_word)
+        ui.add_body_html('''<script>
+            document.addEventListener('click', (e) => {
+                const el = e.target.closest('.reading-word');
+                if (el) emitEvent('reading_word', {lemma: el.dataset.lemma, word: el.dataset.word});
+            });
+        </script>''')
+
+    def text_options(self) -> Dict[str, str]:
+        return {text_id: meta['title'] for text_id, meta in self.library.texts.items()}
+
+    def import_text(self):
+        title = (self.title_input.value or '').strip()
+        body = self.body_input.value or ''
+        if not title or not body.strip():
+            ui.notify('Please enter a title and some text', type='warning')
+            return
+        text_id = self.library.import_text(title, body)
+        self.title_input.value = ''
+        self.body_input.value = ''
+        self.text_select.options = self.text_options()
+        self.text_select.value = text_id
+        self.text_select.update()
+
+    def open_text(self, text_id):
+        if text_id not in self.library.texts:
+            return
+        self.text_id = text_id
+        activity_log.record(DEFAULT_USER, 'reading', f"Opened '{self.library.texts[text_id]['title']}'",
+                            text_id=text_id)
+        self.show_stats()
+        self.show_page(0)
+
+    def show_stats(self):
+        self.stats_container.clear()
+        if self.vocab is None:
+            return
+        score = self.vocab.difficulty(self.text_id)
+        if not score:
+            return
+        with self.stats_container:
+            ui.label(f"{score['words']} words - {score['coverage']:.0%} known - difficulty {score['difficulty']:.2f}") \
+                .classes('text-sm text-gray-500')
+            unknown = self.vocab.unknown_words(self.text_id, limit=30)
+            if unknown:
+                with ui.expansion('Words not learned yet', icon='new_releases').classes('w-full'):
+                    ui.label(', '.join(f"{w['word']} ({w['count']})" for w in unknown)).classes('text-sm text-gray-700')
+
+    def show_page(self, page: int):
+        if self.text_id is None:
+            return
+        tokens = self.library.get_page(self.text_id, page)
+        if tokens is None:
+            return
+        self.page = page
+        self.page_container.clear()
+        with self.page_container:
+            ui.html(render_page_html(tokens)).classes('text-lg leading-relaxed text-gray-800')
+        self.page_label.text = f"Page {page + 1} / {self.library.texts[self.text_id]['pages']}"
+        self.library.prefetch(tokens, self.reader)
+
+    async def define_word(self, e):
+        lemma, word = e.args.get('lemma', ''), e.args.get('word', '')
+        data = await run.io_bound(lookup_word, lemma)
+        if not (isinstance(data, list) and data) and word != lemma:
+            data = await run.io_bound(lookup_word, word)
+
+        self.definition_container.clear()
+        with self.definition_container:
+            if not (isinstance(data, list) and data):
+                ui.label(f"No information found for word: '{word}'").classes('text-red-500')
+                return
+            entry = data[0]
+            ui.label(entry.get('word', lemma)).classes('text-xl font-bold')
+            ui.label(entry.get('phonetic', '')).classes('text-gray-500')
+            for meaning in entry.get('meanings', [])[:3]:
+                ui.label(meaning.get('partOfSpeech', '').capitalize()).classes('font-semibold mt-2')
+                for definition in meaning.get('definitions', [])[:2]:
+                    ui.label(definition.get('definition', '')).classes('text-gray-700 text-sm')
@@ -0,0 +1,115 @@
+from nicegui import app, run
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from activity import DEFAULT_USER, ActivityLog, activity_log
+from album_store import AlbumStore, album_store
+
+BATCH_SIZE = 50  # cards shipped to the browser per review session
+MAX_GRADES = 1000  # per sync request
+MAX_CLOCK_SKEW = timedelta(minutes=5)
+GRADES = ('again', 'hard', 'good', 'easy')
+
+
+def parse_time(value: str) -> Optional[datetime]:
+    # Browsers send Date.toISOString(), i.e. UTC with a "Z" suffix
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def schedule(card: Dict, grade: str, reviewed_at: datetime) -> Dict:
+    # A small SM-2 variant: the interval grows by the card's ease, "again" starts over
+    interval, ease = card.get('interval', 0), card.get('ease', 2.5)
+    if grade == 'again':
+        interval, ease = 0, max(1.3, ease - 0.2)
+    elif grade == 'hard':
+        interval, ease = max(1, round(interval * 1.2)), max(1.3, ease - 0.15)
+    elif grade == 'good':
+        interval = 1 if interval == 0 else 3 if interval == 1 else round(interval * ease)
+    else:
+        interval, ease = (2 if interval == 0 else round(max(interval, 1) * ease * 1.3)), ease + 0.15
+    return {
+        'interval': interval,
+        'ease': round(ease, 2),
+        'due': (reviewed_at.date() + timedelta(days=interval)).isoformat(),
+        # Full precision: a retried grade must compare equal to the stored one and count as stale
+        'reviewed_at': reviewed_at.isoformat(),
+        'reps': card.get('reps', 0) + 1,
+    }
+
+
+class ReviewService:
+    def __init__(self, albums: AlbumStore = album_store, activity: ActivityLog = activity_log):
+        self.albums = albums
+        self.activity = activity
+
+    def due_cards(self, album_name: str, limit: int = BATCH_SIZE, today: Optional[date] = None) -> List[Dict]:
+        # Overdue cards first, then new ones (no due date yet); only what the browser needs to show
+        today = (today or date.today()).isoformat()
+        if album_name not in self.albums:
+            return []
+        with self.albums.lock:
+            due = [card for card in self.albums[album_name] if card.get('due', '') <= today]
+        due.sort(key=lambda card: card.get('due', today))
+        return [{'word': card['word'], 'phonetic': card.get('phonetic', ''),
+                 'definitions': [d.get('definition', '') for d in card.get('definitions', [])[:3]]}
+                for card in due[:limit]]
+
+    def apply(self, album_name: str, grades: List[Dict], user: str = DEFAULT_USER) -> Dict:
+        # Grades from several devices may overlap, and review.js retries lost uploads: each card keeps the
+        # review with the latest reviewed_at, anything not newer (including a resent grade) is stale
+        result = {'applied': 0, 'stale': 0, 'invalid': 0}
+        now = datetime.now(timezone.utc)
+        entries, events = [], []
+        for grade in grades[:MAX_GRADES]:
+            reviewed_at = parse_time(grade.get('reviewed_at')) if isinstance(grade, dict) else None
+            # Timestamps too far in the future are rejected rather than clamped: a clamped value moves
+            # with the server clock, so a retry of the same grade would look newer and apply twice
+            if reviewed_at is None or reviewed_at > now + MAX_CLOCK_SKEW or grade.get('grade') not in GRADES \
+                    or not grade.get('word'):
+                result['invalid'] += 1
+                continue
+            entries.append((reviewed_at, grade['word'], grade['grade']))
+
+        for reviewed_at, word, grade in sorted(entries):
+            with self.albums.lock:
+                card = self.albums.get_card(album_name, word)
+                if card is None:
+                    result['invalid'] += 1
+                    continue
+                last = parse_time(card.get('reviewed_at', ''))
+                if last is not None and reviewed_at <= last:
+                    result['stale'] += 1
+                    continue
+                self.albums.update_card(album_name, word, schedule(card, grade, reviewed_at))
+            result['applied'] += 1
+            events.append({'user': user, 'kind': 'review', 'title': f"Reviewed '{word}' ({grade})",
+                           'album': album_name, 'word': word, 'grade': grade, 'correct': grade != 'again'})
+        # One append to the activity log per sync, not one per grade
+        if events:
+            self.activity.record_many(events)
+        return result
+
+
+review_service = ReviewService()
+
+
+@app.post('/api/review/sync')
+async def sync_reviews(request: Request):
+    # One request per batch of grades instead of one websocket message per card flip
+    try:
+        payload = await request.json()
+    except ValueError:
+        return JSONResponse({'detail': 'Invalid JSON'}, status_code=400)
+    if not isinstance(payload, dict) or not isinstance(payload.get('grades'), list):
+        return JSONResponse({'detail': 'Expected {album, grades}'}, status_code=400)
+    album_name = str(payload.get('album', ''))
+    if album_name not in album_store:
+        return JSONResponse({'detail': 'Unknown album'}, status_code=404)
+    # Up to MAX_GRADES card updates plus the activity append: keep them off the event loop
+    return await run.io_bound(review_service.apply, album_name, payload['grades'])
@@ -0,0 +1,120 @@
+from typing import Dict, List
+import re
+import sqlite3
+import threading
+
+from activity import ActivityLog, activity_log
+from album_store import AlbumStore, album_store
+from dictionary import LookupCache, lookup_cache
+from reading import ReadingLibrary, reading_library
+
+QUERY_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+# Where each result type links to in the dashboard
+KIND_URLS = {'word': '/dictionary', 'card': '/flashcard', 'text': '/reading', 'activity': '/process'}
+KIND_ORDER = ['word', 'card', 'text', 'activity']
+
+
+class SearchIndex:
+    # In-process SQLite FTS5 index over words, flashcards, reading texts and activity
+    def __init__(self):
+        self.conn = sqlite3.connect(':memory:', check_same_thread=False)
+        self.lock = threading.Lock()
+        self.conn.executescript('''
+            CREATE TABLE docs (id INTEGER PRIMARY KEY, kind TEXT NOT NULL, key TEXT NOT NULL,
+                               owner TEXT NOT NULL DEFAULT '', UNIQUE (kind, key));
+            CREATE VIRTUAL TABLE items USING fts5(title, body, tokenize='unicode61 remove_diacritics 2',
+                                                  prefix='1 2 3');
+        ''')
+
+    def upsert(self, kind: str, key: str, title: str, body: str = '', owner: str = ''):
+        # Incremental write: one row per (kind, key), replaced in place
+        with self.lock, self.conn:
+            row = self.conn.execute('SELECT id FROM docs WHERE kind = ? AND key = ?', (kind, key)).fetchone()
+            if row:
+                doc_id = row[0]
+                self.conn.execute('DELETE FROM items WHERE rowid = ?', (doc_id,))
+            else:
+                doc_id = self.conn.execute('INSERT INTO docs (kind, key, owner) VALUES (?, ?, ?)',
+                                           (kind, key, owner)).lastrowid
+            self.conn.execute('INSERT INTO items (rowid, title, body) VALUES (?, ?, ?)', (doc_id, title, body))
+
+    def remove(self, kind: str, key: str):
+        with self.lock, self.conn:
+            row = self.conn.execute('SELECT id FROM docs WHERE kind = ? AND key = ?', (kind, key)).fetchone()
+            if row:
+                self.conn.execute('DELETE FROM items WHERE rowid = ?', (row[0],))
+                self.conn.execute('DELETE FROM docs WHERE id = ?', (row[0],))
+
+    def search(self, query: str, owner: str = '', per_kind: int = 5) -> Dict[str, List[Dict]]:
+        # Prefix match on every typed token, ranked with bm25 (title weighted higher than body)
+        tokens = QUERY_TOKEN_RE.findall(query.lower())
+        # A single letter matches almost everything; wait for the second one
+        if not tokens or len(''.join(tokens)) < 2:
+            return {}
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        with self.lock:
+            rows = self.conn.execute('''
+                SELECT ranked.kind, ranked.key, items.title, snippet(items, 1, '', '', '...', 8)
+                FROM items JOIN (
+                    SELECT docs.id AS doc_id, docs.kind AS kind, docs.key AS key,
+                           ROW_NUMBER() OVER (PARTITION BY docs.kind ORDER BY bm25(items, 5.0, 1.0)) AS position
+                    FROM items JOIN docs ON docs.id = items.rowid
+                    WHERE items MATCH ? AND docs.owner IN ('', ?)
+                ) AS ranked ON items.rowid = ranked.doc_id
+                WHERE items MATCH ? AND ranked.position <= ?
+                ORDER BY ranked.kind, ranked.position
+            ''', (match, owner, match, per_kind)).fetchall()
+
+        results: Dict[str, List[Dict]] = {}
+        for kind, key, title, snippet in rows:
+            results.setdefault(kind, []).append({'key': key, 'title': title, 'snippet': snippet,
+                                                 'url': KIND_URLS.get(kind, '/')})
+        return {kind: results[kind] for kind in KIND_ORDER if kind in results}
+
+    # Sources --------------------------------------------------------------
+
+    def add_word(self, key: str, data):
+        if not (isinstance(data, list) and data):
+            return
+        entry = data[0]
+        definitions = [d.get('definition', '') for m in entry.get('meanings', []) for d in m.get('definitions', [])]
+        self.upsert('word', key, entry.get('word', key), ' '.join(definitions[:5]))
+
+    def card_changed(self, album_name: str, card: Dict, added: bool):
+        key = f"{album_name}/{card['word']}"
+        if not added:
+            self.remove('card', key)
+            return
+        definitions = ' '.join(d.get('definition', '') for d in card.get('definitions', [])[:3])
+        self.upsert('card', key, card['word'], f'{album_name}: {definitions}')
+
+    def add_text(self, library: ReadingLibrary, text_id: str):
+        body = ''.join(token for page in library.iter_pages(text_id) for token, _ in page)
+        self.upsert('text', text_id, library.texts[text_id]['title'], body)
+
+    def add_activity(self, event: Dict):
+        self.upsert('activity', str(event['id']), event['title'], f"{event['kind']} {event['ts']}", owner=event['user'])
+
+    def attach(self, cache: LookupCache = lookup_cache, albums: AlbumStore = album_store,
+               library: ReadingLibrary = reading_library, activity: ActivityLog = activity_log):
+        # Index what already exists, then keep up to date through the stores' listeners
+        with cache.lock:
+            entries = list(cache.entries.items())
+        for key, data in entries:
+            self.add_word(key, data)
+        for album_name in list(albums.keys()):
+            for card in list(albums[album_name]):
+                self.card_changed(album_name, card, True)
+        for text_id in list(library.texts):
+            self.add_text(library, text_id)
+        for event in list(activity.events):
+            self.add_activity(event)
+
+        cache.on_set(self.add_word)
+        albums.on_card_change(self.card_changed)
+        library.on_import(lambda text_id: self.add_text(library, text_id))
+        activity.on_record(self.add_activity)
+
+
+search_index = SearchIndex()
+search_index.attach()
@@ -0,0 +1,172 @@
+from nicegui import Client, app, ui
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from typing import Dict
+import asyncio
+import sys
+import time
+
+from config import config, settings
+
+IDLE_DOWNGRADE_SECONDS = config.sessions.idle_downgrade_seconds  # idle clients lose their element tree after this
+IDLE_REAP_SECONDS = config.sessions.idle_reap_seconds  # and are removed entirely after this
+SWEEP_SECONDS = 60
+ACTIVITY_THROTTLE_MS = 30 * 1000
+LOCAL_HOSTS = {'127.0.0.1', '::1', 'localhost'}
+
+# Sends at most one activity ping per throttle window while the user types, clicks or scrolls
+ACTIVITY_JS = f'''
+if (!window.mymyActivity) {{
+    window.mymyActivity = true;
+    let last = 0;
+    const ping = () => {{
+        const now = Date.now();
+        if (now - last > {ACTIVITY_THROTTLE_MS}) {{ last = now; emitEvent('mymy_activity'); }}
+    }};
+    ['click', 'keydown', 'scroll', 'pointermove'].forEach(t => document.addEventListener(t, ping, {{passive: true}}));
+}}
+'''
+
+
+def approx_size(obj, depth=2) -> int:
+    # Shallow recursive sys.getsizeof; good enough to compare clients, not an exact figure
+    size = sys.getsizeof(obj)
+    if depth <= 0:
+        return size
+    if isinstance(obj, dict):
+        size += sum(approx_size(k, depth - 1) + approx_size(v, depth - 1) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(approx_size(item, depth - 1) for item in obj)
+    return size
+
+
+def element_size(element) -> int:
+    return approx_size(element._props) + approx_size(element._classes) + approx_size(element._style) + \
+        approx_size(getattr(element, '_text', None) or '') + sys.getsizeof(element)
+
+
+class SessionManager:
+    def __init__(self, idle_downgrade=IDLE_DOWNGRADE_SECONDS, idle_reap=IDLE_REAP_SECONDS, sweep=SWEEP_SECONDS):
+        self.idle_downgrade = idle_downgrade
+        self.idle_reap = idle_reap
+        self.sweep_seconds = sweep
+        self.sessions: Dict[str, Dict] = {}  # client id -> bookkeeping
+        self.reaped = 0
+        self.downgraded = 0
+        self.task = None
+        self.installed = False
+
+    def install(self):
+        # Called once by each entry point before ui.run()
+        if self.installed:
+            return
+        self.installed = True
+        app.on_connect(self.connected)
+        app.on_disconnect(self.disconnected)
+        app.on_startup(self.start)
+        app.get('/sessions', include_in_schema=False)(self.totals_endpoint)
+
+    def connected(self, client: Client):
+        now = time.monotonic()
+        session = self.sessions.get(client.id)
+        if session is None:
+            # First connect right after the page was built: one activity listener per client. Reconnects
+            # (flaky wifi, laptop sleep) reuse it; the page layout keeps it even when the content is downgraded
+            session = self.sessions[client.id] = {'connected_at': now, 'downgraded': False}
+            with client:
+                ui.on('mymy_activity', lambda: self.touch(client.id))
+        session.update({'last_active': now, 'route': client.page.path, 'connected': True})
+        client.run_javascript(ACTIVITY_JS)
+
+    def disconnected(self, client: Client):
+        if client.id in self.sessions:
+            self.sessions[client.id]['connected'] = False
+
+    def touch(self, client_id: str):
+        if client_id in self.sessions:
+            self.sessions[client_id]['last_active'] = time.monotonic()
+
+    def measure(self, client: Client) -> Dict:
+        elements = list(client.elements.values())
+        # Sample at most 200 elements and extrapolate, so the sweep stays cheap on huge pages
+        step = max(len(elements) // 200, 1)
+        sample = elements[::step]
+        average = sum(element_size(e) for e in sample) / len(sample) if sample else 0
+        return {'elements': len(elements), 'approx_bytes': int(average * len(elements))}
+
+    def downgrade(self, client: Client):
+        # Drop the page's element tree but keep the connection, with a way back
+        client.content.clear()
+        with client.content:
+            with ui.column().classes('w-full items-center p-8 gap-4'):
+                ui.label('This page was paused after a period of inactivity.').classes('text-gray-600')
+                ui.button('Reload', on_click=lambda: ui.run_javascript('location.reload()')) \
+                    .props('rounded').classes('bg-indigo text-white')
+        self.sessions[client.id]['downgraded'] = True
+        self.downgraded += 1
+
+    def reap(self, client: Client):
+        self.sessions.pop(client.id, None)
+        if hasattr(client, 'delete'):
+            client.delete()
+        else:
+            client.remove_all_elements()
+            Client.instances.pop(client.id, None)
+        self.reaped += 1
+
+    def sweep(self):
+        now = time.monotonic()
+        for client in list(Client.instances.values()):
+            session = self.sessions.get(client.id)
+            if session is None:
+                continue
+            idle = now - session['last_active']
+            if idle > self.idle_reap:
+                self.reap(client)
+            elif idle > self.idle_downgrade and not session['downgraded']:
+                self.downgrade(client)
+        # Forget clients NiceGUI already removed on its own
+        for client_id in list(self.sessions):
+            if client_id not in Client.instances:
+                del self.sessions[client_id]
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.sweep_seconds)
+            self.sweep()
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.get_running_loop().create_task(self.run())
+
+    def totals(self) -> Dict:
+        now = time.monotonic()
+        totals = {'clients': 0, 'connected': 0, 'idle': 0, 'downgraded': 0, 'elements': 0, 'approx_bytes': 0,
+                  'reaped_total': self.reaped, 'downgraded_total': self.downgraded, 'routes': {}}
+        for client in list(Client.instances.values()):
+            session = self.sessions.get(client.id)
+            if session is None:
+                continue
+            stats = self.measure(client)
+            totals['clients'] += 1
+            totals['connected'] += session['connected']
+            totals['idle'] += now - session['last_active'] > self.idle_downgrade
+            totals['downgraded'] += session['downgraded']
+            totals['elements'] += stats['elements']
+            totals['approx_bytes'] += stats['approx_bytes']
+            route = totals['routes'].setdefault(session['route'], {'clients': 0, 'elements': 0, 'approx_bytes': 0})
+            route['clients'] += 1
+            route['elements'] += stats['elements']
+            route['approx_bytes'] += stats['approx_bytes']
+        return totals
+
+    def totals_endpoint(self, request: Request):
+        # Operators only: the numbers are served to local requests
+        if request.client is None or request.client.host not in LOCAL_HOSTS:
+            return JSONResponse({'detail': 'Not Found'}, status_code=404)
+        return self.totals()
+
+
+session_manager = SessionManager()
+settings.on_change('sessions.idle_downgrade_seconds', lambda seconds: setattr(session_manager, 'idle_downgrade', seconds))
+settings.on_change('sessions.idle_reap_seconds', lambda seconds: setattr(session_manager, 'idle_reap', seconds))
@@ -0,0 +1,144 @@
+// Offline flashcard review: the server ships the due cards once, the session runs in the browser
+// and grades go back as one batched POST. Pending grades survive reloads in localStorage.
+(function () {
+    const SYNC_URL = '/api/review/sync';
+    const SYNC_EVERY = 10; // grades collected before a background sync
+    const KEYS = {'1': 'again', '2': 'hard', '3': 'good', '4': 'easy'};
+
+    function storageKey(album) {
+        return 'mymy-review:' + album;
+    }
+
+    function load(album) {
+        try {
+            return JSON.parse(localStorage.getItem(storageKey(album))) || {cards: [], position: 0, pending: []};
+        } catch (e) {
+            return {cards: [], position: 0, pending: []};
+        }
+    }
+
+    function save(album, state) {
+        localStorage.setItem(storageKey(album), JSON.stringify(state));
+    }
+
+    let session = null;
+
+    function sync(album, useBeacon) {
+        album = album || (session && session.album);
+        if (!album) return Promise.resolve();
+        const state = load(album);
+        if (!state.pending.length || !navigator.onLine) return Promise.resolve();
+        const grades = state.pending.slice(0, 1000);
+        const body = JSON.stringify({album: album, grades: grades});
+        if (useBeacon && navigator.sendBeacon) {
+            // Page is going away: the beacon is queued by the browser, drop what it carries
+            if (navigator.sendBeacon(SYNC_URL, new Blob([body], {type: 'application/json'}))) {
+                state.pending = state.pending.slice(grades.length);
+                save(album, state);
+            }
+            return Promise.resolve();
+        }
+        return fetch(SYNC_URL, {method: 'POST', headers: {'Content-Type': 'application/json'}, body: body})
+            .then(function (response) {
+                // 4xx means the server will never take these grades; anything else is retried later
+                if (response.ok || (response.status >= 400 && response.status < 500)) {
+                    const current = load(album);
+                    current.pending = current.pending.slice(grades.length);
+                    save(album, current);
+                }
+            })
+            .catch(function () {});
+    }
+
+    function render() {
+        const root = document.getElementById(session.element);
+        if (!root) return;
+        const state = load(session.album);
+        const card = state.cards[state.position];
+        root.innerHTML = '';
+        if (!card) {
+            root.innerHTML = '<div class="mymy-review-done">All due cards reviewed'
+                + (state.pending.length ? ' &middot; syncing&hellip;' : '') + '</div>';
+            sync(session.album);
+            return;
+        }
+        const box = document.createElement('div');
+        box.className = 'mymy-review-card' + (session.revealed ? ' mymy-review-revealed' : '');
+        box.innerHTML = '<div class="mymy-review-progress"></div><div class="mymy-review-word"></div>'
+            + '<div class="mymy-review-phonetic"></div><ol class="mymy-review-definitions"></ol>'
+            + '<div class="mymy-review-actions"></div>';
+        box.querySelector('.mymy-review-progress').textContent = (state.position + 1) + ' / ' + state.cards.length;
+        box.querySelector('.mymy-review-word').textContent = card.word;
+        box.querySelector('.mymy-review-phonetic').textContent = card.phonetic || '';
+        const list = box.querySelector('.mymy-review-definitions');
+        (card.definitions || []).forEach(function (text) {
+            const item = document.createElement('li');
+            item.textContent = text;
+            list.appendChild(item);
+        });
+        const actions = box.querySelector('.mymy-review-actions');
+        if (!session.revealed) {
+            actions.appendChild(button('Show answer (space)', 'mymy-review-show', reveal));
+        } else {
+            Object.keys(KEYS).forEach(function (key) {
+                const grade = KEYS[key];
+                actions.appendChild(button(grade + ' (' + key + ')', 'mymy-review-grade mymy-review-' + grade,
+                    function () { answer(grade); }));
+            });
+        }
+        root.appendChild(box);
+    }
+
+    function button(label, className, onClick) {
+        const element = document.createElement('button');
+        element.className = className;
+        element.textContent = label;
+        element.addEventListener('click', onClick);
+        return element;
+    }
+
+    function reveal() {
+        session.revealed = true;
+        render();
+    }
+
+    function answer(grade) {
+        const state = load(session.album);
+        const card = state.cards[state.position];
+        if (!card) return;
+        state.pending.push({word: card.word, grade: grade, reviewed_at: new Date().toISOString()});
+        state.position += 1;
+        save(session.album, state);
+        session.revealed = false;
+        if (state.pending.length >= SYNC_EVERY) sync(session.album);
+        render();
+    }
+
+    function onKey(event) {
+        if (!session || event.target.closest('input, textarea')) return;
+        if (event.key === ' ' && !session.revealed) {
+            event.preventDefault();
+            reveal();
+        } else if (session.revealed && KEYS[event.key]) {
+            answer(KEYS[event.key]);
+        }
+    }
+
+    function start(album, cards, element) {
+        // A new batch replaces finished cards but keeps grades that have not reached the server yet
+        const state = load(album);
+        save(album, {cards: cards, position: 0, pending: state.pending});
+        session = {album: album, element: element, revealed: false};
+        render();
+        sync(album);
+    }
+
+    document.addEventListener('keydown', onKey);
+    window.addEventListener('online', function () { sync(); });
+    document.addEventListener('visibilitychange', function () {
+        if (document.visibilityState === 'hidden') sync(null, true);
+    });
+    window.addEventListener('pagehide', function () { sync(null, true); });
+
+    window.mymyReview = {start: start, sync: sync};
+})();
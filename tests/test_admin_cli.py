@@ -0,0 +1,32 @@
+import json
+
+import pytest
+
+pytest.importorskip('nicegui')
+
+
+@pytest.fixture
+def modules(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    import admin_cli
+    import auth
+    return admin_cli, auth
+
+
+def record(username):
+    return {'username': username, 'fullname': username.title(), 'email': f'{username}@school.test',
+            'birthdate': '2005-01-01', 'password_hash': 'hash'}
+
+
+def test_rows_rejected_at_write_time_are_not_counted_as_imported(modules, tmp_path):
+    admin_cli, auth = modules
+    path = str(tmp_path / 'users.json')
+    db = auth.UserDatabase(path)
+    # Another process creates alice after this one loaded the file, so only add_users sees the duplicate
+    other = auth.UserDatabase(path)
+    other.add_user(auth.User(**record('alice')))
+
+    source = tmp_path / 'students.jsonl'
+    source.write_text(''.join(json.dumps(record(name)) + '\n' for name in ('alice', 'bob')))
+    assert admin_cli.import_users(db, str(source), workers=1) == {'imported': 1, 'skipped': 1}
+    assert sorted(db.users) == ['alice', 'bob']
@@ -0,0 +1,48 @@
+import os
+
+import pytest
+
+pytest.importorskip('nicegui')
+fastapi = pytest.importorskip('fastapi')
+from fastapi.testclient import TestClient
+
+from assets import StaticAssets
+
+
+@pytest.fixture
+def client(tmp_path):
+    (tmp_path / 'site.css').write_text('body { color: #111; }\n' * 100)
+    assets = StaticAssets(str(tmp_path))
+    api = fastapi.FastAPI()
+    api.get('/static/{name:path}')(assets.serve)
+    return TestClient(api), assets
+
+
+def test_first_request_without_if_none_match(client):
+    test_client, assets = client
+    response = test_client.get(assets.url('site.css'))
+    assert response.status_code == 200
+    assert response.headers['etag']
+    assert 'immutable' in response.headers['cache-control']
+
+
+def test_matching_etag_returns_304(client):
+    test_client, assets = client
+    etag = test_client.get('/static/site.css').headers['etag']
+    assert test_client.get('/static/site.css', headers={'If-None-Match': etag}).status_code == 304
+    assert test_client.get('/static/site.css', headers={'If-None-Match': '"other"'}).status_code == 200
+
+
+def test_precompressed_variant_is_served(client):
+    test_client, assets = client
+    assets.precompress_all()
+    assert os.path.exists(os.path.join(assets.directory, 'site.css.gz'))
+    response = test_client.get('/static/site.css', headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['content-encoding'] == 'gzip'
+    assert response.text.startswith('body')
+
+
+def test_path_outside_directory_is_404(client):
+    test_client, _ = client
+    assert test_client.get('/static/..%2Fsecret.txt').status_code == 404
@@ -0,0 +1,26 @@
+import pytest
+
+pytest.importorskip('nicegui')
+
+
+@pytest.fixture
+def audit(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    from auth import audit
+    return audit
+
+
+def test_unknown_identifiers_are_hashed(audit):
+    marker = audit.unknown_account(' Alice@School.test ')
+    assert 'alice' not in marker and '@' not in marker
+    assert marker == audit.unknown_account('alice@school.test')
+    assert marker != audit.unknown_account('bob@school.test')
+
+
+def test_events_are_found_by_username(audit, tmp_path):
+    log = audit.AuthAuditLog(filepath=str(tmp_path / 'auth_events.jsonl'))
+    log.log('login', 'alice', True)
+    log.log('login', audit.unknown_account('nobody@school.test'), False, reason='unknown_account')
+    log.close()
+    assert [record['event'] for record in log.recent('alice')] == ['login']
+    assert not any('nobody' in account for account in log.recent_events)
@@ -0,0 +1,48 @@
+import pytest
+
+pytest.importorskip('nicegui')
+
+
+@pytest.fixture
+def auth(tmp_path, monkeypatch):
+    # The auth package opens its audit log and user store in the working directory on import
+    monkeypatch.chdir(tmp_path)
+    import auth
+    return auth
+
+
+def make_user(auth, username, password_hash='old-hash'):
+    return auth.User(username, username.title(), f'{username}@school.test', '2005-01-01', password_hash=password_hash)
+
+
+def test_update_survives_a_rewrite_by_another_process(auth, tmp_path):
+    path = str(tmp_path / 'users.json')
+    first = auth.UserDatabase(path)
+    first.add_user(make_user(auth, 'alice'))
+    first.flush()
+    second = auth.UserDatabase(path)
+
+    # The other process rewrites users.json while this one changes the password in memory
+    second.add_users([make_user(auth, 'bob')])
+    user = first.find_user_by_username('alice')
+    user.password_hash = 'new-hash'
+    first.update_user(user)
+
+    assert first.find_user_by_username('alice').password_hash == 'new-hash'
+    first.flush()
+    assert auth.UserDatabase(path).users['alice'].password_hash == 'new-hash'
+    second.refresh(force=True)
+    assert second.users['alice'].password_hash == 'new-hash'
+    assert 'bob' in first.users
+
+
+def test_reset_token_is_single_use_across_stores(auth, tmp_path):
+    path = str(tmp_path / 'users.json')
+    first = auth.UserDatabase(path)
+    first.add_user(make_user(auth, 'alice'))
+    token = auth.ResetTokens(first).issue('alice')
+
+    other = auth.ResetTokens(auth.UserDatabase(path))
+    assert other.peek(token) == 'alice'
+    assert other.consume(token) == 'alice'
+    assert auth.ResetTokens(first).consume(token) is None
@@ -0,0 +1,33 @@
+import pytest
+
+pytest.importorskip('nicegui')
+
+
+@pytest.fixture
+def dictation(tmp_path, monkeypatch):
+    # The module creates its exercise and audio directories in the working directory on import
+    monkeypatch.chdir(tmp_path)
+    import dictation
+    return dictation
+
+
+def ops_of(alignment):
+    return [(op['op'], op['expected'], op['answer']) for op in alignment]
+
+
+def test_shifted_answer_keeps_the_common_word(dictation):
+    # Two substitutions and a gap on each side cost the same; the gaps keep "sat" as a correct word
+    alignment = dictation.align_words(['the', 'sat'], ['sat', 'down'])
+    assert ops_of(alignment) == [('missing', 'the', ''), ('equal', 'sat', 'sat'), ('extra', '', 'down')]
+
+
+def test_misspelling_is_a_substitution(dictation):
+    alignment = dictation.align_words(['the', 'cat', 'sat'], ['the', 'cta', 'sat'])
+    assert ops_of(alignment) == [('equal', 'the', 'the'), ('replace', 'cat', 'cta'), ('equal', 'sat', 'sat')]
+
+
+def test_grade_counts_the_kept_word(dictation):
+    result = dictation.grade_answer('The sat.', 'sat down')
+    assert result['correct'] == 1
+    assert result['errors'] == 2
+    assert result['score'] == 0.5
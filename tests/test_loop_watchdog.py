@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip('nicegui')
+
+from loop_watchdog import LoopWatchdog
+
+
+def test_concurrent_handlers_keep_their_own_tag():
+    watchdog = LoopWatchdog()
+    seen = {}
+
+    def make(name):
+        @watchdog.tracked(name)
+        async def handler():
+            await asyncio.sleep(0)  # the other handler starts in between
+            seen[name] = watchdog.running_context()['handler']
+        return handler
+
+    async def main():
+        watchdog.loop = asyncio.get_running_loop()
+        await asyncio.gather(make('first')(), make('second')())
+
+    asyncio.run(main())
+    assert seen == {'first': 'first', 'second': 'second'}
+    assert watchdog.task_tags == {}
+
+
+def test_sync_handler_inside_async_handler_wins():
+    watchdog = LoopWatchdog()
+
+    @watchdog.tracked('inner')
+    def inner():
+        return watchdog.running_context()['handler']
+
+    @watchdog.tracked('outer')
+    async def outer():
+        return inner(), watchdog.running_context()['handler']
+
+    async def main():
+        watchdog.loop = asyncio.get_running_loop()
+        return await outer()
+
+    assert asyncio.run(main()) == ('inner', 'outer')
@@ -0,0 +1,28 @@
+import pytest
+
+pytest.importorskip('nicegui')
+
+
+@pytest.fixture
+def center(tmp_path, monkeypatch):
+    # The activity log and album store behind the generators live in the working directory
+    monkeypatch.chdir(tmp_path)
+    from notifications import NotificationCenter
+    return NotificationCenter()
+
+
+def test_unchanged_text_is_not_pushed_again_after_reading(center):
+    for _ in range(3):
+        center.push('alice', '3 flashcards due for review', key='flashcards_due')
+        center.mark_all_read('alice')
+    assert len(center.items('alice')) == 1
+    assert center.unread_count('alice') == 0
+
+
+def test_changed_text_is_pushed(center):
+    center.push('alice', '3 flashcards due for review', key='flashcards_due')
+    center.mark_all_read('alice')
+    center.push('alice', '4 flashcards due for review', key='flashcards_due')
+    assert [item['text'] for item in center.items('alice')] == ['4 flashcards due for review',
+                                                                '3 flashcards due for review']
+    assert center.unread_count('alice') == 1
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip('nicegui')
+
+from album_store import AlbumStore
+from review import ReviewService
+
+
+class FakeActivity:
+    def __init__(self):
+        self.events = []
+        self.batches = 0
+
+    def record_many(self, entries):
+        self.batches += 1
+        self.events.extend(entries)
+        return entries
+
+
+@pytest.fixture
+def service():
+    albums = AlbumStore()
+    albums.add_card('Verbs', {'word': 'run', 'definitions': []})
+    return ReviewService(albums, FakeActivity())
+
+
+def iso_ms(moment):
+    # Same shape as Date.toISOString() in the browser
+    return moment.astimezone(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+def test_same_batch_twice_is_applied_once(service):
+    grades = [{'word': 'run', 'grade': 'good', 'reviewed_at': iso_ms(datetime.now(timezone.utc))}]
+    assert service.apply('Verbs', grades)['applied'] == 1
+    card = dict(service.albums.get_card('Verbs', 'run'))
+
+    assert service.apply('Verbs', grades) == {'applied': 0, 'stale': 1, 'invalid': 0}
+    assert service.albums.get_card('Verbs', 'run') == card
+    assert card['reps'] == 1 and card['interval'] == 1
+    assert len(service.activity.events) == 1
+
+
+def test_duplicate_grade_inside_one_batch(service):
+    grade = {'word': 'run', 'grade': 'easy', 'reviewed_at': iso_ms(datetime.now(timezone.utc))}
+    assert service.apply('Verbs', [grade, dict(grade)]) == {'applied': 1, 'stale': 1, 'invalid': 0}
+
+
+def test_newer_grade_wins(service):
+    now = datetime.now(timezone.utc)
+    service.apply('Verbs', [{'word': 'run', 'grade': 'good', 'reviewed_at': iso_ms(now)}])
+    older = {'word': 'run', 'grade': 'again', 'reviewed_at': iso_ms(now - timedelta(minutes=1))}
+    newer = {'word': 'run', 'grade': 'good', 'reviewed_at': iso_ms(now + timedelta(milliseconds=5))}
+    assert service.apply('Verbs', [older, newer]) == {'applied': 1, 'stale': 1, 'invalid': 0}
+    assert service.albums.get_card('Verbs', 'run')['reps'] == 2
+
+
+def test_far_future_grade_is_rejected(service):
+    future = iso_ms(datetime.now(timezone.utc) + timedelta(hours=1))
+    result = service.apply('Verbs', [{'word': 'run', 'grade': 'good', 'reviewed_at': future}])
+    assert result == {'applied': 0, 'stale': 0, 'invalid': 1}
+
+
+def test_activity_is_recorded_once_per_sync(service):
+    service.albums.add_card('Verbs', {'word': 'walk', 'definitions': []})
+    now = iso_ms(datetime.now(timezone.utc))
+    grades = [{'word': word, 'grade': 'good', 'reviewed_at': now} for word in ('run', 'walk')]
+    assert service.apply('Verbs', grades)['applied'] == 2
+    assert service.activity.batches == 1
+    assert [event['word'] for event in service.activity.events] == ['run', 'walk']
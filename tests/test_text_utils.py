@@ -0,0 +1,21 @@
+import pytest
+
+from text_utils import lemmatize
+
+
+@pytest.mark.parametrize('word, lemma', [
+    ('visited', 'visit'), ('opened', 'open'), ('happened', 'happen'), ('listened', 'listen'),
+    ('developed', 'develop'), ('offered', 'offer'), ('edited', 'edit'), ('limited', 'limit'),
+    ('entered', 'enter'), ('opening', 'open'), ('visiting', 'visit'),
+])
+def test_unstressed_final_syllable_gets_no_e(word, lemma):
+    assert lemmatize(word) == lemma
+
+
+@pytest.mark.parametrize('word, lemma', [
+    ('making', 'make'), ('writing', 'write'), ('hoped', 'hope'), ('closed', 'close'),
+    ('decided', 'decide'), ('arrived', 'arrive'), ('becoming', 'become'), ('invited', 'invite'),
+    ('running', 'run'), ('stopped', 'stop'), ('wanted', 'want'),
+])
+def test_silent_e_and_doubled_consonants(word, lemma):
+    assert lemmatize(word) == lemma
@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+pytest.importorskip('nicegui')
+
+
+@pytest.fixture
+def modules(tmp_path, monkeypatch):
+    # The reading library and the shared vocabulary index are created in the working directory on import
+    monkeypatch.chdir(tmp_path)
+    import album_store
+    import reading
+    import vocab_index
+    return album_store, reading, vocab_index
+
+
+def make_index(modules, tmp_path):
+    album_store, reading, vocab_index = modules
+    library = reading.ReadingLibrary(base_dir=str(tmp_path / 'texts'))
+    albums = album_store.AlbumStore()
+    for word in ('visit', 'open'):
+        albums.add_card('Verbs', {'word': word, 'definitions': []})
+    return library, albums, vocab_index.VocabIndex(library, albums, frequency_path='missing.txt')
+
+
+def test_album_words_mark_their_inflections_known(modules, tmp_path):
+    library, _, index = make_index(modules, tmp_path)
+    text_id = library.import_text('Trip', 'Mia visited the museum and opened the map.')
+    unknown = {item['word'] for item in index.unknown_words(text_id)}
+    assert 'visit' not in unknown and 'open' not in unknown
+    assert 'museum' in unknown
+
+
+def test_cache_from_an_older_lemmatizer_is_rebuilt(modules, tmp_path):
+    library, albums, index = make_index(modules, tmp_path)
+    text_id = library.import_text('Trip', 'Mia visited the museum.')
+    with open(index.cache_path) as file:
+        data = json.load(file)
+    data['lemmatizer'] = 1
+    data['postings'] = {'visite': {text_id: [1]}}
+    data['text_counts'][text_id] = {'visite': 1}
+    with open(index.cache_path, 'w') as file:
+        json.dump(data, file)
+
+    rebuilt = modules[2].VocabIndex(library, albums, frequency_path='missing.txt')
+    assert 'visite' not in rebuilt.postings
+    assert 'visit' not in {item['word'] for item in rebuilt.unknown_words(text_id)}
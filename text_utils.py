@@ -0,0 +1,101 @@
+from typing import Dict, List, Tuple
+import re
+
+WORD_RE = re.compile(r"[A-Za-z]+(?:['’][A-Za-z]+)*")
+TOKEN_RE = re.compile(r"[A-Za-z]+(?:['’][A-Za-z]+)*|\n\s*\n|[^A-Za-z\n]+|\n")
+LEMMATIZER_VERSION = 2  # bump whenever lemmatize() changes its output, so cached lemmas get rebuilt
+
+# Common irregular forms; everything else goes through the suffix rules below
+IRREGULAR = {
+    'am': 'be', 'is': 'be', 'are': 'be', 'was': 'be', 'were': 'be', 'been': 'be', 'being': 'be',
+    'has': 'have', 'had': 'have', 'having': 'have', 'does': 'do', 'did': 'do', 'done': 'do',
+    'went': 'go', 'gone': 'go', 'goes': 'go', 'made': 'make', 'said': 'say', 'took': 'take',
+    'taken': 'take', 'came': 'come', 'saw': 'see', 'seen': 'see', 'knew': 'know', 'known': 'know',
+    'got': 'get', 'gotten': 'get', 'gave': 'give', 'given': 'give', 'found': 'find',
+    'thought': 'think', 'told': 'tell', 'became': 'become', 'left': 'leave', 'felt': 'feel',
+    'brought': 'bring', 'began': 'begin', 'begun': 'begin', 'kept': 'keep', 'held': 'hold',
+    'wrote': 'write', 'written': 'write', 'stood': 'stand', 'heard': 'hear', 'meant': 'mean',
+    'met': 'meet', 'ran': 'run', 'paid': 'pay', 'sat': 'sit', 'spoke': 'speak', 'spoken': 'speak',
+    'lay': 'lie', 'led': 'lead', 'grew': 'grow', 'grown': 'grow', 'lost': 'lose', 'fell': 'fall',
+    'fallen': 'fall', 'sent': 'send', 'built': 'build', 'understood': 'understand', 'drew': 'draw',
+    'drawn': 'draw', 'broke': 'break', 'broken': 'break', 'spent': 'spend', 'rose': 'rise',
+    'risen': 'rise', 'drove': 'drive', 'driven': 'drive', 'bought': 'buy', 'wore': 'wear',
+    'worn': 'wear', 'chose': 'choose', 'chosen': 'choose', 'ate': 'eat', 'eaten': 'eat',
+    'children': 'child', 'men': 'man', 'women': 'woman', 'people': 'person', 'feet': 'foot',
+    'teeth': 'tooth', 'mice': 'mouse', 'geese': 'goose', 'better': 'good', 'best': 'good',
+    'worse': 'bad', 'worst': 'bad', 'using': 'use', 'used': 'use',
+}
+# Words that look inflected but are not
+KEEP = {'this', 'his', 'is', 'was', 'has', 'does', 'bus', 'gas', 'yes', 'news', 'always',
+        'perhaps', 'series', 'species', 'thing', 'nothing', 'something', 'anything', 'everything',
+        'during', 'morning', 'evening', 'king', 'ring', 'spring', 'string', 'bring', 'sing',
+        'red', 'bed', 'need', 'seed', 'speed', 'feed', 'hundred', 'indeed', 'less',
+        'unless', 'class', 'glass', 'grass', 'pass', 'miss', 'kiss', 'boss', 'loss', 'cross'}
+VOWELS = set('aeiou')
+VOWEL_GROUP_RE = re.compile('[aeiou]+')
+# Final syllables that are usually unstressed in longer words: "opened", "visited", "developed" get no e
+UNSTRESSED_ENDINGS = ('en', 'er', 'el', 'on', 'op', 'it')
+# ...except these stems, which do end in a silent e
+E_STEMS = {'invit', 'unit', 'excit', 'recit', 'ignit'}
+
+
+def split_tokens(text: str) -> List[Tuple[str, bool]]:
+    # Split text into (token, is_word) pairs that join back to the original text
+    return [(token, bool(WORD_RE.fullmatch(token))) for token in TOKEN_RE.findall(text)]
+
+
+def tokenize(text: str) -> List[str]:
+    return [word.lower().replace('’', "'") for word in WORD_RE.findall(text)]
+
+
+def restore_e(stem: str) -> str:
+    # "making" -> "mak" -> "make", "running" -> "runn" -> "run"
+    if len(stem) >= 2 and stem[-1] == stem[-2] and stem[-1] not in 'lsz':
+        return stem[:-1]
+    if len(stem) >= 3 and stem[-1] not in VOWELS and stem[-1] not in 'wxy' \
+            and stem[-2] in VOWELS and stem[-3] not in VOWELS:
+        # A silent e follows a stressed final syllable ("decid" -> "decide"), not an unstressed one ("open")
+        if stem.endswith(UNSTRESSED_ENDINGS) and len(VOWEL_GROUP_RE.findall(stem)) > 1 \
+                and stem not in E_STEMS:
+            return stem
+        return stem + 'e'
+    return stem
+
+
+def lemmatize(word: str) -> str:
+    word = word.lower().replace('’', "'")
+    if "'" in word:
+        word = word.split("'")[0]
+    if word in IRREGULAR:
+        return IRREGULAR[word]
+    if word in KEEP or len(word) <= 3:
+        return word
+    if word.endswith('ies') and len(word) > 4:
+        return word[:-3] + 'y'
+    if word.endswith(('sses', 'shes', 'ches', 'xes', 'zes')):
+        return word[:-2]
+    if word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        return word[:-1]
+    if word.endswith('eed'):
+        return word[:-1]
+    if word.endswith('ied') and len(word) > 4:
+        return word[:-3] + 'y'
+    if word.endswith('ed') and len(word) > 4:
+        return restore_e(word[:-2])
+    if word.endswith('ing') and len(word) > 5:
+        return restore_e(word[:-3])
+    return word
+
+
+def load_frequency_list(path: str) -> Dict[str, int]:
+    # One word per line, most frequent first; returns lemma -> rank (1-based)
+    ranks = {}
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            for rank, line in enumerate(file, 1):
+                word = line.split()[0].lower() if line.strip() else ''
+                if word and word not in ranks:
+                    ranks[word] = rank
+    except FileNotFoundError:
+        pass
+    return ranks
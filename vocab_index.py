@@ -0,0 +1,170 @@
+from typing import Dict, List, Optional, Set
+import json
+import math
+import os
+import threading
+
+from album_store import AlbumStore, album_store
+from reading import ReadingLibrary, reading_library
+from text_utils import LEMMATIZER_VERSION, lemmatize, load_frequency_list
+
+# Function words every student is assumed to know, used when no frequency list is available
+BASIC_WORDS = set('''
+a an the and or but if then so than that this these those there here what which who whom whose
+when where why how i me my mine you your yours he him his she her hers it its we us our ours they
+them their theirs be have do will would shall should can could may might must not no yes of to in
+on at by for with from up down out over under about into onto as all any some each every both
+either neither one two three more most many much few less least very too also just only own same
+other such again ever never now once
+'''.split())
+
+
+class VocabIndex:
+    def __init__(self, library: ReadingLibrary = reading_library, albums: AlbumStore = album_store,
+                 frequency_path='word_frequency.txt', assumed_known_rank=500):
+        self.library = library
+        self.albums = albums
+        self.cache_path = os.path.join(library.base_dir, 'vocab_index.json')
+        self.ranks = load_frequency_list(frequency_path)
+        self.assumed_known_rank = assumed_known_rank
+        self.lock = threading.RLock()
+
+        # Inverted index and per-text counts; these are the cached part
+        self.postings: Dict[str, Dict[str, List[int]]] = {}  # lemma -> text_id -> word positions
+        self.text_counts: Dict[str, Dict[str, int]] = {}  # text_id -> lemma -> count
+        self.text_totals: Dict[str, int] = {}
+
+        # Running totals of unknown words per text, updated incrementally when albums change
+        self.known: Set[str] = albums.known_lemmas()
+        self.unknown_tokens: Dict[str, int] = {}
+        self.unknown_weight: Dict[str, float] = {}
+
+        self.load_cache()
+        missing = [text_id for text_id in library.texts if text_id not in self.text_counts]
+        for text_id in missing:
+            self.index_text(text_id)
+        if missing:
+            self.save_cache()
+        for text_id in self.text_counts:
+            self.score_text(text_id)
+
+        library.on_import(self.add_text)
+        albums.on_change(self.albums_changed)
+
+    def load_cache(self):
+        try:
+            with open(self.cache_path, 'r') as file:
+                data = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if data.get('lemmatizer') != LEMMATIZER_VERSION:
+            return  # built with older lemmas: every text is indexed again
+        self.postings = data.get('postings', {})
+        self.text_counts = data.get('text_counts', {})
+        self.text_totals = data.get('text_totals', {})
+
+    def save_cache(self):
+        with self.lock:
+            data = {'lemmatizer': LEMMATIZER_VERSION, 'postings': self.postings,
+                    'text_counts': self.text_counts, 'text_totals': self.text_totals}
+        tmp_path = self.cache_path + '.tmp'
+        with open(tmp_path, 'w') as file:
+            json.dump(data, file)
+        os.replace(tmp_path, self.cache_path)
+
+    def weight(self, lemma: str) -> float:
+        # 0 for words assumed known, otherwise higher for rarer words (1.0 when not in the list)
+        if lemma in BASIC_WORDS:
+            return 0.0
+        rank = self.ranks.get(lemma)
+        if rank is None:
+            return 1.0
+        if rank <= self.assumed_known_rank:
+            return 0.0
+        return 0.2 + 0.8 * math.log(rank) / math.log(max(len(self.ranks), 2))
+
+    def index_text(self, text_id: str):
+        # Batch pass over the stored pages. Words are lemmatized again rather than trusting the lemma stored
+        # at import, which may come from an older lemmatizer and then never match the album's lemmas
+        positions: Dict[str, List[int]] = {}
+        position = 0
+        for page in self.library.iter_pages(text_id):
+            for token, lemma in page:
+                if lemma:
+                    positions.setdefault(lemmatize(token), []).append(position)
+                    position += 1
+        with self.lock:
+            for lemma, text_positions in positions.items():
+                self.postings.setdefault(lemma, {})[text_id] = text_positions
+            self.text_counts[text_id] = {lemma: len(p) for lemma, p in positions.items()}
+            self.text_totals[text_id] = position
+
+    def score_text(self, text_id: str):
+        unknown_tokens, unknown_weight = 0, 0.0
+        for lemma, count in self.text_counts[text_id].items():
+            weight = self.weight(lemma)
+            if weight and lemma not in self.known:
+                unknown_tokens += count
+                unknown_weight += weight * count
+        with self.lock:
+            self.unknown_tokens[text_id] = unknown_tokens
+            self.unknown_weight[text_id] = unknown_weight
+
+    def add_text(self, text_id: str):
+        # One lock across both steps: albums_changed in between would find the text indexed but not scored
+        with self.lock:
+            self.index_text(text_id)
+            self.score_text(text_id)
+        self.save_cache()
+
+    def albums_changed(self, album_name: str, added: Set[str], removed: Set[str]):
+        # Only texts containing the changed lemmas are touched, via the inverted index
+        with self.lock:
+            for lemma, sign in [(lemma, -1) for lemma in added] + [(lemma, 1) for lemma in removed]:
+                if sign < 0:
+                    self.known.add(lemma)
+                else:
+                    self.known.discard(lemma)
+                weight = self.weight(lemma)
+                if not weight:
+                    continue
+                for text_id, text_positions in self.postings.get(lemma, {}).items():
+                    self.unknown_tokens[text_id] += sign * len(text_positions)
+                    self.unknown_weight[text_id] += sign * weight * len(text_positions)
+
+    def difficulty(self, text_id: str) -> Optional[Dict]:
+        with self.lock:
+            total = self.text_totals.get(text_id)
+            if not total:
+                return None
+            return {
+                'words': total,
+                'coverage': round(1 - self.unknown_tokens[text_id] / total, 3),
+                'difficulty': round(self.unknown_weight[text_id] / total, 3),
+            }
+
+    def unknown_words(self, text_id: str, limit: int = 50) -> List[Dict]:
+        # Words in the text the student has not learned yet, most frequent first
+        with self.lock:
+            counts = self.text_counts.get(text_id, {})
+            unknown = [(lemma, count) for lemma, count in counts.items()
+                       if lemma not in self.known and self.weight(lemma)]
+        unknown.sort(key=lambda item: (-item[1], item[0]))
+        return [{'word': lemma, 'count': count, 'rank': self.ranks.get(lemma)} for lemma, count in unknown[:limit]]
+
+    def texts_with_word(self, lemma: str) -> Dict[str, List[int]]:
+        with self.lock:
+            return dict(self.postings.get(lemma, {}))
+
+    def ranked_texts(self) -> List[Dict]:
+        # Every text with its difficulty, easiest first
+        results = []
+        for text_id in list(self.text_totals):
+            score = self.difficulty(text_id)
+            if score and text_id in self.library.texts:
+                results.append({'id': text_id, 'title': self.library.texts[text_id]['title'], **score})
+        results.sort(key=lambda item: item['difficulty'])
+        return results
+
+
+vocab_index = VocabIndex()
@@ -2,30 +2,38 @@ from nicegui import ui
 from typing import Dict, List
 import json
 
+from dictation import DictationPage
+from reading import ReadingPage
+from progress import ProgressPage
+from flashcards import FlashcardPage
+from vocab_index import vocab_index
+from search_index import search_index
+from activity import DEFAULT_USER
+from notifications import notification_center
+from layout import NAV_ITEMS, logo_html, menu_html, nav_html, static_assets, use_shell_styles
+from sessions import session_manager
+from loop_watchdog import watchdog
+from prefetch import prefetcher
+from metrics import registry as metrics, timed
+from config import config, settings
+from lifecycle import lifecycle
+
 class DashboardApp:
     def __init__(self):
         # Configuration
-        self.menu_items: List[Dict] = [
-            {"name": "Dictionary", "icon": "school", "url": "/dictionary", "description": "Look up words and definitions"},
-            {"name": "Flashcard", "icon": "style", "url": "/flashcard", "description": "Practice with flashcards"},
-            {"name": "Reading", "icon": "menu_book", "url": "/reading", "description": "Read and comprehend texts"},
-            {"name": "Dictation", "icon": "record_voice_over", "url": "/dictation", "description": "Practice listening and writing"},
-            {"name": "Process", "icon": "insights", "url": "/process", "description": "Track your learning progress"}
-        ]
-
-        self.nav_items: List[Dict] = [
-            {"name": "Home", "url": "/", "icon": "home"},
-            {"name": "Explore", "url": "/explore", "icon": "explore"},
-            {"name": "Help", "url": "/help", "icon": "help"}
-        ]
+        self.menu_items: List[Dict] = config.menus.dashboard
+
+        self.nav_items: List[Dict] = NAV_ITEMS
 
         # State management
-        self.notifications = []
+        self.page_builders = {}  # url -> page function, used by the benchmarks
+        self.notifications = notification_center
         self.user_settings = self.load_user_settings()
+        self.notifications.is_enabled = lambda: self.user_settings.get('notifications_enabled', True)
 
     def load_user_settings(self) -> Dict:
         try:
-            with open('user_settings.json', 'r') as f:
+            with open(config.paths.user_settings, 'r') as f:
                 return json.load(f)
         except FileNotFoundError:
             return {
@@ -34,74 +42,86 @@ class DashboardApp:
             }
 
     def save_user_settings(self):
-        with open('user_settings.json', 'w') as f:
+        with open(config.paths.user_settings, 'w') as f:
             json.dump(self.user_settings, f)
 
     def create_sidebar(self):
-        sidebar_style =  '''
-            background: linear-gradient(180deg, 
-                rgba(255,255,255,0.9) 0%, 
-                rgba(249,250,251,0.9) 100%);
-            backdrop-filter: blur(20px);
-            -webkit-backdrop-filter: blur(20px);
-            border-right: 1px solid rgba(0,0,0,0.1);
-        '''
-
-        with ui.column().classes('w-64 h-screen').style(sidebar_style):
+        # Static markup comes from cached HTML strings, styles from the shared stylesheet
+        with ui.column().classes('w-64 h-screen mymy-sidebar'):
             # Logo section
-            with ui.row().classes('p-6 items-center justify-between w-full'):
-                with ui.row().classes('items-center gap-2'):
-                    ui.icon('auto_stories').classes('text-3xl text-indigo-600')
-                    ui.label('MYMY').classes('text-2xl font-bold text-indigo-600')
+            ui.html(logo_html()).classes('p-6 w-full')
 
             ui.separator().classes('mb-4')
 
             # Menu items
-            for item in self.menu_items:
-                with ui.row().classes(
-                    'mx-4 p-3 rounded-xl transition-all duration-200 cursor-pointer ' +
-                    ('hover:bg-indigo-50')
-                ):
-                    ui.icon(item['icon']).classes('text-xl text-indigo-600')
-                    with ui.column().classes('ml-3 flex-1'):
-                        ui.label(item['name']).classes('font-semibold text-gray-700')
-                        ui.label(item['description']).classes('text-xs text-gray-500')
+            ui.html(menu_html(self.menu_items)).classes('w-full')
 
             # Bottom section
             with ui.row().classes('mt-auto p-4 w-full items-center justify-between'):
                 ui.button(icon='settings', color='indigo').props('flat')
 
     def create_header(self):
-        header_style = '''
-            background: rgba(255,255,255,0.8);
-            backdrop-filter: blur(20px);
-            -webkit-backdrop-filter: blur(20px);
-        '''
-
-        with ui.row().style('width: 144%; height: 80px; padding: 20px;').classes('items-center justify-between').style(header_style):
+        with ui.row().classes('mymy-header mymy-glass items-center justify-between'):
             # Navigation items
-            with ui.row().classes('space-x-6'):
-                for item in self.nav_items:
-                    with ui.row().classes('items-center gap-2'):
-                        ui.icon(item['icon']).classes('text-indigo-600')
-                        ui.link(item['name'], item['url']).classes(
-                            'text-gray-700 hover:text-indigo-600 transition-colors duration-200'
-                        )
+            ui.html(nav_html(self.nav_items))
 
             # Right side elements
             with ui.row().classes('items-center gap-4'):
                 with ui.row().classes('relative'):
-                    ui.input(placeholder='Search...').props('rounded outlined dense').classes(
-                        'w-64 bg-gray-100 border-none'
-                    ).style('border-radius: 20px;')
+                    search_input = ui.input(placeholder='Search...').props('rounded outlined dense debounce=150').classes(
+                        'w-64 bg-gray-100 border-none mymy-search'
+                    )
                     ui.icon('search').classes('absolute right-3 top-1/2 transform -translate-y-1/2 text-gray-400')
+                    with ui.menu().props('no-parent-event fit') as search_menu:
+                        search_results = ui.column().classes('w-80 p-2 gap-1')
+                    search_input.on_value_change(
+                        lambda e: self.show_search_results(e.value, search_menu, search_results))
+
+                self.create_notification_bell()
+                ui.avatar('User').classes('mymy-avatar')
+
+    def create_notification_bell(self):
+        user = DEFAULT_USER
+        with ui.button(icon='notifications', color='indigo').props('flat round'):
+            badge = ui.badge('', color='red').props('floating')
+            with ui.menu().on('show', lambda: self.notifications.mark_all_read(user)):
+                items_column = ui.column().classes('w-72 p-2 gap-1')
+
+        def render(count, items):
+            # Called by the notification scheduler with coalesced updates
+            badge.text = str(count)
+            badge.visible = count > 0
+            items_column.clear()
+            with items_column:
+                if not items:
+                    ui.label('No notifications').classes('text-gray-500')
+                for item in items[:10]:
+                    ui.label(item['text']).classes('text-gray-800' if not item['read'] else 'text-gray-500')
 
-                ui.button(icon='notifications', color='indigo').props('flat round')
-                ui.avatar('User').style('background: linear-gradient(135deg, #6366f1, #a855f7);')
+        render(self.notifications.unread_count(user), self.notifications.items(user))
+        self.notifications.subscribe(user, render)
+        ui.context.client.on_disconnect(lambda: self.notifications.unsubscribe(user, render))
+
+    def show_search_results(self, query: str, menu, container):
+        results = search_index.search(query or '', owner=DEFAULT_USER)
+        container.clear()
+        if not results:
+            menu.close()
+            return
+        titles = {'word': 'Dictionary', 'card': 'Flashcards', 'text': 'Reading', 'activity': 'Activity'}
+        with container:
+            for kind, items in results.items():
+                ui.label(titles.get(kind, kind)).classes('text-xs font-semibold text-gray-500 uppercase mt-1')
+                for item in items:
+                    with ui.link(target=item['url']).classes('no-underline w-full'):
+                        ui.label(item['title']).classes('text-gray-800')
+                        if item['snippet']:
+                            ui.label(item['snippet']).classes('text-xs text-gray-500 truncate')
+        menu.open()
 
     def create_main_content(self):
         
-        with ui.column().style('width: 144%; height: 80px; padding: 20px;').classes('p-8 flex-1 bg-gray-50'):
+        with ui.column().classes('mymy-main p-8 flex-1 bg-gray-50'):
             # Welcome section
             with ui.row().classes('items-center justify-between mb-8'):
                 with ui.column():
@@ -119,9 +139,7 @@ class DashboardApp:
                 ]
                 
                 for stat in stats:
-                    with ui.card().classes('p-6 flex-1').style(
-                        'background: rgba(255,255,255,0.8); backdrop-filter: blur(20px);'
-                    ):
+                    with ui.card().classes('p-6 flex-1 mymy-glass'):
                         with ui.row().classes('items-center justify-between mb-4'):
                             ui.label(stat['label']).classes('text-gray-500')
                             ui.icon(stat['icon']).classes('text-indigo-600')
@@ -131,9 +149,7 @@ class DashboardApp:
                             ui.label(stat['trend']).classes('text-green-500 text-sm')
 
             # Recent activity section
-            with ui.card().classes('w-full p-6').style(
-                'background: rgba(255,255,255,0.8); backdrop-filter: blur(20px);'
-            ):
+            with ui.card().classes('w-full p-6 mymy-glass'):
                 with ui.row().classes('items-center justify-between mb-6'):
                     ui.label('Recent Activity').classes('text-xl font-bold text-gray-800')
                     ui.button('View All', color='indigo').props('flat')
@@ -167,8 +183,9 @@ class DashboardApp:
         }
 
         @ui.page(url)
+        @timed('page_build_seconds', route=url)
         def page():
-            ui.query('body').style('margin: 0; padding: 0; background: linear-gradient(135deg, #f0f4ff, #e5e7ff);')
+            use_shell_styles()
             with ui.row().classes('min-h-screen'):
                 self.create_sidebar()
                 with ui.column().classes('flex-1'):
@@ -181,6 +198,7 @@ class DashboardApp:
                         with ui.column().classes('p-8'):
                             ui.label(f'{title}').classes('text-3xl font-bold mb-4')
                             ui.label(f'Content for {title} will be displayed here.')
+        self.page_builders[url] = page
         #@ui.page(url)
         #def page():
         #    ui.query('body').style('margin: 0; padding: 0; background: linear-gradient(135deg, #f0f4ff, #e5e7ff);')
@@ -210,24 +228,35 @@ class DashboardApp:
         pass
 
     def create_flashcard_page(self):
-        # Add the logic to display the flashcard-related content here
-        pass
+        # Albums can be exported and imported as streamed, compressed files
+        FlashcardPage().build()
 
     def create_reading_page(self):
-        # Add the logic to display the reading-related content here
-        pass
+        # Texts are paginated at import, only the current page is sent to the browser
+        ReadingPage(vocab=vocab_index).build()
 
     def create_dictation_page(self):
-        # Add the logic to display the dictation-related content here
-        pass
+        # Exercises are prepared in the background, the page only lists ready ones
+        DictationPage().build()
 
     def create_process_page(self):
-        # Add the logic to display the process-related content here
-        pass
+        # Rollups are kept up to date as activity is recorded, the page only reads them
+        ProgressPage(user=DEFAULT_USER).build()
 
 app = DashboardApp()
+# Settings are loaded in __init__; only the write at shutdown is needed
+lifecycle.register('user_settings', app.save_user_settings)
 
 for item in app.menu_items + app.nav_items:
     app.create_page(item['url'], item['name'])
 
-ui.run(port=808, title='MYMY Learning Platform', favicon='🎓')
\ No newline at end of file
+if __name__ in {"__main__", "__mp_main__"}:
+    lifecycle.install()
+    session_manager.install()
+    settings.install()
+    static_assets.install()
+    watchdog.install()
+    metrics.install()
+    prefetcher.install()
+    ui.run(port=config.server.dashboard_port, title=config.server.title, favicon='🎓',
+           timeout_graceful_shutdown=config.server.drain_seconds)
\ No newline at end of file